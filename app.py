@@ -4,14 +4,18 @@ import plotly.express as px
 from pymongo import MongoClient
 from datetime import datetime
 import logging
-from pymongo.errors import ConnectionFailure
-import re # Untuk membersihkan teks
-import string # Untuk membersihkan teks
+from pymongo.errors import ConnectionFailure, OperationFailure
 from collections import Counter # Untuk menghitung frekuensi kata
 from wordcloud import WordCloud # Untuk membuat word cloud
-import matplotlib.pyplot as plt # Untuk menampilkan word cloud
-import nltk # Untuk pemrosesan bahasa alami
-import os # Diperlukan oleh NLTK
+import hashlib # Fingerprint kunci cache gambar word cloud
+import io # PNG word cloud di memori
+import re
+from urllib.parse import quote, urlsplit # Link hasil pencarian aman untuk markdown
+import dashboard_queries # Pipeline agregasi untuk grafik
+from daily_rollup import ROLLUP_COLLECTION # Rollup harian (hari, sumber, kata kunci)
+import nltk_resources # Stopwords NLTK, dimuat saat analisis teks pertama kali tampil
+from word_counts import WordCountCache # Partial frekuensi kata per sumber/hari
+from article_cache import ArticleFrameCache, CATEGORY, DATETIME, MAPPING # DataFrame artikel kolumnar dengan refresh delta
 
 # --- Streamlit Page Config (HARUS menjadi perintah Streamlit pertama) ---
 st.set_page_config(
@@ -27,82 +31,6 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
-# --- Konfigurasi NLTK Data Path (untuk robust NLTK handling) ---
-@st.cache_resource
-def configure_nltk_path():
-    """Konfigurasi path untuk NLTK data, prioritaskan folder lokal."""
-    local_nltk_data_path = os.path.join(os.getcwd(), "nltk_data")
-    if not os.path.exists(local_nltk_data_path):
-        try:
-            os.makedirs(local_nltk_data_path)
-            logging.info(f"Folder nltk_data dibuat di: {local_nltk_data_path}")
-        except OSError as e:
-            logging.error(f"Gagal membuat folder nltk_data di {local_nltk_data_path}: {e}")
-            return
-    if local_nltk_data_path not in nltk.data.path:
-        nltk.data.path.insert(0, local_nltk_data_path)
-        logging.info(f"Path lokal '{local_nltk_data_path}' ditambahkan ke NLTK data path.")
-    logging.info(f"NLTK akan mencari data di: {nltk.data.path}")
-    st.session_state.nltk_path_configured = True
-
-if 'nltk_path_configured' not in st.session_state:
-    configure_nltk_path()
-
-# --- Download NLTK resources (Dibuat lebih "diam") ---
-@st.cache_resource
-def download_nltk_resources():
-    """Downloads NLTK stopwords and punkt if not found to the configured paths."""
-    resources_to_check = {
-        "corpora/stopwords": "stopwords",
-        "tokenizers/punkt": "punkt"
-    }
-    download_occurred_local = False 
-    local_nltk_data_path = os.path.join(os.getcwd(), "nltk_data")
-    can_write_to_local = os.path.exists(local_nltk_data_path) and os.access(local_nltk_data_path, os.W_OK)
-
-    logging.info(f"NLTK Downloader paths: {nltk.data.path}")
-
-    for resource_path, resource_name in resources_to_check.items():
-        try:
-            if not st.session_state.get('force_nltk_redownload_flag', False): 
-                nltk.data.find(resource_path)
-                logging.info(f"NLTK resource '{resource_name}' ditemukan.")
-                if resource_name == "punkt":
-                    try:
-                        nltk.data.find('tokenizers/punkt/PY3/indonesian.pickle')
-                        logging.info("Model 'punkt' untuk bahasa Indonesia juga terverifikasi ada.")
-                    except LookupError:
-                        logging.warning(f"Model 'indonesian.pickle' TIDAK ditemukan di paket '{resource_name}'. Tokenizer akan fallback jika 'indonesian' diminta.")
-                continue
-            else:
-                logging.info(f"Mode force_redownload untuk '{resource_name}'.")
-                raise LookupError(f"Force redownload for {resource_name}.")
-        except LookupError:
-            logging.warning(f"NLTK resource '{resource_name}' tidak ditemukan/diminta unduh ulang. Mencoba mengunduh...")
-            try:
-                downloader_options = {'quiet': True} 
-                if can_write_to_local:
-                    downloader_options['download_dir'] = local_nltk_data_path
-                if st.session_state.get('force_nltk_redownload_flag', False):
-                    downloader_options['force'] = True
-                    if 'download_dir' not in downloader_options and can_write_to_local:
-                         downloader_options['download_dir'] = local_nltk_data_path
-                
-                nltk.download(resource_name, **downloader_options)
-                logging.info(f"NLTK resource '{resource_name}' berhasil diunduh/diproses.")
-                download_occurred_local = True
-            except Exception as e:
-                logging.error(f"Gagal mengunduh NLTK resource '{resource_name}': {e}", exc_info=True)
-    
-    if 'force_nltk_redownload_flag' in st.session_state:
-        del st.session_state['force_nltk_redownload_flag'] 
-    
-    if download_occurred_local and 'nltk_resources_downloaded_this_session' not in st.session_state: 
-        st.session_state.nltk_resources_downloaded_this_session = True
-        logging.info("Resource NLTK telah diunduh/diverifikasi dalam sesi ini.")
-
-download_nltk_resources()
-
 # Global variable for MongoDB client
 mongo_client = None
 
@@ -133,29 +61,95 @@ def init_mongo():
         logging.error(f"Unexpected MongoDB connection error: {e}")
     return None
 
-# Fungsi untuk mengambil data dari MongoDB
-@st.cache_data(ttl=300)
+# Kolom yang dimuat ke DataFrame: hanya yang dipakai analisis teks (grafik lain dari agregasi MongoDB).
+# term_counts dihitung saat ingest, jadi judul/konten tidak perlu dikirim ke dashboard; date untuk partial per hari
+ARTICLE_COLUMNS = {"source": CATEGORY, "date": DATETIME, "term_counts": MAPPING}
+
+# Satu cache DataFrame per proses (dipakai semua sesi): hanya artikel baru yang diambil tiap refresh
+@st.cache_resource
+def get_article_cache(_db):
+    # date sudah berupa datetime UTC sejak ingest; artikel tanpa tanggal terbaca disaring di server
+    return ArticleFrameCache(_db["woman_abuse"], dashboard_queries.ARTICLE_FRAME_QUERY, ARTICLE_COLUMNS,
+                             defaults={"source": dashboard_queries.UNKNOWN_SOURCE})
+
+# Fungsi untuk mengambil data dari MongoDB (term_counts per artikel, hanya untuk analisis teks)
 def fetch_data():
     db = init_mongo()
-    if db is None: return pd.DataFrame()
+    if db is None: return pd.DataFrame(), None
     try:
-        collection = db["woman_abuse"] # Ganti dengan nama koleksi Anda
-        data = list(collection.find({}, {"title": 1, "date": 1, "content": 1, "keywords_found": 1, "source": 1, "_id": 0}))
-        df = pd.DataFrame(data)
+        df, generation = get_article_cache(db).snapshot() # generation berubah setiap muat ulang penuh
         if df.empty:
             logging.warning("Tidak ada data di MongoDB 'woman_abuse'.")
-            return pd.DataFrame()
-        df['date'] = pd.to_datetime(df['date'], errors='coerce')
-        df.dropna(subset=['date'], inplace=True)
-        df['content'] = df['content'].fillna('').astype(str)
-        df['title'] = df['title'].fillna('').astype(str)
-        df['source'] = df['source'].fillna('Sumber Tidak Diketahui').astype(str).replace('', 'Sumber Tidak Diketahui')
-        df['keywords_found'] = df['keywords_found'].apply(lambda x: x if isinstance(x, list) else [])
-        return df
+        return df, generation
     except Exception as e:
         st.error(f"❌ Gagal mengambil/memproses data dari MongoDB: {e}")
         logging.error(f"Error fetching/processing data: {e}", exc_info=True)
-    return pd.DataFrame()
+    return pd.DataFrame(), None
+
+def to_display_time(series):
+    """Converts a Series of UTC datetimes from MongoDB to naive WIB timestamps for display."""
+    return pd.to_datetime(series).dt.tz_localize('UTC').dt.tz_convert(dashboard_queries.DISPLAY_TIMEZONE).dt.tz_localize(None)
+
+def run_aggregation(query_func, rollup_func, columns, sources=None, **kwargs):
+    db = init_mongo()
+    if db is None: return pd.DataFrame(columns=columns)
+    try:
+        rollup = db[ROLLUP_COLLECTION]
+        if rollup.estimated_document_count() > 0: # Rollup harian diisi scraper; artikel mentah hanya jika belum ada
+            return pd.DataFrame(rollup_func(rollup, sources, **kwargs), columns=columns)
+        return pd.DataFrame(query_func(db["woman_abuse"], sources, **kwargs), columns=columns)
+    except Exception as e:
+        st.error(f"❌ Gagal menjalankan agregasi MongoDB: {e}")
+        logging.error(f"Aggregation error ({query_func.__name__}): {e}", exc_info=True)
+    return pd.DataFrame(columns=columns)
+
+# Grafik dihitung di MongoDB dari rollup harian (beberapa ratus baris); yang dikirim hanya baris hasil agregasi
+@st.cache_data(ttl=300)
+def fetch_source_stats(sources=None):
+    df = run_aggregation(dashboard_queries.source_stats, dashboard_queries.rollup_source_stats, ['source', 'count', 'first_date', 'last_date'], sources)
+    if not df.empty:
+        df['first_date'] = to_display_time(df['first_date'])
+        df['last_date'] = to_display_time(df['last_date'])
+    return df
+
+@st.cache_data(ttl=300)
+def fetch_daily_counts(sources=None):
+    df = run_aggregation(dashboard_queries.daily_counts, dashboard_queries.rollup_daily_counts, ['day', 'count'], sources)
+    df['tanggal'] = to_display_time(df['day']).dt.date if not df.empty else []
+    return df[['tanggal', 'count']]
+
+@st.cache_data(ttl=300)
+def fetch_keyword_counts(sources=None, limit=15):
+    return run_aggregation(dashboard_queries.keyword_counts, dashboard_queries.rollup_keyword_counts, ['keyword', 'count'], sources, limit=limit)
+
+# Pencarian teks penuh: satu halaman per panggilan, token halaman berikutnya dari dashboard_queries.search_articles
+SEARCH_PAGE_SIZE = 20
+_MARKDOWN_SPECIAL = re.compile(r'([\\`*_{}\[\]()<>#+!|~-])')
+
+def markdown_link(text, url):
+    """Bold markdown link with text escaped and url percent-encoded; plain bold text if url is not http(s)."""
+    label = _MARKDOWN_SPECIAL.sub(r'\\\1', str(text))
+    if not isinstance(url, str) or urlsplit(url.strip()).scheme.lower() not in ('http', 'https'):
+        return f"**{label}**"
+    # ( ) dan spasi di-encode agar tidak menutup bagian (url) markdown; karakter URL lain dibiarkan
+    href = quote(url.strip(), safe=":/?#[]@!$&'*+,;=%~")
+    return f"**[{label}]({href})**"
+
+@st.cache_data(ttl=300)
+def fetch_search_results(text, sources=None, after=None):
+    columns = ['title', 'link', 'source', 'date', 'snippet', 'score']
+    db = init_mongo()
+    if db is None: return pd.DataFrame(columns=columns), None
+    try:
+        rows, next_after = dashboard_queries.search_articles(db["woman_abuse"], text, sources, after, limit=SEARCH_PAGE_SIZE)
+        df = pd.DataFrame(rows, columns=columns)
+        if not df.empty:
+            df['date'] = to_display_time(df['date'])
+        return df, next_after
+    except OperationFailure as e:
+        st.error(f"❌ Pencarian gagal: {e}. Index teks dibuat oleh scraper (ensure_indexes) saat mulai.")
+        logging.error(f"Search error: {e}", exc_info=True)
+    return pd.DataFrame(columns=columns), None
 
 def check_sample_data():
     db = init_mongo()
@@ -174,110 +168,54 @@ def check_sample_data():
     return {"error": f"Gagal mengambil sampel data: {str(e)}"}
 
 # --- Fungsi untuk Pemrosesan Teks dan Word Cloud ---
-@st.cache_data(ttl=3600)
-def get_word_frequencies(_df):
-    if _df.empty or ('title' not in _df.columns and 'content' not in _df.columns):
-        return Counter()
-
-    text_corpus = ' '.join(_df['title'].astype(str).tolist()) + ' ' + ' '.join(_df['content'].astype(str).tolist())
-    text_corpus = text_corpus.lower()
-    text_corpus = re.sub(r'http\S+|www\S+|https\S+', '', text_corpus, flags=re.MULTILINE)
-    text_corpus = text_corpus.translate(str.maketrans('', '', string.punctuation))
-    text_corpus = re.sub(r'\d+', '', text_corpus)
-    text_corpus = ' '.join(text_corpus.split())
-
-    tokens = []
-    final_tokenizer_method = "NLTK (default)" 
-
-    try:
-        logging.info("Mencoba tokenisasi dengan NLTK (indonesian).")
-        tokens = nltk.word_tokenize(text_corpus, language='indonesian')
-        final_tokenizer_method = "NLTK (indonesian)"
-        logging.info("Tokenisasi berhasil menggunakan NLTK (indonesian).")
-    except LookupError:
-        logging.warning("NLTK LookupError untuk model punkt 'indonesian'. Mencoba 'malay'.")
-        try:
-            logging.info("Mencoba tokenisasi dengan NLTK (malay).")
-            tokens = nltk.word_tokenize(text_corpus, language='malay')
-            final_tokenizer_method = "NLTK (malay)"
-            logging.info("Tokenisasi berhasil menggunakan NLTK (malay).")
-        except LookupError:
-            logging.warning("NLTK LookupError untuk model punkt 'malay'. Mencoba NLTK default (kemungkinan english).")
-            try:
-                logging.info("Mencoba tokenisasi dengan NLTK default (tanpa parameter bahasa).")
-                tokens = nltk.word_tokenize(text_corpus) 
-                final_tokenizer_method = "NLTK (default/english)"
-                logging.info("Tokenisasi berhasil menggunakan NLTK default.")
-            except Exception as e_default_nltk: 
-                logging.error(f"Error saat tokenisasi NLTK default: {e_default_nltk}. Fallback ke regex.")
-                tokens = re.findall(r'\b\w+\b', text_corpus)
-                final_tokenizer_method = "Regex Fallback (NLTK default error)"
-        except Exception as e_malay_nltk: 
-            logging.error(f"Error saat tokenisasi NLTK (malay): {e_malay_nltk}. Fallback ke NLTK default.")
-            try:
-                tokens = nltk.word_tokenize(text_corpus)
-                final_tokenizer_method = "NLTK (default/english)"
-            except Exception as e_final_fallback:
-                tokens = re.findall(r'\b\w+\b', text_corpus)
-                final_tokenizer_method = "Regex Fallback (NLTK default error)"
-    except Exception as e_indonesian_nltk: 
-        logging.error(f"Error saat tokenisasi NLTK (indonesian): {e_indonesian_nltk}. Fallback ke NLTK default.")
-        try:
-            tokens = nltk.word_tokenize(text_corpus)
-            final_tokenizer_method = "NLTK (default/english)"
-        except Exception as e_final_fallback_after_id_error:
-            tokens = re.findall(r'\b\w+\b', text_corpus)
-            final_tokenizer_method = "Regex Fallback (NLTK default error)"
-
-    if not tokens: 
-        logging.warning("Tokenisasi menghasilkan daftar kosong. Menggunakan regex jika belum.")
-        if not final_tokenizer_method.startswith("Regex"): # Hanya fallback jika belum regex
-            tokens = re.findall(r'\b\w+\b', text_corpus)
-            final_tokenizer_method = "Regex (Final Fallback)"
-        if not tokens: 
-            logging.error("Tokenisasi regex juga menghasilkan daftar kosong.")
-            return Counter()
-
+# Satu cache partial Counter per (sumber, hari) per proses: filter apa pun cukup menggabungkan partial,
+# artikel baru dari refresh delta ditambahkan ke partial yang sudah ada
+@st.cache_resource
+def get_word_count_cache():
     stop_words_set = set()
     stopwords_language_to_try = 'indonesian'
-    final_stopwords_method = "Hanya Custom" 
     try:
-        stop_words_set = set(nltk.corpus.stopwords.words(stopwords_language_to_try))
+        stop_words_set = nltk_resources.load_stopwords(stopwords_language_to_try) # Impor/unduh NLTK hanya di sini
         logging.info(f"Stopwords untuk '{stopwords_language_to_try}' berhasil dimuat.")
-        final_stopwords_method = f"NLTK ({stopwords_language_to_try})"
     except LookupError: 
-        logging.warning(f"LookupError: NLTK tidak punya stopwords untuk '{stopwords_language_to_try}'.")
+        logging.warning(f"LookupError: NLTK tidak punya stopwords untuk '{stopwords_language_to_try}'. Hanya custom stopwords (saat ingest).")
     except Exception as e_stopwords:
         logging.error(f"Error memuat stopwords '{stopwords_language_to_try}': {e_stopwords}", exc_info=True)
-    
-    custom_stopwords = {
-        'detik', 'cnn', 'indonesia', 'com', 'artikel', 'berita', 'antara', 'liputan6', 'kompas', 'tribunnews', 'suara',
-        'mengatakan', 'menyebutkan', 'ujar', 'kata', 'menurut', 'yakni', 'tersebut', 'selasa', 'dilansir', 'dikutip',
-        'rabu', 'kamis', 'jumat', 'sabtu', 'minggu', 'senin', 'januari', 'februari', 'maret', 'tribun', 'news',
-        'april', 'mei', 'juni', 'juli', 'agustus', 'september', 'oktober', 'november', 'desember',
-        'wib', 'wit', 'wita', 'pukul', 'tahun', 'lalu', 'usai', 'saat', 'akan', 'agar', 'oleh', 'pada', 'ke',
-        'dari', 'di', 'itu', 'ini', 'yang', 'dan', 'rp', 'ada', 'adalah', 'atau', 'jadi', 'juga', 'pun', 'kah',
-        'no', 'description', 'baca', 'simak', 'klik', 'hal', 'lain', 'pihak', 'terkait', 'kasus'
-    }
-    final_stop_words = stop_words_set.union(custom_stopwords)
-
-    filtered_tokens = [
-        word for word in tokens if word.isalpha() and word not in final_stop_words and len(word) > 2
-    ]
-    word_counts = Counter(filtered_tokens)
-
-    if '' in word_counts: del word_counts['']
-    if None in word_counts: del word_counts[None]
-
-    logging.info(f"Diproses {len(tokens)} token (tokenizer: {final_tokenizer_method}), ditemukan {len(word_counts)} kata unik relevan (stopwords: {final_stopwords_method}).")
+    return WordCountCache(exclude=stop_words_set, timezone=dashboard_queries.DISPLAY_TIMEZONE)
+
+def get_word_frequencies(df, generation, sources=None):
+    # term_counts sudah dihitung per artikel saat ingest (text_tokens); hasil tidak boleh diubah (dipakai bersama)
+    if df.empty or 'term_counts' not in df.columns:
+        return Counter()
+    word_counts = get_word_count_cache().counts(df, generation, sources)
+    logging.info(f"Frekuensi kata untuk {len(sources) if sources is not None else 'semua'} sumber: {len(word_counts)} kata unik relevan.")
     return word_counts
 
+# Parameter render word cloud; ikut masuk fingerprint kunci cache gambar
+WORDCLOUD_PARAMS = {"width": 1000, "height": 500, "background_color": None, "mode": "RGBA",
+                    "max_words": 150, "colormap": 'viridis', "random_state": 42}
+# PNG 1000x500 berukuran ratusan KB: batasi jumlah gambar yang disimpan cache
+WORDCLOUD_CACHE_ENTRIES = 32
+
+def wordcloud_fingerprint(top_words):
+    """SHA-1 of the words the cloud draws (top max_words) and the render parameters."""
+    payload = repr((top_words, sorted(WORDCLOUD_PARAMS.items())))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+@st.cache_data(max_entries=WORDCLOUD_CACHE_ENTRIES, show_spinner=False)
+def render_wordcloud_png(fingerprint, _top_words):
+    # Hanya fingerprint yang di-hash Streamlit; _top_words sudah tercakup di dalamnya
+    wc = WordCloud(**WORDCLOUD_PARAMS).generate_from_frequencies(dict(_top_words))
+    buffer = io.BytesIO()
+    wc.to_image().save(buffer, format='PNG')
+    return buffer.getvalue()
+
 def generate_wordcloud_image(word_counts):
     if not word_counts: return None
     try:
-        wc = WordCloud(width=1000, height=500, background_color=None, mode="RGBA", max_words=150, colormap='viridis', random_state=42)
-        wc.generate_from_frequencies(dict(word_counts))
-        return wc
+        # WordCloud hanya menggambar max_words kata teratas, jadi hanya itu yang menentukan gambar
+        top_words = word_counts.most_common(WORDCLOUD_PARAMS["max_words"])
+        return render_wordcloud_png(wordcloud_fingerprint(top_words), top_words)
     except Exception as e:
         logging.error(f"Error generating word cloud: {e}", exc_info=True)
         st.error(f"Gagal membuat Word Cloud: {e}") 
@@ -298,60 +236,44 @@ with st.sidebar:
     st.image("https://srikandi-app.my.id/static/assets/favicon-circle.svg", width=100, use_container_width=True)
     st.header("⚙️ Filter & Info")
 
-    df_main = fetch_data()
-    df = pd.DataFrame() 
-
-    if not df_main.empty:
-        st.metric("📰 Total Artikel Valid", len(df_main))
-        if 'date' in df_main.columns and not df_main['date'].dropna().empty:
-            min_date_db = df_main['date'].min()
-            max_date_db = df_main['date'].max()
-            st.metric("🗓️ Rentang Tanggal Data", f"{min_date_db.strftime('%d %b %Y')} - {max_date_db.strftime('%d %b %Y')}")
-            df = df_main.copy()
-        else:
-            if not df_main.empty:
-                 st.warning("Kolom 'date' tidak ada atau kosong di data utama.")
+    stats_all = fetch_source_stats() # Satu baris per sumber: jumlah + tanggal pertama/terakhir
+    selected_sources = []
+
+    if not stats_all.empty:
+        st.metric("📰 Total Artikel Valid", int(stats_all['count'].sum()))
+        min_date_db = stats_all['first_date'].min()
+        max_date_db = stats_all['last_date'].max()
+        st.metric("🗓️ Rentang Tanggal Data", f"{min_date_db.strftime('%d %b %Y')} - {max_date_db.strftime('%d %b %Y')}")
+
+        available_sources = sorted(stats_all['source'].tolist())
+        if 'selected_sources_ms' not in st.session_state:
+             st.session_state.selected_sources_ms = available_sources
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("Pilih Semua", key="select_all_src_btn", use_container_width=True):
+                st.session_state.selected_sources_ms = available_sources
+                st.rerun()
+        with col2:
+            if st.button("Hapus Semua", key="deselect_all_src_btn", use_container_width=True):
+                st.session_state.selected_sources_ms = []
+                st.rerun()
+
+        selected_sources = st.multiselect(
+            "Pilih Sumber Berita:",
+            options=available_sources,
+            default=[s for s in st.session_state.selected_sources_ms if s in available_sources],
+            key="selected_sources_multiselect_key"
+        )
+        if selected_sources != st.session_state.selected_sources_ms:
+            st.session_state.selected_sources_ms = selected_sources
+            st.rerun()
+
+        if not selected_sources:
+            st.info("Tidak ada sumber berita yang dipilih. Grafik akan kosong.")
     else:
         st.warning("Tidak ada data valid di database untuk ditampilkan.")
 
-    if not df.empty and 'source' in df.columns:
-        available_sources = sorted(df['source'].unique().tolist())
-        if available_sources:
-            if 'selected_sources_ms' not in st.session_state:
-                 st.session_state.selected_sources_ms = available_sources
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                if st.button("Pilih Semua", key="select_all_src_btn", use_container_width=True):
-                    st.session_state.selected_sources_ms = available_sources
-                    st.rerun()
-            with col2:
-                if st.button("Hapus Semua", key="deselect_all_src_btn", use_container_width=True):
-                    st.session_state.selected_sources_ms = []
-                    st.rerun()
-
-            selected_sources = st.multiselect(
-                "Pilih Sumber Berita:",
-                options=available_sources,
-                default=st.session_state.selected_sources_ms, 
-                key="selected_sources_multiselect_key"
-            )
-            if selected_sources != st.session_state.selected_sources_ms:
-                st.session_state.selected_sources_ms = selected_sources
-                st.rerun() 
-
-            if selected_sources:
-                df = df[df['source'].isin(selected_sources)]
-            else: 
-                if not df.empty : 
-                    st.info("Tidak ada sumber berita yang dipilih. Grafik akan kosong.")
-                df = pd.DataFrame(columns=df.columns) 
-        else: 
-             if not df.empty:
-                st.info("Tidak ada pilihan sumber berita tersedia dari data yang ada.")
-    elif not df_main.empty and 'source' not in df.columns: 
-        st.warning("Kolom 'source' tidak ditemukan dalam data untuk filter.")
-
     st.markdown("---")
     st.header("🛠️ Debugging Data")
     if st.button("Lihat Sampel Data Mentah (MongoDB)", key="sample_data_button"):
@@ -366,22 +288,20 @@ with st.sidebar:
     st.caption(f"Data terakhir di-refresh: {datetime.now().strftime('%d %b %Y, %H:%M:%S')}")
 
 # --- Main Content ---
-if not df.empty:
+if selected_sources:
+    selected_key = tuple(sorted(selected_sources)) # Kunci cache agregasi (urutan pilihan tidak berpengaruh)
     st.markdown("## 📈 Analisis Umum")
     # --- Section 1: Distribusi Sumber Berita ---
     with st.container(border=True): 
         st.subheader("📰 Distribusi Artikel per Sumber Berita")
-        if 'source' in df.columns and not df['source'].dropna().empty:
-            source_counts = df['source'].value_counts().reset_index()
-            source_counts.columns = ['source', 'count']
-            if not source_counts.empty:
-                fig_source = px.pie(source_counts, names='source', values='count', template='seaborn', color_discrete_sequence=px.colors.qualitative.Pastel1, hole=0.4)
-                fig_source.update_layout(legend_title_text='Sumber Berita', legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5), margin=dict(t=20, b=100, l=0, r=0))
-                fig_source.update_traces(textposition='inside', textinfo='percent+label', insidetextorientation='radial', hovertemplate="<b>Sumber: %{label}</b><br>Jumlah: %{value}<br>%{percent}<extra></extra>")
-                st.plotly_chart(fig_source, use_container_width=True)
-            else: st.info("Tidak ada data sumber berita valid untuk ditampilkan (setelah filter).")
-        elif 'source' not in df.columns and not df_main.empty : st.warning("Kolom 'source' tidak ada untuk grafik distribusi.")
-        elif not df_main.empty : st.info("Tidak ada data sumber berita valid untuk ditampilkan.")
+        # Baris $group per sumber dari sidebar, cukup dipilih sesuai filter
+        source_counts = stats_all[stats_all['source'].isin(selected_sources)][['source', 'count']]
+        if not source_counts.empty:
+            fig_source = px.pie(source_counts, names='source', values='count', template='seaborn', color_discrete_sequence=px.colors.qualitative.Pastel1, hole=0.4)
+            fig_source.update_layout(legend_title_text='Sumber Berita', legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5), margin=dict(t=20, b=100, l=0, r=0))
+            fig_source.update_traces(textposition='inside', textinfo='percent+label', insidetextorientation='radial', hovertemplate="<b>Sumber: %{label}</b><br>Jumlah: %{value}<br>%{percent}<extra></extra>")
+            st.plotly_chart(fig_source, use_container_width=True)
+        else: st.info("Tidak ada data sumber berita valid untuk ditampilkan (setelah filter).")
 
     st.markdown("<br>", unsafe_allow_html=True)
 
@@ -390,46 +310,35 @@ if not df.empty:
         st.subheader("📅 Tren Jumlah Artikel per Tanggal")
         st.markdown("Visualisasi jumlah artikel yang dipublikasikan setiap harinya, berdasarkan data yang difilter.")
 
-        if df is not None and not df.empty and 'date' in df.columns:
-            try:
-                # Pastikan kolom date dalam format datetime
-                df['date'] = pd.to_datetime(df['date'], errors='coerce')
-                df_trend = df.dropna(subset=['date']).copy()
-
-                # Ekstrak hanya tanggal (tanpa jam)
-                df_trend['tanggal'] = df_trend['date'].dt.date
-
-                # Hitung jumlah artikel per tanggal
-                daily_counts = df_trend.groupby('tanggal').size().reset_index(name='count')
-                daily_counts = daily_counts.sort_values('tanggal')
-
-                if not daily_counts.empty:
-                    fig_daily = px.line(
-                        daily_counts,
-                        x='tanggal',
-                        y='count',
-                        labels={'tanggal': 'Tanggal', 'count': 'Jumlah Artikel'},
-                        title=None,
-                        template='seaborn',
-                        markers=True,
-                        color_discrete_sequence=["#FF6B6B"]
-                    )
-                    fig_daily.update_layout(
-                        xaxis_title='Tanggal',
-                        yaxis_title='Jumlah Artikel',
-                        plot_bgcolor='rgba(245, 245, 245, 1)',
-                        paper_bgcolor='rgba(0,0,0,0)',
-                    )
-                    fig_daily.update_traces(
-                        hovertemplate="<b>Tanggal: %{x}</b><br>Jumlah Artikel: %{y}<extra></extra>"
-                    )
-                    st.plotly_chart(fig_daily, use_container_width=True)
-                else:
-                    st.info("Data terlalu sedikit untuk ditampilkan dalam grafik tren harian.")
-            except Exception as e:
-                st.error(f"Terjadi kesalahan saat mengonversi tanggal: {e}")
-        else:
-            st.warning("Dataset tidak memiliki kolom 'date' atau data kosong.")
+        try:
+            # Jumlah artikel per hari (WIB) dihitung MongoDB: $dateTrunc + $group
+            daily_counts = fetch_daily_counts(selected_key)
+
+            if not daily_counts.empty:
+                fig_daily = px.line(
+                    daily_counts,
+                    x='tanggal',
+                    y='count',
+                    labels={'tanggal': 'Tanggal', 'count': 'Jumlah Artikel'},
+                    title=None,
+                    template='seaborn',
+                    markers=True,
+                    color_discrete_sequence=["#FF6B6B"]
+                )
+                fig_daily.update_layout(
+                    xaxis_title='Tanggal',
+                    yaxis_title='Jumlah Artikel',
+                    plot_bgcolor='rgba(245, 245, 245, 1)',
+                    paper_bgcolor='rgba(0,0,0,0)',
+                )
+                fig_daily.update_traces(
+                    hovertemplate="<b>Tanggal: %{x}</b><br>Jumlah Artikel: %{y}<extra></extra>"
+                )
+                st.plotly_chart(fig_daily, use_container_width=True)
+            else:
+                st.info("Data terlalu sedikit untuk ditampilkan dalam grafik tren harian.")
+        except Exception as e:
+            st.error(f"Terjadi kesalahan saat mengambil tren harian: {e}")
 # --- Akhir Section ---
 
 
@@ -438,56 +347,42 @@ if not df.empty:
     
     with st.container(border=True): 
         st.subheader("🔑 Frekuensi Kata Kunci Pencarian Awal")
-        if 'keywords_found' in df.columns and not df.empty:
-            df_kw_proc = df[df['keywords_found'].apply(lambda x: isinstance(x, list) and len(x) > 0)].copy()
-            if not df_kw_proc.empty:
-                kw_exploded = df_kw_proc['keywords_found'].explode().dropna().astype(str)
-                if not kw_exploded.empty:
-                    kw_counts = kw_exploded.value_counts().reset_index()
-                    kw_counts.columns = ['keyword', 'count']
-                    kw_counts = kw_counts[kw_counts['keyword'].str.strip() != '']
-                    if not kw_counts.empty:
-                        fig_kw = px.bar(kw_counts.head(15), x='count', y='keyword', orientation='h', labels={'keyword': 'Kata Kunci', 'count': 'Jumlah'}, color='count', color_continuous_scale=px.colors.sequential.Mint, template='seaborn', text='count')
-                        fig_kw.update_layout(yaxis={'categoryorder':'total ascending'}, coloraxis_showscale=False, height=500)
-                        fig_kw.update_traces(textposition='outside', hovertemplate="<b>Kunci: %{y}</b><br>Jumlah: %{x}<extra></extra>")
-                        st.plotly_chart(fig_kw, use_container_width=True)
-                    else: st.info("Tidak ada kata kunci pencarian awal valid setelah diproses.")
-                else: st.info("Tidak ada kata kunci pencarian awal setelah explode dan dropna.")
-            else: st.info("Tidak ada artikel dengan kata kunci pencarian awal yang valid.")
-        elif 'keywords_found' not in df.columns and not df_main.empty: st.warning("Kolom 'keywords_found' tidak ada.")
+        # $unwind keywords_found + $group di MongoDB, hanya 15 teratas yang dikirim
+        kw_counts = fetch_keyword_counts(selected_key, limit=15)
+        if not kw_counts.empty:
+            fig_kw = px.bar(kw_counts, x='count', y='keyword', orientation='h', labels={'keyword': 'Kata Kunci', 'count': 'Jumlah'}, color='count', color_continuous_scale=px.colors.sequential.Mint, template='seaborn', text='count')
+            fig_kw.update_layout(yaxis={'categoryorder':'total ascending'}, coloraxis_showscale=False, height=500)
+            fig_kw.update_traces(textposition='outside', hovertemplate="<b>Kunci: %{y}</b><br>Jumlah: %{x}<extra></extra>")
+            st.plotly_chart(fig_kw, use_container_width=True)
+        else: st.info("Tidak ada artikel dengan kata kunci pencarian awal yang valid.")
         
     st.markdown("<br>", unsafe_allow_html=True)
     st.markdown("## 💬 Analisis Teks Berita")
     with st.container(border=True): 
         st.subheader("☁️ Kata Penting dari Judul dan Konten Berita")
         word_counts_data = None
+        df, generation = fetch_data() # Cache DataFrame proses (refresh delta); filter sumber diterapkan di WordCountCache
         if not df.empty:
             try:
                 with st.spinner("Menganalisis frekuensi kata..."):
-                    word_counts_data = get_word_frequencies(df.copy())
+                    word_counts_data = get_word_frequencies(df, generation, selected_key)
             except Exception as e_freq:
                 st.error(f"Error saat analisis frekuensi kata: {e_freq}") 
                 logging.error("Error during get_word_frequencies call", exc_info=True)
         else: 
-            if not df_main.empty: 
-                 st.info("Tidak ada data artikel untuk dianalisis (setelah filter).")
+            st.info("Tidak ada data artikel untuk dianalisis (setelah filter).")
 
         if word_counts_data and len(word_counts_data) > 0:
             col_wc, col_bar_freq = st.columns([2, 3])
             with col_wc:
                 st.markdown("##### **Word Cloud**")
-                wc_img = generate_wordcloud_image(word_counts_data)
-                if wc_img:
-                    fig_wc, ax = plt.subplots(figsize=(10,5))
-                    ax.imshow(wc_img, interpolation='bilinear')
-                    ax.axis('off')
-                    fig_wc.patch.set_alpha(0.0)
-                    ax.patch.set_alpha(0.0)
+                wc_png = generate_wordcloud_image(word_counts_data) # PNG dari cache, tidak dirender ulang saat slider digeser
+                if wc_png:
                     try:
-                        st.pyplot(fig_wc, clear_figure=True, use_container_width=True)
-                    except Exception as plt_err:
-                        st.error(f"Gagal menampilkan Word Cloud: {plt_err}") 
-                        logging.error(f"Error display matplotlib: {plt_err}")
+                        st.image(wc_png, use_container_width=True)
+                    except Exception as img_err:
+                        st.error(f"Gagal menampilkan Word Cloud: {img_err}") 
+                        logging.error(f"Error display word cloud: {img_err}")
                 else: st.warning("Tidak dapat membuat gambar Word Cloud.")
             with col_bar_freq:
                 st.markdown("##### **Frekuensi Kata Teratas**")
@@ -504,6 +399,34 @@ if not df.empty:
                 else: st.info("Tidak ada kata yang cukup sering muncul.")
         elif not df.empty: 
             st.info("Tidak ada kata signifikan ditemukan untuk dianalisis (mungkin semua tersaring atau teks terlalu pendek).")
+
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown("## 🔎 Cari Artikel")
+    with st.container(border=True):
+        search_text = st.text_input("Cari di judul dan isi berita (sumber terpilih):", key="search_text",
+                                    placeholder='mis. pelecehan "kereta api" -anak').strip()
+        if search_text:
+            search_key = (search_text, selected_key)
+            if st.session_state.get('search_key') != search_key: # Query/filter baru: kembali ke halaman pertama
+                st.session_state.search_key = search_key
+                st.session_state.search_pages = [None]
+            pages = st.session_state.search_pages # Token halaman yang sudah dibuka (keyset), untuk tombol kembali
+            results, next_after = fetch_search_results(search_text, selected_key, pages[-1])
+            if results.empty:
+                st.info("Tidak ada artikel yang cocok.")
+            else:
+                st.caption(f"Halaman {len(pages)} · diurutkan menurut relevansi")
+                for row in results.itertuples():
+                    tanggal = row.date.strftime('%d %b %Y %H:%M WIB') if pd.notna(row.date) else "tanpa tanggal"
+                    st.markdown(f"{markdown_link(row.title, row.link)}  \n{row.source} · {tanggal} · skor {row.score:.2f}")
+                    if row.snippet: st.caption(f"{row.snippet}…")
+            col_prev, col_next = st.columns(2)
+            if col_prev.button("⬅️ Sebelumnya", disabled=len(pages) == 1, key="search_prev"):
+                pages.pop()
+                st.rerun()
+            if col_next.button("Berikutnya ➡️", disabled=next_after is None, key="search_next"):
+                pages.append(next_after)
+                st.rerun()
 else: 
     st.warning("⚠️ Tidak ada data valid ditemukan di database atau setelah filter. Pastikan scraper berjalan atau sesuaikan filter.")
 
@@ -0,0 +1,149 @@
+import os
+import time
+import logging
+import threading
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (ikut terpasang bersama streamlit)
+    STRING_DTYPE = pd.StringDtype("pyarrow")
+except ImportError:
+    STRING_DTYPE = object
+
+# Jeda minimum antar query delta, dan jeda antar muat ulang penuh (menangkap hapus/ubah dokumen lama)
+REFRESH_SECONDS = float(os.getenv('DASHBOARD_REFRESH_SECONDS', '30'))
+RECONCILE_SECONDS = float(os.getenv('DASHBOARD_RECONCILE_SECONDS', '3600'))
+# Jumlah dokumen per batch cursor saat memuat kolom
+CURSOR_BATCH_SIZE = int(os.getenv('DASHBOARD_CURSOR_BATCH', '5000'))
+
+# Jenis kolom yang didukung load_columns
+TEXT, CATEGORY, DATETIME, LIST, MAPPING = 'text', 'category', 'datetime', 'list', 'mapping'
+
+
+def _text_column(values, default):
+    return pd.array([v if isinstance(v, str) else default for v in values], dtype=STRING_DTYPE)
+
+
+def _category_column(values, default):
+    return pd.Categorical([v if isinstance(v, str) and v else default for v in values])
+
+
+def _datetime_column(values, default):
+    column = pd.to_datetime(pd.Series(values, dtype=object), errors='coerce', utc=True)
+    return column.dt.tz_localize(None).array
+
+
+def _list_column(values, default):
+    column = pd.Series([v if isinstance(v, list) else [] for v in values], dtype=object)
+    return column.array
+
+
+def _mapping_column(values, default):
+    column = pd.Series([v if isinstance(v, dict) else {} for v in values], dtype=object)
+    return column.array
+
+
+_BUILDERS = {TEXT: _text_column, CATEGORY: _category_column, DATETIME: _datetime_column, LIST: _list_column,
+             MAPPING: _mapping_column}
+_DEFAULTS = {TEXT: '', CATEGORY: 'Unknown', DATETIME: None, LIST: None, MAPPING: None}
+
+
+def load_columns(cursor, columns, defaults=None):
+    """Builds a typed DataFrame straight from a cursor, one Python list per column.
+
+    columns maps field -> kind (TEXT, CATEGORY, DATETIME, LIST or MAPPING); defaults
+    maps field -> value for missing or empty entries. Unlike DataFrame(list of
+    dicts) followed by .apply/.astype passes, no per-row dict is kept and each
+    column is converted once: text to Arrow strings (when pyarrow is
+    installed), category to pandas Categorical. Returns (frame, last _id seen).
+    """
+    defaults = defaults or {}
+    values = {field: [] for field in columns}
+    appenders = [(field, values[field].append) for field in columns]
+    last_id = None
+    for doc in cursor:
+        for field, append in appenders:
+            append(doc.get(field))
+        last_id = doc.get('_id', last_id)
+    frame = pd.DataFrame({
+        field: _BUILDERS[kind](values.pop(field), defaults.get(field, _DEFAULTS[kind]))
+        for field, kind in columns.items()
+    })
+    return frame, last_id
+
+
+class ArticleFrameCache:
+    """Process-wide DataFrame of articles refreshed by _id high-water mark.
+
+    frame() returns the cached frame, first appending documents whose _id is
+    above the largest _id already loaded (at most every refresh_seconds).
+    Every reconcile_seconds the frame is rebuilt from a full query, which
+    picks up deleted and updated documents the delta query cannot see.
+    Between full loads rows are only appended, so row positions stay valid
+    until generation changes. Only the fields in columns are projected; see
+    load_columns.
+    """
+
+    def __init__(self, collection, query, columns, defaults=None, refresh_seconds=None, reconcile_seconds=None):
+        self.collection = collection
+        self.query = query
+        self.columns = columns
+        self.defaults = defaults or {}
+        self.projection = dict({field: 1 for field in columns}, _id=1)
+        self.refresh_seconds = REFRESH_SECONDS if refresh_seconds is None else refresh_seconds
+        self.reconcile_seconds = RECONCILE_SECONDS if reconcile_seconds is None else reconcile_seconds
+        self._lock = threading.Lock()
+        self._df = None
+        self._high_water = None
+        self._last_full = 0.0
+        self._last_delta = 0.0
+        self.generation = 0
+
+    def frame(self):
+        return self.snapshot()[0]
+
+    def snapshot(self):
+        """Returns (frame, generation); generation increases on every full load."""
+        with self._lock:
+            now = time.monotonic()
+            if self._df is None or now - self._last_full >= self.reconcile_seconds:
+                self._load(full=True)
+            elif now - self._last_delta >= self.refresh_seconds:
+                self._load(full=False)
+            return self._df, self.generation
+
+    def invalidate(self):
+        """Forces a full reload on the next frame() call."""
+        with self._lock:
+            self._df = None
+
+    def _load(self, full):
+        start = time.monotonic()
+        query = dict(self.query)
+        if not full and self._high_water is not None:
+            query['_id'] = {'$gt': self._high_water}
+        cursor = self.collection.find(query, self.projection, batch_size=CURSOR_BATCH_SIZE).sort('_id', 1)
+        delta, last_id = load_columns(cursor, self.columns, self.defaults)
+        self._last_delta = time.monotonic()
+        if full:
+            self._last_full = self._last_delta
+            self._high_water = last_id
+            self._df = delta
+            self.generation += 1
+        elif len(delta):
+            self._high_water = last_id
+            self._df = self._append(self._df, delta)
+        else:
+            return
+        logging.info(f"{'Muat penuh' if full else 'Delta'}: {len(delta)} artikel dalam {time.monotonic() - start:.2f} detik "
+                     f"(total {len(self._df)} di cache).")
+
+    def _append(self, frame, delta):
+        if not len(frame):
+            return delta
+        combined = pd.concat([frame, delta], ignore_index=True)
+        for field, kind in self.columns.items():
+            if kind == CATEGORY and combined[field].dtype != 'category':
+                combined[field] = combined[field].astype('category') # Kategori baru di delta
+        return combined
@@ -0,0 +1,67 @@
+"""Wall-clock comparison of the serial and concurrent scrape loops in scrapper2.
+
+Scrapers are replaced by stand-ins that sleep for a simulated network latency,
+so the numbers reflect the scheduling of the loop and not the live sites.
+
+    python benchmarks/bench_concurrency.py --latency 0.8 --workers 5 --rate-scale 10
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rate_limiter  # noqa: E402
+import scrapper2  # noqa: E402
+from rate_limiter import DomainRateLimiter  # noqa: E402
+
+
+def make_fake_scraper(source_name, latency):
+    """Returns a scraper stand-in that takes a rate-limiter slot, waits `latency` seconds and returns one article."""
+    domain = f"{source_name.lower().replace(' ', '')}.test"
+
+    def fake_scraper(keyword, max_articles_per_keyword=25, page=1):
+        scrapper2.RATE_LIMITER.acquire(domain)
+        time.sleep(latency)
+        scrapper2.RATE_LIMITER.record(domain, 200, latency)
+        return [{"title": f"{keyword} {source_name}", "link": f"https://example.com/{source_name}/{keyword}",
+                 "content": keyword, "source": source_name}]
+    return fake_scraper
+
+
+def run_loop(scrapers, workers):
+    start = time.perf_counter()
+    pairs = sum(1 for _ in scrapper2.iter_scrape_results(scrapper2.KEYWORDS, scrapers, 30, workers, threading.Event()))
+    return pairs, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.8, help="Simulated seconds per search request")
+    parser.add_argument("--workers", type=int, default=len(scrapper2.SCRAPERS))
+    parser.add_argument("--rate-scale", type=float, default=10.0,
+                        help="Factor applied to the per-domain rate limits (1.0 = production values)")
+    args = parser.parse_args()
+
+    scrapers = {name: make_fake_scraper(name, args.latency) for name in scrapper2.SCRAPERS}
+
+    def fresh_limiter():
+        return DomainRateLimiter(base_rate=rate_limiter.BASE_RATE * args.rate_scale,
+                                 min_rate=rate_limiter.MIN_RATE * args.rate_scale,
+                                 max_rate=rate_limiter.MAX_RATE * args.rate_scale)
+
+    scrapper2.RATE_LIMITER = fresh_limiter()
+    serial_pairs, serial_time = run_loop(scrapers, workers=1)
+    scrapper2.RATE_LIMITER = fresh_limiter()
+    concurrent_pairs, concurrent_time = run_loop(scrapers, workers=args.workers)
+
+    print(f"keyword x source pairs : {serial_pairs} (serial) / {concurrent_pairs} (concurrent)")
+    print(f"serial loop            : {serial_time:8.2f} s")
+    print(f"concurrent ({args.workers} workers) : {concurrent_time:8.2f} s")
+    print(f"speedup                : {serial_time / concurrent_time:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Compares the dashboard's old DataFrame build with the columnar article_cache loader.
+
+Documents are generated in memory and fed to both paths as the cursor, so
+the numbers cover the client-side work (row dicts, DataFrame build, type
+passes) and not the network; the projection also drops the date and
+keywords_found fields from what the server has to send.
+
+    python benchmarks/bench_frame_loading.py --articles 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from article_cache import CATEGORY, TEXT, load_columns  # noqa: E402
+from make_fixtures import _WORDS, _sentence  # noqa: E402
+
+SOURCES = ["Detik.com", "CNN Indonesia", "Kompas.com", "Tribunnews.com", "Suara.com"]
+
+
+def make_documents(n, seed=0):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    return [{
+        "title": _sentence(rng, 10), "content": _sentence(rng, 40), "source": rng.choice(SOURCES),
+        "date": start + timedelta(minutes=i), "keywords_found": [rng.choice(_WORDS)],
+    } for i in range(n)]
+
+
+def old_path(docs):
+    """fetch_data before the columnar loader: all fields, list of dicts, then .apply/.astype passes."""
+    data = [{k: doc[k] for k in ("title", "date", "content", "keywords_found", "source")} for doc in docs]
+    df = pd.DataFrame(data)
+    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    df.dropna(subset=['date'], inplace=True)
+    df['content'] = df['content'].fillna('').astype(str)
+    df['title'] = df['title'].fillna('').astype(str)
+    df['source'] = df['source'].fillna('Sumber Tidak Diketahui').astype(str).replace('', 'Sumber Tidak Diketahui')
+    df['keywords_found'] = df['keywords_found'].apply(lambda x: x if isinstance(x, list) else [])
+    return df
+
+
+def new_path(docs):
+    projected = ({k: doc[k] for k in ("title", "content", "source")} for doc in docs)
+    return load_columns(projected, {"source": CATEGORY, "title": TEXT, "content": TEXT})[0]
+
+
+def measure(func, docs):
+    start = time.perf_counter()
+    frame = func(docs)
+    return time.perf_counter() - start, frame.memory_usage(deep=True).sum()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=100_000)
+    args = parser.parse_args()
+
+    docs = make_documents(args.articles)
+    print(f"{args.articles} artikel sintetis")
+    print(f"{'path':10s} {'seconds':>8s} {'frame MB':>9s}")
+    results = {}
+    for name, func in (("old", old_path), ("columnar", new_path)):
+        results[name] = measure(func, docs)
+        elapsed, size = results[name]
+        print(f"{name:10s} {elapsed:8.2f} {size / 1e6:9.1f}")
+    old, new = results["old"], results["columnar"]
+    print(f"speedup {old[0] / new[0]:.1f}x, frame {old[1] / new[1]:.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
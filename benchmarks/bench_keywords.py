@@ -0,0 +1,94 @@
+"""Compares keyword tagging paths on synthetic articles, with KEYWORDS and with a list of thousands.
+
+    substring   the old scrapper.py check: `keyword in text` per keyword
+                (no word boundaries, so it also counts "kdrt" in "kdrtnya")
+    regex       one compiled \\bkeyword\\b pattern per keyword (same semantics
+                as the automaton, but one scan per keyword)
+    automaton   keyword_matcher.KeywordMatcher (Aho-Corasick, one pass)
+
+regex and automaton must tag every article identically; the script exits
+non-zero if not.
+
+    python benchmarks/bench_keywords.py --articles 5000 --keywords 3000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keyword_matcher import KEYWORDS, KeywordMatcher, _normalize  # noqa: E402
+from make_fixtures import _sentence  # noqa: E402
+
+
+def make_keywords(n, seed=0):
+    """KEYWORDS plus random one- to three-word phrases from the fixture vocabulary, n in total."""
+    rng = random.Random(seed)
+    keywords = dict.fromkeys(KEYWORDS)
+    while len(keywords) < n:
+        keywords[_sentence(rng, rng.randint(1, 3)).lower()] = None
+    return list(keywords)
+
+
+def make_articles(n, keywords, seed=0):
+    rng = random.Random(seed)
+    articles = []
+    for _ in range(n):
+        words = _sentence(rng, 50).split()
+        words.insert(rng.randrange(len(words)), rng.choice(keywords).upper())
+        articles.append((_sentence(rng, 10).capitalize(), " ".join(words)))
+    return articles
+
+
+def substring_tags(keywords, articles):
+    tags = []
+    for title, content in articles:
+        content_to_check = title.lower() + " " + content.lower()
+        tags.append([keyword for keyword in keywords if keyword in content_to_check])
+    return tags
+
+
+def regex_tags(keywords, articles):
+    patterns = [(keyword, re.compile(r"\b" + re.escape(keyword) + r"\b")) for keyword in keywords]
+    tags = []
+    for title, content in articles:
+        texts = (_normalize(title), _normalize(content))
+        tags.append([keyword for keyword, pattern in patterns if any(pattern.search(text) for text in texts)])
+    return tags
+
+
+def automaton_tags(keywords, articles):
+    matcher = KeywordMatcher(keywords)
+    return [matcher.match(title, content) for title, content in articles]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=5000)
+    parser.add_argument("--keywords", type=int, default=3000)
+    args = parser.parse_args()
+
+    failed = False
+    for keywords in (KEYWORDS, make_keywords(args.keywords)):
+        articles = make_articles(args.articles, keywords)
+        print(f"\n{len(keywords)} kata kunci, {args.articles} artikel sintetis")
+        print(f"{'path':10s} {'seconds':>8s} {'tags':>8s}")
+        results = {}
+        for name, func in (("substring", substring_tags), ("regex", regex_tags), ("automaton", automaton_tags)):
+            start = time.perf_counter()
+            results[name] = func(keywords, articles)
+            elapsed = time.perf_counter() - start
+            print(f"{name:10s} {elapsed:8.2f} {sum(map(len, results[name])):8d}")
+        if results["regex"] != results["automaton"]:
+            print("❌ Tag automaton berbeda dari regex.")
+            failed = True
+    if failed:
+        sys.exit(1)
+    print("\n✅ regex dan automaton menandai artikel secara identik.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""Offline benchmark of scrapper2: parser throughput and end-to-end main_scrape time.
+
+Search pages are served by a local stand-in HTTP server with simulated
+latency: pages recorded with record_fixtures.py when available, otherwise
+deterministic synthetic pages from make_fixtures.py. Requests to the real
+sites are rerouted to that server, so a run never touches the network and
+gives the same numbers from run to run.
+
+Reported per parsing backend: articles/sec, bytes/sec, peak memory (RSS
+growth and Python heap peak, measured in a fresh process), and the wall
+time of a full main_scrape against a scratch MongoDB database.
+
+    python benchmarks/bench_offline.py --latency 0.3 --workers 5 --output baseline.json
+    python benchmarks/bench_offline.py --skip-e2e
+"""
+import argparse
+import atexit
+import gzip
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# State lokal scraper (spool, checkpoint, Bloom filter, cache) dipisah dari run produksi
+_WORK_DIR = tempfile.mkdtemp(prefix="scraper_bench_")
+atexit.register(shutil.rmtree, _WORK_DIR, ignore_errors=True)
+os.environ.update({
+    "SPOOL_DIR": os.path.join(_WORK_DIR, ".spool"),
+    "REJECT_DIR": _WORK_DIR,
+    "CHECKPOINT_PATH": os.path.join(_WORK_DIR, ".checkpoints", "scrape_checkpoint.json"),
+    "LINK_BLOOM_PATH": os.path.join(_WORK_DIR, ".checkpoints", "link_bloom"),
+    "HTTP_CACHE_DIR": os.path.join(_WORK_DIR, ".http_cache"),
+})
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymongo import MongoClient  # noqa: E402
+from pymongo.errors import PyMongoError  # noqa: E402
+
+import http_client  # noqa: E402
+import rate_limiter  # noqa: E402
+import scrapper2  # noqa: E402
+from bench_parsers import FixtureResponse  # noqa: E402
+from make_fixtures import build_page  # noqa: E402
+from news_store import ensure_indexes  # noqa: E402
+from rate_limiter import DomainRateLimiter  # noqa: E402
+from record_fixtures import load_manifest, load_recorded, page_key  # noqa: E402
+
+# Host asli di URL pencarian scrapper2 -> sumber berita
+HOST_SOURCES = {
+    "www.detik.com": "Detik.com",
+    "www.cnnindonesia.com": "CNN Indonesia",
+    "search.kompas.com": "Kompas.com",
+    "www.tribunnews.com": "Tribunnews.com",
+    "www.suara.com": "Suara.com",
+}
+
+BACKENDS = ("bs4", "lxml")
+
+_REAL_FETCH_PAGE = scrapper2.fetch_page
+
+
+# --- Server pengganti situs berita ---
+
+class FixtureServer(ThreadingHTTPServer):
+    """Local HTTP/1.1 server answering search URLs rewritten as /<original host>/<path>?<query>."""
+    daemon_threads = True
+
+    def __init__(self, latency=0.3, jitter=0.2, seed=0):
+        super().__init__(("127.0.0.1", 0), FixtureHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.manifest = load_manifest()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._pages = {}
+        self.requests = 0
+        self.bytes_sent = 0
+        self.recorded_hits = 0
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def delay(self):
+        with self._lock:
+            return max(self.latency * (1 + self._rng.uniform(-self.jitter, self.jitter)), 0)
+
+    def page_body(self, source_name, keyword, page):
+        """Returns (html bytes, gzip bytes) for a page, the recorded capture when there is one."""
+        key = page_key(source_name, keyword, page)
+        with self._lock:
+            cached = self._pages.get(key)
+        if cached is None:
+            entry = self.manifest.get(key)
+            html = load_recorded(entry) if entry else build_page(source_name, keyword, page)
+            raw = html.encode("utf-8")
+            cached = (raw, gzip.compress(raw, compresslevel=6), entry is not None)
+            with self._lock:
+                self._pages[key] = cached
+        return cached
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, seperti situs aslinya
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        host = parts.path.lstrip("/").partition("/")[0]
+        source_name = HOST_SOURCES.get(host)
+        if source_name is None:
+            self.send_error(404)
+            return
+        params = parse_qs(parts.query)
+        keyword = (params.get("query") or params.get("q") or [""])[0]
+        page = int((params.get("page") or ["1"])[0])
+        raw, compressed, recorded = self.server.page_body(source_name, keyword, page)
+        body = compressed if "gzip" in self.headers.get("Accept-Encoding", "") else raw
+
+        time.sleep(self.server.delay())
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        if body is compressed:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with self.server._lock:
+            self.server.requests += 1
+            self.server.bytes_sent += len(body)
+            self.server.recorded_hits += recorded
+
+    def log_message(self, format, *args):
+        pass
+
+
+def route_to(server_url):
+    """Reroutes http_client.get (used by scrapper2.fetch_page) from the live sites to the local server."""
+    real_get = http_client.get
+
+    def local_get(url, headers=None, timeout=30, **kwargs):
+        parts = urlsplit(url)
+        local_url = f"{server_url}/{parts.hostname}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+        return real_get(local_url, headers=headers, timeout=timeout, **kwargs)
+
+    http_client.get = local_get
+
+
+# --- Throughput parser ---
+
+def corpus(source_name, keywords=3, pages=2):
+    """Recorded pages of a source, or synthetic ones for the first keywords when none were recorded."""
+    recorded = [load_recorded(e) for e in load_manifest().values() if e["source"] == source_name]
+    if recorded:
+        return recorded
+    return [build_page(source_name, keyword, page)
+            for keyword in scrapper2.KEYWORDS[:keywords] for page in range(1, pages + 1)]
+
+
+def _max_rss():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024  # Linux: KB
+
+
+def _parse_all(pages, backend):
+    scrapper2.PARSER_BACKEND = backend
+    articles = 0
+    for source_name, htmls in pages.items():
+        scraper_func = scrapper2.SCRAPERS[source_name]
+        for html in htmls:
+            scrapper2.fetch_page = lambda url, timeout=45, html=html: FixtureResponse(html)
+            articles += len(scraper_func("benchmark", max_articles_per_keyword=30) or [])
+    return articles
+
+
+def _parser_worker(backend, repeat):
+    """Runs in a fresh process so peak memory belongs to one backend only."""
+    logging.getLogger().setLevel(logging.WARNING)
+    pages = {source_name: corpus(source_name) for source_name in scrapper2.SCRAPERS}
+    total_bytes = sum(len(html.encode("utf-8")) for htmls in pages.values() for html in htmls)
+    rss_before = _max_rss()
+
+    start = time.perf_counter()
+    articles = sum(_parse_all(pages, backend) for _ in range(repeat))
+    elapsed = time.perf_counter() - start
+    rss_after = _max_rss()
+
+    tracemalloc.start()
+    _parse_all(pages, backend)
+    heap_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "backend": backend,
+        "pages": sum(len(htmls) for htmls in pages.values()) * repeat,
+        "articles": articles,
+        "bytes": total_bytes * repeat,
+        "seconds": elapsed,
+        "articles_per_sec": articles / elapsed,
+        "bytes_per_sec": total_bytes * repeat / elapsed,
+        "peak_rss_growth": (rss_after - rss_before) if rss_before is not None else None,
+        "peak_python_heap": heap_peak,
+    }
+
+
+def bench_parsers(backends, repeat):
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for backend in backends:
+        with context.Pool(1) as pool:
+            results.append(pool.apply(_parser_worker, (backend, repeat)))
+    return results
+
+
+# --- main_scrape end-to-end ---
+
+def connect_scratch_db(uri, db_name):
+    try:
+        client = MongoClient(uri, serverSelectionTimeoutMS=3000)
+        client.server_info()
+    except PyMongoError as e:
+        print(f"MongoDB {uri} tidak bisa diakses, benchmark end-to-end dilewati: {e}")
+        return None
+    return client[db_name]["woman_abuse"]
+
+
+def bench_main_scrape(collection, server, backend, args):
+    collection.drop()
+    ensure_indexes(collection)
+    shutil.rmtree(os.path.join(_WORK_DIR, ".checkpoints"), ignore_errors=True)  # Bloom filter run sebelumnya
+
+    scrapper2._collection = collection
+    scrapper2.fetch_page = _REAL_FETCH_PAGE
+    scrapper2.HTTP_CACHE = None
+    scrapper2.PARSER_BACKEND = backend
+    scrapper2.RATE_LIMITER = DomainRateLimiter(base_rate=rate_limiter.BASE_RATE * args.rate_scale,
+                                               min_rate=rate_limiter.MIN_RATE * args.rate_scale,
+                                               max_rate=rate_limiter.MAX_RATE * args.rate_scale)
+    requests_before, bytes_before = server.requests, server.bytes_sent
+
+    start = time.perf_counter()
+    scrapper2.main_scrape(max_total_articles=args.target, workers=args.workers, max_pages=args.max_pages)
+    elapsed = time.perf_counter() - start
+
+    stored = collection.count_documents({})
+    if not args.keep_db:
+        collection.drop()
+    return {
+        "backend": backend,
+        "seconds": elapsed,
+        "requests": server.requests - requests_before,
+        "bytes_on_wire": server.bytes_sent - bytes_before,
+        "articles_stored": stored,
+        "articles_per_sec": stored / elapsed,
+    }
+
+
+def _mb(value):
+    return f"{value / 1e6:8.2f}" if value is not None else f"{'n/a':>8s}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--repeat", type=int, default=10, help="Berapa kali korpus di-parse per backend")
+    parser.add_argument("--latency", type=float, default=0.3, help="Latensi simulasi per request (detik)")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Variasi latensi relatif (+/-)")
+    parser.add_argument("--workers", type=int, default=scrapper2.DEFAULT_WORKERS)
+    parser.add_argument("--target", type=int, default=150, help="Target artikel baru main_scrape")
+    parser.add_argument("--max-pages", type=int, default=2)
+    parser.add_argument("--rate-scale", type=float, default=10.0,
+                        help="Faktor untuk batas laju per domain (1.0 = nilai produksi)")
+    parser.add_argument("--mongo-uri", default=os.getenv("BENCH_MONGO_URI", "mongodb://localhost:27017"))
+    parser.add_argument("--mongo-db", default="scraper_bench", help="Database scratch (koleksinya di-drop)")
+    parser.add_argument("--keep-db", action="store_true", help="Jangan drop koleksi setelah run")
+    parser.add_argument("--skip-e2e", action="store_true", help="Hanya ukur parser")
+    parser.add_argument("--output", help="Simpan hasil sebagai JSON (baseline untuk dibandingkan)")
+    parser.add_argument("--verbose", action="store_true", help="Tampilkan log scraper")
+    args = parser.parse_args()
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    recorded = len(load_manifest())
+    print(f"Fixture: {recorded} halaman terekam" + ("" if recorded else " (memakai halaman sintetis)"))
+
+    parser_results = bench_parsers(args.backends, args.repeat)
+    print(f"\n{'backend':8s} {'pages':>6s} {'articles':>9s} {'art/s':>9s} {'MB/s':>8s} {'RSS +MB':>8s} {'heap MB':>8s}")
+    for r in parser_results:
+        print(f"{r['backend']:8s} {r['pages']:6d} {r['articles']:9d} {r['articles_per_sec']:9.0f} "
+              f"{r['bytes_per_sec'] / 1e6:8.2f} {_mb(r['peak_rss_growth'])} {_mb(r['peak_python_heap'])}")
+
+    e2e_results = []
+    collection = None if args.skip_e2e else connect_scratch_db(args.mongo_uri, args.mongo_db)
+    if collection is not None:
+        server = FixtureServer(latency=args.latency, jitter=args.jitter).start()
+        route_to(server.url)
+        try:
+            for backend in args.backends:
+                e2e_results.append(bench_main_scrape(collection, server, backend, args))
+        finally:
+            server.shutdown()
+        print(f"\nmain_scrape: latency {args.latency:g}s ±{args.jitter:.0%}, {args.workers} worker, "
+              f"target {args.target}, max {args.max_pages} halaman, rate x{args.rate_scale:g}")
+        print(f"{'backend':8s} {'seconds':>8s} {'requests':>9s} {'wire MB':>8s} {'stored':>7s} {'art/s':>7s}")
+        for r in e2e_results:
+            print(f"{r['backend']:8s} {r['seconds']:8.2f} {r['requests']:9d} {r['bytes_on_wire'] / 1e6:8.2f} "
+                  f"{r['articles_stored']:7d} {r['articles_per_sec']:7.1f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"created_at": datetime.now().isoformat(timespec="seconds"),
+                       "python": platform.python_version(), "platform": platform.platform(),
+                       "config": vars(args), "recorded_pages": recorded,
+                       "parsers": parser_results, "main_scrape": e2e_results}, f, indent=1)
+        print(f"\nHasil disimpan di {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Micro-benchmark of the BeautifulSoup and compiled-XPath parsing backends of scrapper2.
+
+Each scraper is run against its saved search-page fixture (no network) once
+per backend. The script checks that both backends extract the same
+articles and reports the time per page and the speedup. The synthetic
+fixtures are built from the same selectors as the lxml backend, so parity is
+also checked on the real pages saved by record_fixtures.py when there are any;
+only that check says whether 'lxml' can become the default backend.
+
+    python benchmarks/bench_parsers.py --repeat 50
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrapper2  # noqa: E402
+from parsers import parse_search_page  # noqa: E402
+from make_fixtures import FIXTURES, load_fixture  # noqa: E402
+from record_fixtures import load_manifest, load_recorded  # noqa: E402
+
+
+class FixtureResponse:
+    """Minimal stand-in for requests.Response serving a fixture body."""
+    status_code = 200
+    headers = {}
+
+    def __init__(self, text):
+        self.text = text
+        self.content = text.encode("utf-8")
+
+    def raise_for_status(self):
+        pass
+
+
+def run_scraper(source_name, html, backend, repeat):
+    scrapper2.PARSER_BACKEND = backend
+    scrapper2.fetch_page = lambda url, timeout=45: FixtureResponse(html)
+    scraper_func = scrapper2.SCRAPERS[source_name]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        articles = scraper_func("kekerasan perempuan", max_articles_per_keyword=30)
+    return articles, (time.perf_counter() - start) / repeat
+
+
+def recorded_parity():
+    """Compares both backends on the recorded real pages; returns (pages checked, keys of pages that differ)."""
+    differing = []
+    manifest = load_manifest()
+    for key, entry in manifest.items():
+        html = load_recorded(entry)
+        if parse_search_page(entry["source"], html, 30, "bs4") != parse_search_page(entry["source"], html, 30, "lxml"):
+            differing.append(key)
+    return len(manifest), differing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    print(f"{'source':16s} {'KB':>6s} {'items':>5s} {'bs4 ms':>8s} {'lxml ms':>8s} {'speedup':>8s}  same")
+    total_bs4 = total_lxml = 0.0
+    all_same = True
+    for source_name in FIXTURES:
+        html = load_fixture(source_name)
+        bs4_articles, bs4_time = run_scraper(source_name, html, "bs4", args.repeat)
+        lxml_articles, lxml_time = run_scraper(source_name, html, "lxml", args.repeat)
+        same = bs4_articles == lxml_articles
+        all_same &= same
+        total_bs4 += bs4_time
+        total_lxml += lxml_time
+        print(f"{source_name:16s} {len(html) / 1024:6.1f} {len(lxml_articles or []):5d} "
+              f"{bs4_time * 1000:8.2f} {lxml_time * 1000:8.2f} {bs4_time / lxml_time:7.1f}x  {'yes' if same else 'NO'}")
+    print(f"{'all sources':16s} {'':6s} {'':5s} {total_bs4 * 1000:8.2f} {total_lxml * 1000:8.2f} {total_bs4 / total_lxml:7.1f}x")
+
+    checked, differing = recorded_parity()
+    if not checked:
+        print("\nBelum ada halaman asli terekam (python benchmarks/record_fixtures.py): paritas di data nyata belum terbukti.")
+    else:
+        print(f"\nHalaman asli terekam: {checked - len(differing)}/{checked} identik antar backend.")
+        for key in differing:
+            print(f"  berbeda: {key}")
+    if not all_same or differing:
+        sys.exit("Backend outputs differ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Compares word-frequency counting paths on a synthetic 100k-article corpus.
+
+    legacy      the dashboard before term_counts: one joined corpus string,
+                NLTK's word tokenizer, then a list comprehension with
+                isalpha/stopword/len filters
+    vectorized  pandas Series.str ops, .str.split().explode().value_counts()
+    per-article text_tokens.term_counts for every article (the ingest path),
+                summed into one Counter
+    stored      only the summing step, over term_counts computed beforehand:
+                what the dashboard does with the counts stored at ingest
+
+All paths must produce identical counts; the script exits non-zero if not.
+The corpus wraps words in typographic quotes and dashes (“korban”, di—jakarta),
+which the old tokenizer split off. The vectorized path only strips ASCII
+punctuation, so it is expected to differ on those words.
+
+    python benchmarks/bench_tokenizer.py --articles 100000
+"""
+import argparse
+import os
+import random
+import re
+import string
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from text_tokens import CUSTOM_STOPWORDS, term_counts  # noqa: E402
+from make_fixtures import _sentence  # noqa: E402
+
+# Hiasan teks berita nyata: tanggal, tanda kutip tipografis, tautan, angka
+_DECORATIONS = [
+    "(12/5/2025)", "“korban”", "—", "Rp 5 juta.", "https://www.detik.com/berita/d-123", "KDRT,", "10.15 WIB", "2025:",
+]
+# Kata yang menempel pada tanda baca Unicode, mis. “kekerasan”, ‘pelaku’, di—jakarta
+_WRAPS = ["“{}”", "‘{}’", "«{}»", "{}—", "—{}", "{}–", "({}),", "{}."]
+
+
+def _decorate(rng, words, count):
+    for _ in range(count):
+        words.insert(rng.randrange(len(words)), rng.choice(_DECORATIONS))
+    for _ in range(count):
+        index = rng.randrange(len(words))
+        words[index] = rng.choice(_WRAPS).format(words[index])
+    return " ".join(words)
+
+
+def make_corpus(n, seed=0):
+    rng = random.Random(seed)
+    titles, contents = [], []
+    for _ in range(n):
+        titles.append(_decorate(rng, _sentence(rng, 10).capitalize().split(), 1))
+        contents.append(_decorate(rng, _sentence(rng, 40).split(), 4))
+    return titles, contents
+
+
+def _word_tokenize():
+    """NLTK's word tokenizer without punkt sentence splitting (the legacy cleanup removes '.' anyway)."""
+    try:
+        from nltk.tokenize import NLTKWordTokenizer
+    except ImportError:
+        sys.exit("❌ nltk tidak terpasang: path legacy butuh tokenizer NLTK (pip install nltk).")
+    return NLTKWordTokenizer().tokenize, "NLTKWordTokenizer"
+
+
+def legacy_counts(titles, contents, word_tokenize):
+    text_corpus = ' '.join(titles) + ' ' + ' '.join(contents)
+    text_corpus = text_corpus.lower()
+    text_corpus = re.sub(r'http\S+|www\S+|https\S+', '', text_corpus, flags=re.MULTILINE)
+    text_corpus = text_corpus.translate(str.maketrans('', '', string.punctuation))
+    text_corpus = re.sub(r'\d+', '', text_corpus)
+    text_corpus = ' '.join(text_corpus.split())
+    tokens = word_tokenize(text_corpus)
+    return Counter(word for word in tokens if word.isalpha() and word not in CUSTOM_STOPWORDS and len(word) > 2)
+
+
+def vectorized_counts(titles, contents):
+    text = (pd.Series(titles, dtype=object) + ' ' + pd.Series(contents, dtype=object)).str.lower()
+    text = text.str.replace(r'http\S+|www\S+|https\S+', '', regex=True)
+    text = text.str.translate(str.maketrans('', '', string.punctuation)).str.replace(r'\d+', '', regex=True)
+    words = text.str.split().explode().dropna()
+    words = words[words.str.isalpha() & (words.str.len() > 2) & ~words.isin(CUSTOM_STOPWORDS)]
+    return Counter(words.value_counts().to_dict())
+
+
+def per_article_counts(titles, contents):
+    counts = Counter()
+    for title, content in zip(titles, contents):
+        counts.update(term_counts(title, content))
+    return counts
+
+
+def stored_counts(stored):
+    counts = Counter()
+    for article_counts in stored:
+        counts.update(article_counts)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=100_000)
+    args = parser.parse_args()
+
+    titles, contents = make_corpus(args.articles)
+    stored = [term_counts(title, content) for title, content in zip(titles, contents)]
+    word_tokenize, tokenizer_name = _word_tokenize()
+    print(f"{args.articles} artikel sintetis, tokenizer legacy: {tokenizer_name}")
+    paths = [
+        ("legacy", lambda: legacy_counts(titles, contents, word_tokenize)),
+        ("vectorized", lambda: vectorized_counts(titles, contents)),
+        ("per-article", lambda: per_article_counts(titles, contents)),
+        ("stored", lambda: stored_counts(stored)),
+    ]
+    results = {}
+    print(f"{'path':12s} {'seconds':>8s} {'terms':>7s}")
+    for name, func in paths:
+        start = time.perf_counter()
+        results[name] = func()
+        elapsed = time.perf_counter() - start
+        print(f"{name:12s} {elapsed:8.2f} {len(results[name]):7d}")
+    reference = results["legacy"]
+    mismatched = [name for name, counts in results.items() if name != "vectorized" and counts != reference]
+    if results["vectorized"] != reference:
+        print("ℹ️ vectorized berbeda dari legacy (hanya menghapus tanda baca ASCII), seperti yang diharapkan.")
+    if mismatched:
+        print(f"❌ Hitungan berbeda dari legacy: {', '.join(mismatched)}")
+        sys.exit(1)
+    print("✅ legacy, per-article dan stored menghasilkan hitungan yang identik.")
+
+
+if __name__ == "__main__":
+    main()
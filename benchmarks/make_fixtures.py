@@ -0,0 +1,170 @@
+"""Builds the HTML search-page fixtures used by the parser benchmarks.
+
+The pages follow the markup the scrapers in scrapper2 expect (same tags and
+classes) and are padded with navigation, scripts and footer blocks so the
+parse cost resembles a real results page. They are deterministic, so
+benchmark numbers are comparable between runs. Real captures can replace
+them under the same file names.
+
+    python benchmarks/make_fixtures.py
+"""
+import os
+import random
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Nama file fixture per sumber berita (kunci sama dengan scrapper2.SCRAPERS)
+FIXTURES = {
+    "Detik.com": "detik.html",
+    "CNN Indonesia": "cnn.html",
+    "Kompas.com": "kompas.html",
+    "Tribunnews.com": "tribun.html",
+    "Suara.com": "suara.html",
+}
+
+ITEMS_PER_PAGE = 20
+
+_DAYS = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
+_MONTHS = ["Januari", "Februari", "Maret", "April", "Mei", "Juni", "Juli",
+           "Agustus", "September", "Oktober", "November", "Desember"]
+_WORDS = ("polisi tangkap pelaku kekerasan perempuan kdrt korban istri anak dianiaya pelecehan seksual "
+          "kasus perkosaan trafficking perdagangan manusia tersangka ditahan polres polda warga desa kota "
+          "pengadilan vonis hakim jaksa tuntutan saksi lembaga pendampingan komnas perlindungan").split()
+_CITIES = ["Surabaya", "Medan", "Makassar", "Bandung", "Semarang", "Kupang", "Palembang", "Denpasar", "Bogor", "Malang"]
+
+
+def _sentence(rng, n):
+    return " ".join(rng.choice(_WORDS) for _ in range(n))
+
+
+def _title(rng, keyword=None):
+    head = keyword.capitalize() if keyword else _sentence(rng, 4).capitalize()
+    return f"{head} di {rng.choice(_CITIES)}, {_sentence(rng, 3)}"
+
+
+def _slug(text):
+    return "-".join(text.lower().replace(",", "").split())[:80]
+
+
+def _long_date(rng):
+    return f"{rng.choice(_DAYS)}, {rng.randint(1, 28):02d} {rng.choice(_MONTHS)} 2025 {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d} WIB"
+
+
+def _chrome(rng, site, body):
+    """Wraps result markup with the kind of boilerplate a real results page carries."""
+    nav = "".join(f'<li class="nav__item"><a href="https://{site}/kanal/{i}">Kanal {i}</a></li>' for i in range(60))
+    scripts = "".join(
+        f"<script>window.dataLayer=window.dataLayer||[];dataLayer.push({{'event':'view','slot':{i},'kw':'{_sentence(rng, 3)}'}});</script>"
+        for i in range(25))
+    trending = "".join(f'<div class="trending__item"><a href="https://{site}/trending/{i}">{_title(rng)}</a><span>{i}</span></div>'
+                       for i in range(30))
+    footer = "".join(f'<p class="footer__text">{_sentence(rng, 25)}</p>' for i in range(15))
+    return (f'<!DOCTYPE html><html lang="id"><head><meta charset="utf-8"><title>Hasil Pencarian - {site}</title>'
+            f'<style>.a{{color:red}} .b{{margin:0}}</style>{scripts}</head><body>'
+            f'<header><nav><ul class="nav">{nav}</ul></nav></header>'
+            f'<main>{body}</main><aside class="trending">{trending}</aside>'
+            f'<footer>{footer}</footer></body></html>')
+
+
+def build_detik(rng, keyword=None):
+    items = []
+    for i in range(ITEMS_PER_PAGE):
+        title = _title(rng, keyword)
+        items.append(
+            f'<article class="list-content__item"><div class="media media--left">'
+            f'<div class="media__image"><a href="#"><img src="https://akcdn.detik.net.id/community/media/visual/{i}.jpg?w=250" alt=""></a></div>'
+            f'<div class="media__text"><h3 class="media__title"><a href="https://news.detik.com/berita/d-{7000000 + i}/{_slug(title)}" class="media__link">{title}</a></h3>'
+            f'<div class="media__date"><span class="media__date" title="">{_long_date(rng)}</span></div>'
+            f'<p class="media__desc">{_sentence(rng, 22)}</p></div></div></article>')
+    # Elemen <article> iklan tanpa struktur media__text (harus dilewati)
+    items.insert(5, '<article class="ads"><div class="ad-slot">Advertisement</div></article>')
+    return _chrome(rng, "www.detik.com", f'<div class="list-content">{"".join(items)}</div>')
+
+
+def build_cnn(rng, keyword=None):
+    items = []
+    for i in range(ITEMS_PER_PAGE):
+        title = _title(rng, keyword)
+        items.append(
+            f'<article class="flex-grow"><a href="/nasional/2025051{i % 10}1{i:05d}-12-{1200000 + i}/{_slug(title)}" class="flex group items-center gap-4">'
+            f'<span class="flex-none"><img src="https://akcdn.detik.net.id/visual/2025/05/{i}.jpeg?w=360" class="w-full"></span>'
+            f'<span class="flex flex-col"><h2 class="text-cnn_black_light3">{title}</h2>'
+            f'<span class="text-xs text-cnn_red">Nasional</span><span class="text-xs text-cnn_grey">{rng.randint(1, 23)} jam yang lalu</span></span></a></article>')
+    return _chrome(rng, "www.cnnindonesia.com", f'<div class="flex flex-col gap-5">{"".join(items)}</div>')
+
+
+def build_kompas(rng, keyword=None):
+    items = []
+    for i in range(ITEMS_PER_PAGE):
+        title = _title(rng, keyword)
+        items.append(
+            f'<div class="article__list clearfix"><div class="article__asset"><a href="#">'
+            f'<img data-src="https://asset.kompas.com/crops/{i}.jpg" src="https://asset.kompas.com/data/lazy.png"></a></div>'
+            f'<div class="article__box"><h3 class="article__title article__title--medium">'
+            f'<a class="article__link" href="https://regional.kompas.com/read/2025/05/{rng.randint(1, 28):02d}/{100000000 + i}/{_slug(title)}">{title}</a></h3>'
+            f'<div class="article__boxsubtitle"><h2 class="article__subtitle">REGIONAL</h2></div>'
+            f'<div class="article__date">{rng.randint(1, 28):02d}/05/2025, {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d} WIB</div>'
+            f'<p class="article__lead">{_sentence(rng, 20)}</p></div></div>')
+    return _chrome(rng, "www.kompas.com", f'<div class="latest--topic">{"".join(items)}</div>')
+
+
+def build_tribun(rng, keyword=None):
+    items = []
+    for i in range(ITEMS_PER_PAGE):
+        title = _title(rng, keyword)
+        region = rng.choice(["surabaya", "medan", "makassar", "jabar", "www"])
+        items.append(
+            f'<li class="ptb15"><div class="fr mt5 pos_rel"><a href="#"><img src="https://asset-2.tstatic.net/tribunnews/foto/{i}.jpg" class="shou2"></a></div>'
+            f'<h3 class="f16 fbo"><a href="https://{region}.tribunnews.com/2025/05/{rng.randint(1, 28):02d}/{_slug(title)}" class="f20 ln24 fbo txt-oev-2">{title}</a></h3>'
+            f'<div class="grey sumari pt5">{_sentence(rng, 20)}</div>'
+            f'<div class="grey pt5"><time class="foot timeago grey" title="2025-05-12 10:15:00">{_long_date(rng)}</time></div></li>')
+    return _chrome(rng, "www.tribunnews.com", f'<div class="lsi"><ul id="lists" class="lsi">{"".join(items)}</ul></div>')
+
+
+def build_suara(rng, keyword=None):
+    items = []
+    for i in range(ITEMS_PER_PAGE):
+        title = _title(rng, keyword)
+        items.append(
+            f'<article class="item"><figure class="item-img"><a href="#"><img data-src="https://media.suara.com/pictures/{i}.jpg" src="https://media.suara.com/lazy.png"></a></figure>'
+            f'<div class="item-content"><h4 class="item-title"><a href="/news/2025/05/{rng.randint(1, 28):02d}/{100000 + i}/{_slug(title)}" class="ellipsis2">{title}</a></h4>'
+            f'<p class="item-desc">{_sentence(rng, 18)}</p>'
+            f'<span class="item-date">News | {_long_date(rng)}</span></div></article>')
+    return _chrome(rng, "www.suara.com", f'<div class="widget-content">{"".join(items)}</div>')
+
+
+BUILDERS = {
+    "Detik.com": build_detik,
+    "CNN Indonesia": build_cnn,
+    "Kompas.com": build_kompas,
+    "Tribunnews.com": build_tribun,
+    "Suara.com": build_suara,
+}
+
+
+def build_page(source_name, keyword=None, page=1):
+    """Builds one deterministic results page; with a keyword, every title mentions it."""
+    seed = source_name if keyword is None and page == 1 else f"{source_name}|{keyword}|{page}"
+    return BUILDERS[source_name](random.Random(seed), keyword)
+
+
+def fixture_path(source_name):
+    return os.path.join(FIXTURE_DIR, FIXTURES[source_name])
+
+
+def load_fixture(source_name):
+    with open(fixture_path(source_name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def main():
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for source_name in BUILDERS:
+        html = build_page(source_name)
+        with open(fixture_path(source_name), "w", encoding="utf-8") as f:
+            f.write(html)
+        print(f"{FIXTURES[source_name]:12s} {len(html) / 1024:6.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Records live search result pages of the scrapper2 sources as benchmark fixtures.
+
+Each page is fetched once through the normal scraper (rate limiter and
+pooled session included, HTTP cache off) and its HTML is stored under
+benchmarks/fixtures/recorded/ together with a manifest. bench_offline.py
+replays these pages instead of the synthetic ones from make_fixtures.py.
+
+    python benchmarks/record_fixtures.py --keywords 3 --pages 2
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrapper2  # noqa: E402
+from make_fixtures import FIXTURE_DIR  # noqa: E402
+
+RECORDED_DIR = os.path.join(FIXTURE_DIR, "recorded")
+MANIFEST_PATH = os.path.join(RECORDED_DIR, "manifest.json")
+
+
+def page_key(source_name, keyword, page):
+    return f"{source_name}|{keyword}|{page}"
+
+
+def load_manifest():
+    """Returns {page_key: entry} of the recorded pages (empty if nothing was recorded)."""
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            pages = json.load(f).get("pages", [])
+    except FileNotFoundError:
+        return {}
+    return {page_key(p["source"], p["keyword"], p["page"]): p for p in pages}
+
+
+def load_recorded(entry):
+    with open(os.path.join(RECORDED_DIR, entry["file"]), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _file_name(source_name, keyword, page):
+    slug = re.sub(r"[^a-z0-9]+", "-", f"{source_name} {keyword}".lower()).strip("-")
+    return f"{slug}-p{page}.html"
+
+
+def record(source_name, keyword, page, manifest):
+    """Runs one scraper call, saving the raw page it fetched. Returns the manifest entry or None."""
+    captured = {}
+    real_fetch_page = scrapper2.fetch_page
+
+    def recording_fetch_page(url, timeout=45):
+        response = real_fetch_page(url, timeout=timeout)
+        if response is not None and response.status_code == 200:
+            captured["url"] = url
+            captured["html"] = response.text
+        return response
+
+    scrapper2.fetch_page = recording_fetch_page
+    try:
+        articles = scrapper2.SCRAPERS[source_name](keyword, max_articles_per_keyword=30, page=page)
+    finally:
+        scrapper2.fetch_page = real_fetch_page
+    if "html" not in captured:
+        logging.warning(f"[{source_name}] Halaman '{keyword}' p{page} tidak terekam")
+        return None
+
+    entry = {
+        "source": source_name, "keyword": keyword, "page": page, "url": captured["url"],
+        "file": _file_name(source_name, keyword, page), "bytes": len(captured["html"].encode("utf-8")),
+        "articles": len(articles or []), "recorded_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    with open(os.path.join(RECORDED_DIR, entry["file"]), "w", encoding="utf-8") as f:
+        f.write(captured["html"])
+    manifest[page_key(source_name, keyword, page)] = entry
+    logging.info(f"💾 [{source_name}] '{keyword}' p{page}: {entry['bytes'] / 1024:.1f} KB, {entry['articles']} artikel")
+    return entry
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keywords", type=int, default=3, help="Jumlah keyword pertama dari scrapper2.KEYWORDS")
+    parser.add_argument("--pages", type=int, default=2, help="Halaman per keyword/sumber")
+    parser.add_argument("--sources", nargs="*", default=list(scrapper2.SCRAPERS), help="Sumber yang direkam")
+    args = parser.parse_args()
+
+    scrapper2.HTTP_CACHE = None  # Selalu ambil body lengkap
+    os.makedirs(RECORDED_DIR, exist_ok=True)
+    manifest = load_manifest()
+    for keyword in scrapper2.KEYWORDS[:args.keywords]:
+        for source_name in args.sources:
+            for page in range(1, args.pages + 1):
+                record(source_name, keyword, page, manifest)
+
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump({"updated_at": datetime.now().isoformat(timespec="seconds"),
+                   "pages": sorted(manifest.values(), key=lambda p: (p["source"], p["keyword"], p["page"]))},
+                  f, ensure_ascii=False, indent=1)
+    logging.info(f"Manifest: {len(manifest)} halaman di {MANIFEST_PATH}")
+
+
+if __name__ == "__main__":
+    main()
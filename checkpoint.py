@@ -0,0 +1,88 @@
+import os
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+
+# File checkpoint run scraping: triple (keyword, sumber, halaman) dan walk paginasi (keyword, sumber) yang sudah selesai
+CHECKPOINT_PATH = os.getenv('CHECKPOINT_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.checkpoints', 'scrape_checkpoint.json'))
+
+
+def _key(keyword, source, page):
+    return f"{source}|{keyword}|{page}"
+
+
+def _walk_key(keyword, source):
+    return f"{source}|{keyword}"
+
+
+class RunCheckpoint:
+    """Persists which (keyword, source, page) triples finished and when.
+
+    It also records finished page walks of a (keyword, source) pair with the
+    reason pagination stopped, so --resume skips the whole pair instead of
+    only the pages it fetched. The file is rewritten atomically after every
+    mark_done / mark_walk_done, so a run killed halfway keeps everything it
+    completed.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or CHECKPOINT_PATH
+        self._lock = threading.Lock()
+        self._done = {}
+        self._walks = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._done = data.get('done', {})
+            self._walks = data.get('walks', {})
+            logging.info(f"Checkpoint dimuat: {len(self._done)} triple, {len(self._walks)} walk selesai ({self.path})")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logging.warning(f"Checkpoint {self.path} tidak bisa dibaca, mulai dari awal: {e}")
+
+    def completed_at(self, keyword, source, page=1):
+        entry = self._done.get(_key(keyword, source, page))
+        return datetime.fromisoformat(entry['completed_at']) if entry else None
+
+    def is_fresh(self, keyword, source, page=1, max_age_hours=24):
+        """True if the triple finished less than max_age_hours ago."""
+        completed_at = self.completed_at(keyword, source, page)
+        return completed_at is not None and datetime.now() - completed_at < timedelta(hours=max_age_hours)
+
+    def mark_done(self, keyword, source, page=1, articles=0):
+        """Records a finished triple (with how many new articles it gave) and saves the file."""
+        with self._lock:
+            self._done[_key(keyword, source, page)] = {
+                'keyword': keyword, 'source': source, 'page': page,
+                'completed_at': datetime.now().isoformat(timespec='seconds'),
+                'new_articles': articles,
+            }
+            self._save()
+
+    def walk_completed_at(self, keyword, source):
+        entry = self._walks.get(_walk_key(keyword, source))
+        return datetime.fromisoformat(entry['completed_at']) if entry else None
+
+    def is_walk_fresh(self, keyword, source, max_age_hours=24):
+        """True if the page walk of the pair finished less than max_age_hours ago."""
+        completed_at = self.walk_completed_at(keyword, source)
+        return completed_at is not None and datetime.now() - completed_at < timedelta(hours=max_age_hours)
+
+    def mark_walk_done(self, keyword, source, stop_reason, pages):
+        """Records a finished page walk (why pagination stopped, after how many pages) and saves the file."""
+        with self._lock:
+            self._walks[_walk_key(keyword, source)] = {
+                'keyword': keyword, 'source': source, 'stop_reason': stop_reason, 'pages': pages,
+                'completed_at': datetime.now().isoformat(timespec='seconds'),
+            }
+            self._save()
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'updated_at': datetime.now().isoformat(timespec='seconds'), 'done': self._done, 'walks': self._walks},
+                      f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,134 @@
+"""Daily rollup of woman_abuse: one row per (day, source, keyword) with an article count.
+
+Rows with keyword None hold the article total of a (day, source) pair plus
+its first/last date; the other rows count keywords_found entries. BatchWriter
+keeps the rollup current with $inc upserts for newly inserted articles and for
+keywords merged into stored articles.
+Rebuild it after changing historical data, while no scraper is writing
+(increments made during a rebuild are lost):
+
+    python daily_rollup.py --rebuild
+"""
+import os
+import logging
+import argparse
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+from pymongo import UpdateOne, InsertOne
+
+from dashboard_queries import UNKNOWN_SOURCE, DISPLAY_TIMEZONE
+
+ROLLUP_COLLECTION = os.getenv('ROLLUP_COLLECTION', 'woman_abuse_daily')
+ROLLUP_INDEX = "day_source_keyword_unique"
+ROLLUP_QUERY_INDEX = "keyword_source_day" # Filter dashboard: baris total (keyword None) atau kata kunci, per sumber
+_DISPLAY_TZ = ZoneInfo(DISPLAY_TIMEZONE)
+
+
+def rollup_collection(articles):
+    """The rollup collection next to the articles collection."""
+    return articles.database[ROLLUP_COLLECTION]
+
+
+def rollup_day(date):
+    """UTC instant (naive) of the DISPLAY_TIMEZONE midnight that starts the day of a naive UTC date."""
+    local = date.replace(tzinfo=timezone.utc).astimezone(_DISPLAY_TZ)
+    midnight = local.replace(hour=0, minute=0, second=0, microsecond=0)
+    return midnight.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def rollup_increments(articles, totals=True):
+    """Maps (day, source, keyword) -> [count, first_date, last_date] for articles with a datetime date.
+
+    With totals=False only keyword rows are counted (keywords added to articles already in the rollup).
+    """
+    increments = {}
+    for article in articles:
+        date = article.get("date")
+        if not isinstance(date, datetime):
+            continue # Sama dengan dashboard: artikel tanpa tanggal terbaca tidak dihitung
+        day = rollup_day(date)
+        source = article.get("source") or UNKNOWN_SOURCE
+        keywords = [keyword for keyword in article.get("keywords_found") or [] if isinstance(keyword, str) and keyword]
+        for keyword in ([None] if totals else []) + keywords:
+            row = increments.get((day, source, keyword))
+            if row is None:
+                increments[(day, source, keyword)] = [1, date, date]
+            else:
+                row[0] += 1
+                row[1] = min(row[1], date)
+                row[2] = max(row[2], date)
+    return increments
+
+
+def update_rollup(rollup, articles, totals=True):
+    """Adds newly inserted articles to the rollup with $inc upserts; returns the number of rows touched.
+
+    totals=False only adds the keywords_found of articles that are already counted.
+    """
+    operations = [
+        UpdateOne({"day": day, "source": source, "keyword": keyword},
+                  {"$inc": {"count": count}, "$min": {"first_date": first}, "$max": {"last_date": last}},
+                  upsert=True)
+        for (day, source, keyword), (count, first, last) in rollup_increments(articles, totals).items()
+    ]
+    if operations:
+        rollup.bulk_write(operations, ordered=False)
+    return len(operations)
+
+
+def _create_indexes(rollup):
+    rollup.create_index([("day", 1), ("source", 1), ("keyword", 1)], unique=True, name=ROLLUP_INDEX)
+    rollup.create_index([("keyword", 1), ("source", 1), ("day", 1)], name=ROLLUP_QUERY_INDEX)
+
+
+def ensure_rollup(articles):
+    """Creates the rollup's indexes and builds it from scratch if it is still empty."""
+    rollup = rollup_collection(articles)
+    _create_indexes(rollup)
+    if rollup.estimated_document_count() == 0 and articles.find_one({"date": {"$type": "date"}}, {"_id": 1}):
+        rebuild_rollup(articles)
+
+
+def rebuild_rollup(articles, batch_size=5000):
+    """Recomputes the whole rollup from the articles; returns the number of rows written.
+
+    Rows are built in a scratch collection that then replaces the rollup in
+    one rename, so the dashboard never reads a half-built rollup.
+    """
+    cursor = articles.find({"date": {"$type": "date"}}, {"date": 1, "source": 1, "keywords_found": 1, "_id": 0},
+                           batch_size=batch_size)
+    increments = rollup_increments(cursor)
+    rollup = rollup_collection(articles)
+    if not increments:
+        rollup.delete_many({})
+        return 0
+    scratch = articles.database[f"{ROLLUP_COLLECTION}_rebuild"]
+    scratch.drop()
+    _create_indexes(scratch)
+    rows = [InsertOne({"day": day, "source": source, "keyword": keyword, "count": count,
+                       "first_date": first, "last_date": last})
+            for (day, source, keyword), (count, first, last) in increments.items()]
+    for start in range(0, len(rows), batch_size):
+        scratch.bulk_write(rows[start:start + batch_size], ordered=False)
+    scratch.rename(ROLLUP_COLLECTION, dropTarget=True)
+    logging.info(f"Rollup harian dibangun ulang: {len(rows)} baris.")
+    return len(rows)
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from pymongo import MongoClient
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Kelola rollup harian (hari, sumber, kata kunci) koleksi woman_abuse.")
+    parser.add_argument("--rebuild", action="store_true", help="Hitung ulang seluruh rollup dari artikel")
+    parser.add_argument("--mongo-uri", default=os.getenv('MONGO_URI'))
+    args = parser.parse_args()
+    collection = MongoClient(args.mongo_uri, serverSelectionTimeoutMS=5000)["sr"]["woman_abuse"]
+    if args.rebuild:
+        print(f"✅ Rollup dibangun ulang: {rebuild_rollup(collection)} baris.")
+    else:
+        ensure_rollup(collection)
+        print(f"✅ Rollup siap: {rollup_collection(collection).estimated_document_count()} baris.")
@@ -0,0 +1,148 @@
+# Pipeline agregasi MongoDB untuk grafik dashboard: hanya baris hasil agregasi yang dikirim ke app.
+# `sources` adalah filter sidebar (None = semua sumber) dan menjadi tahap $match setiap pipeline.
+from bson import ObjectId
+
+UNKNOWN_SOURCE = 'Sumber Tidak Diketahui'
+DISPLAY_TIMEZONE = 'Asia/Jakarta'
+# Query DataFrame artikel di app (ArticleFrameCache): artikel tanpa tanggal terbaca disaring di server
+ARTICLE_FRAME_QUERY = {"date": {"$ne": None}}
+
+# Nama sumber seperti di fetch_data: kosong/null ditampilkan sebagai UNKNOWN_SOURCE
+_SOURCE_EXPR = {"$cond": [{"$in": [{"$ifNull": ["$source", ""]}, [""]]}, UNKNOWN_SOURCE, "$source"]}
+
+
+def source_condition(sources):
+    """Query condition on `source` for the selected sources (UNKNOWN_SOURCE also matches null/empty)."""
+    values = list(sources)
+    if UNKNOWN_SOURCE in values:
+        values += [None, ""]
+    return {"$in": values}
+
+
+def match_stage(sources=None):
+    """$match for articles with a stored datetime, limited to the selected sources."""
+    query = {"date": {"$type": "date"}}
+    if sources is not None:
+        query["source"] = source_condition(sources)
+    return {"$match": query}
+
+
+def source_stats(collection, sources=None):
+    """Per-source article count and first/last date (UTC), largest source first."""
+    pipeline = [
+        match_stage(sources),
+        {"$group": {"_id": _SOURCE_EXPR, "count": {"$sum": 1},
+                    "first_date": {"$min": "$date"}, "last_date": {"$max": "$date"}}},
+        {"$sort": {"count": -1, "_id": 1}},
+        {"$project": {"_id": 0, "source": "$_id", "count": 1, "first_date": 1, "last_date": 1}},
+    ]
+    return list(collection.aggregate(pipeline))
+
+
+def daily_counts(collection, sources=None, timezone=DISPLAY_TIMEZONE):
+    """Articles per calendar day in `timezone`; day is the UTC instant of that day's midnight."""
+    pipeline = [
+        match_stage(sources),
+        {"$group": {"_id": {"$dateTrunc": {"date": "$date", "unit": "day", "timezone": timezone}},
+                    "count": {"$sum": 1}}},
+        {"$sort": {"_id": 1}},
+        {"$project": {"_id": 0, "day": "$_id", "count": 1}},
+    ]
+    return list(collection.aggregate(pipeline))
+
+
+def keyword_counts(collection, sources=None, limit=15):
+    """Most frequent search keywords (keywords_found), most frequent first."""
+    pipeline = [
+        match_stage(sources),
+        {"$unwind": "$keywords_found"},
+        {"$match": {"keywords_found": {"$type": "string", "$nin": [""]}}},
+        {"$group": {"_id": "$keywords_found", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1, "_id": 1}},
+        {"$limit": limit},
+        {"$project": {"_id": 0, "keyword": "$_id", "count": 1}},
+    ]
+    return list(collection.aggregate(pipeline))
+
+
+# --- Versi rollup: membaca woman_abuse_daily (daily_rollup), bukan artikel mentah ---
+# Sumber di rollup sudah dinormalisasi ke UNKNOWN_SOURCE, dan hari sudah dipotong di DISPLAY_TIMEZONE.
+
+def rollup_match_stage(sources=None, keywords=False):
+    """$match for rollup rows: keyword rows when keywords is True, else the per-(day, source) totals."""
+    query = {"keyword": {"$type": "string"} if keywords else None}
+    if sources is not None:
+        query["source"] = {"$in": list(sources)}
+    return {"$match": query}
+
+
+def rollup_source_stats(rollup, sources=None):
+    """source_stats computed from the daily rollup."""
+    pipeline = [
+        rollup_match_stage(sources),
+        {"$group": {"_id": "$source", "count": {"$sum": "$count"},
+                    "first_date": {"$min": "$first_date"}, "last_date": {"$max": "$last_date"}}},
+        {"$sort": {"count": -1, "_id": 1}},
+        {"$project": {"_id": 0, "source": "$_id", "count": 1, "first_date": 1, "last_date": 1}},
+    ]
+    return list(rollup.aggregate(pipeline))
+
+
+def rollup_daily_counts(rollup, sources=None):
+    """daily_counts computed from the daily rollup (days in DISPLAY_TIMEZONE)."""
+    pipeline = [
+        rollup_match_stage(sources),
+        {"$group": {"_id": "$day", "count": {"$sum": "$count"}}},
+        {"$sort": {"_id": 1}},
+        {"$project": {"_id": 0, "day": "$_id", "count": 1}},
+    ]
+    return list(rollup.aggregate(pipeline))
+
+
+def rollup_keyword_counts(rollup, sources=None, limit=15):
+    """keyword_counts computed from the daily rollup."""
+    pipeline = [
+        rollup_match_stage(sources, keywords=True),
+        {"$group": {"_id": "$keyword", "count": {"$sum": "$count"}}},
+        {"$sort": {"count": -1, "_id": 1}},
+        {"$limit": limit},
+        {"$project": {"_id": 0, "keyword": "$_id", "count": 1}},
+    ]
+    return list(rollup.aggregate(pipeline))
+
+
+# --- Pencarian teks penuh (index teks title+content, lihat news_store.TEXT_INDEX) ---
+SEARCH_SNIPPET_CHARS = 240
+
+
+def search_articles(collection, text, sources=None, after=None, limit=20):
+    """One page of articles matching `text`, best textScore first (ties: newest _id first).
+
+    `text` uses MongoDB $text syntax: words are ORed, "quoted phrases" must
+    appear, -word excludes. `after` is the page token returned for the previous
+    page; returns (rows, next token or None when this is the last page).
+    """
+    query = {"$text": {"$search": text}}
+    if sources is not None:
+        query["source"] = source_condition(sources)
+    pipeline = [
+        {"$match": query},
+        {"$addFields": {"score": {"$meta": "textScore"}}},
+    ]
+    if after is not None:
+        # Keyset: lanjut tepat setelah baris terakhir halaman sebelumnya pada urutan (score, _id)
+        score, last_id = after[0], ObjectId(after[1])
+        pipeline.append({"$match": {"$or": [{"score": {"$lt": score}}, {"score": score, "_id": {"$lt": last_id}}]}})
+    pipeline += [
+        {"$sort": {"score": -1, "_id": -1}},
+        {"$limit": limit + 1},
+        # Cuplikan dipotong hanya untuk baris halaman ini, setelah $limit
+        {"$project": {"title": 1, "link": 1, "source": _SOURCE_EXPR, "date": 1, "score": 1,
+                      "snippet": {"$substrCP": [{"$ifNull": ["$content", ""]}, 0, SEARCH_SNIPPET_CHARS]}}},
+    ]
+    rows = list(collection.aggregate(pipeline))
+    next_after = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_after = (rows[-1]["score"], str(rows[-1]["_id"]))
+    return rows, next_after
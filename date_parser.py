@@ -0,0 +1,138 @@
+import re
+from datetime import datetime, timedelta, timezone
+
+# Zona waktu Indonesia (dan UTC untuk API) -> offset jam
+TZ_OFFSETS = {'WIB': 7, 'WITA': 8, 'WIT': 9, 'UTC': 0, 'GMT': 0}
+
+_MONTHS = {
+    'januari': 1, 'jan': 1, 'january': 1,
+    'februari': 2, 'feb': 2, 'pebruari': 2, 'february': 2,
+    'maret': 3, 'mar': 3, 'march': 3,
+    'april': 4, 'apr': 4,
+    'mei': 5, 'may': 5,
+    'juni': 6, 'jun': 6, 'june': 6,
+    'juli': 7, 'jul': 7, 'july': 7,
+    'agustus': 8, 'agu': 8, 'agt': 8, 'ags': 8, 'aug': 8, 'august': 8,
+    'september': 9, 'sep': 9, 'sept': 9,
+    'oktober': 10, 'okt': 10, 'oct': 10, 'october': 10,
+    'november': 11, 'nov': 11, 'nopember': 11,
+    'desember': 12, 'des': 12, 'dec': 12, 'december': 12,
+}
+_RELATIVE_UNITS = {
+    'detik': timedelta(seconds=1), 'menit': timedelta(minutes=1), 'jam': timedelta(hours=1),
+    'hari': timedelta(days=1), 'minggu': timedelta(weeks=1), 'pekan': timedelta(weeks=1),
+    'bulan': timedelta(days=30), 'tahun': timedelta(days=365),
+}
+
+_TZ_RE = re.compile(r'\b(WITA|WIB|WIT|UTC|GMT)\b', re.IGNORECASE)
+_RELATIVE_RE = re.compile(r'(\d+)\s*(detik|menit|jam|hari|minggu|pekan|bulan|tahun)\s*(?:yang\s*)?lalu', re.IGNORECASE)
+_ISO_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})(?:[T ](\d{1,2}):(\d{2})(?::(\d{2}))?(?:\.\d+)?\s*(Z|[+-]\d{2}:?\d{2})?)?', re.IGNORECASE)
+_DMY_RE = re.compile(r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})')
+_TEXT_DATE_RE = re.compile(r'(\d{1,2})\s+([A-Za-z]+)\.?\s+(\d{4})')
+_TIME_RE = re.compile(r'(\d{1,2})[:.](\d{2})(?:[:.](\d{2}))?')
+
+
+def utcnow():
+    """Current UTC time as a naive datetime, the form BSON dates come back in."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def local_to_utc(value):
+    """Converts a naive datetime in this machine's local zone (how scraped_at used to be written) to naive UTC."""
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _time_after(text, start):
+    match = _TIME_RE.search(text, start)
+    if not match:
+        return 0, 0, 0
+    return int(match.group(1)), int(match.group(2)), int(match.group(3) or 0)
+
+
+def _to_utc(year, month, day, hour, minute, second, offset_hours):
+    try:
+        local = datetime(year, month, day, hour, minute, second)
+    except ValueError:
+        return None
+    return local - timedelta(hours=offset_hours)
+
+
+def parse_date(text, default_tz='WIB', now=None):
+    """Parses a news date string into (naive UTC datetime, timezone label), or (None, None).
+
+    Understands the formats of the scraped sites and newsdata:
+    "Senin, 12 Mei 2025 10:15 WIB", "12/05/2025, 10:15 WITA", "2 jam yang lalu",
+    "kemarin", "15:00 WIB" (today), ISO strings with or without an offset.
+    Strings without a zone are read in default_tz.
+    """
+    if isinstance(text, datetime):
+        if text.tzinfo is not None:
+            return text.astimezone(timezone.utc).replace(tzinfo=None), 'UTC'
+        return text - timedelta(hours=TZ_OFFSETS[default_tz]), default_tz
+    if not text or not isinstance(text, str):
+        return None, None
+    now = now or utcnow()
+
+    tz_match = _TZ_RE.search(text)
+    tz = tz_match.group(1).upper() if tz_match else default_tz
+    offset = TZ_OFFSETS[tz]
+
+    relative = _RELATIVE_RE.search(text)
+    if relative:
+        return now - int(relative.group(1)) * _RELATIVE_UNITS[relative.group(2).lower()], tz
+    lowered = text.lower()
+    if 'baru saja' in lowered or 'just now' in lowered:
+        return now, tz
+    if 'kemarin' in lowered:
+        if not _TIME_RE.search(text):
+            return now - timedelta(days=1), tz
+        hour, minute, second = _time_after(text, 0)
+        local_day = (now + timedelta(hours=offset) - timedelta(days=1)).date()
+        return _to_utc(local_day.year, local_day.month, local_day.day, hour, minute, second, offset), tz
+
+    iso = _ISO_RE.search(text)
+    if iso:
+        year, month, day = int(iso.group(1)), int(iso.group(2)), int(iso.group(3))
+        hour, minute, second = int(iso.group(4) or 0), int(iso.group(5) or 0), int(iso.group(6) or 0)
+        zone = iso.group(7)
+        if zone:
+            if zone.upper() == 'Z':
+                offset, tz = 0, 'UTC'
+            else:
+                sign = -1 if zone[0] == '-' else 1
+                digits = zone[1:].replace(':', '')
+                offset = sign * (int(digits[:2]) + int(digits[2:]) / 60)
+                tz = f"{zone[0]}{digits[:2]}:{digits[2:]}"
+        result = _to_utc(year, month, day, hour, minute, second, offset)
+        return result, (tz if result else None)
+
+    dmy = _DMY_RE.search(text)
+    if dmy:
+        hour, minute, second = _time_after(text, dmy.end())
+        result = _to_utc(int(dmy.group(3)), int(dmy.group(2)), int(dmy.group(1)), hour, minute, second, offset)
+        return result, (tz if result else None)
+
+    for match in _TEXT_DATE_RE.finditer(text):
+        month = _MONTHS.get(match.group(2).lower())
+        if month is None:
+            continue
+        hour, minute, second = _time_after(text, match.end())
+        result = _to_utc(int(match.group(3)), month, int(match.group(1)), hour, minute, second, offset)
+        return result, (tz if result else None)
+
+    # Hanya jam ("15:00 WIB"): hari ini menurut zona situs, mundur sehari jika masih di masa depan
+    only_time = _TIME_RE.search(text)
+    if only_time and tz_match:
+        hour, minute, second = _time_after(text, 0)
+        local_day = (now + timedelta(hours=offset)).date()
+        result = _to_utc(local_day.year, local_day.month, local_day.day, hour, minute, second, offset)
+        if result and result > now + timedelta(minutes=5):
+            result -= timedelta(days=1)
+        return result, (tz if result else None)
+    return None, None
+
+
+def date_fields(text, default_tz='WIB', now=None):
+    """Returns the date fields stored with an article: date (UTC datetime or None), date_tz and date_raw."""
+    parsed, tz = parse_date(text, default_tz, now)
+    return {'date': parsed, 'date_tz': tz, 'date_raw': text if isinstance(text, str) else None}
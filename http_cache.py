@@ -0,0 +1,102 @@
+import os
+import json
+import hashlib
+import logging
+from datetime import datetime
+
+# Folder cache HTTP (ETag/Last-Modified + hash body) untuk halaman hasil pencarian
+CACHE_DIR = os.getenv('HTTP_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.http_cache'))
+
+
+def _key(url):
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+class HttpCache:
+    """On-disk conditional-GET cache keyed by URL.
+
+    For each URL it keeps the validators (ETag / Last-Modified) and a hash of
+    the body, so a later run can send If-None-Match / If-Modified-Since and
+    skip parsing when nothing changed. A new or changed page is only recorded
+    by commit() once its articles have all been processed: a page left
+    half-processed (target reached, run stopped) is fetched and parsed again.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or CACHE_DIR
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.hits = 0        # 304 Not Modified
+        self.unchanged = 0   # 200 tapi hash konten sama
+        self.misses = 0      # Konten baru/berubah
+
+    def _meta_path(self, url):
+        return os.path.join(self.cache_dir, _key(url) + '.json')
+
+    def lookup(self, url):
+        """Returns the stored metadata for url, or None."""
+        try:
+            with open(self._meta_path(url), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def conditional_headers(self, url):
+        """Returns If-None-Match / If-Modified-Since headers for url (empty if not cached)."""
+        entry = self.lookup(url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def _write_meta(self, url, entry):
+        meta_path = self._meta_path(url)
+        tmp_path = meta_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, meta_path)
+
+    def mark_not_modified(self, url):
+        """Records a 304 for url."""
+        self.hits += 1
+        entry = self.lookup(url) or {'url': url}
+        entry['checked_at'] = datetime.now().isoformat()
+        self._write_meta(url, entry)
+
+    def check(self, url, response):
+        """Checks a 200 response against the cache.
+
+        Returns None when its body hash equals the cached one (nothing new to
+        parse), else the entry to pass to commit() after the page is processed.
+        """
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        previous = self.lookup(url)
+        entry = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_hash': content_hash,
+            'checked_at': datetime.now().isoformat(),
+        }
+        if previous and previous.get('content_hash') == content_hash:
+            self.unchanged += 1
+            entry['stored_at'] = previous.get('stored_at')
+            self._write_meta(url, entry)
+            return None
+        self.misses += 1
+        entry['stored_at'] = entry['checked_at']
+        return entry
+
+    def commit(self, entry):
+        """Records the validators of a page whose articles have all been processed."""
+        try:
+            self._write_meta(entry['url'], entry)
+        except OSError as e:
+            logging.warning(f"[HTTPCache] Gagal menyimpan validator untuk {entry['url']}: {e}")
+
+    def log_stats(self):
+        logging.info(f"[HTTPCache] {self.hits} halaman 304, {self.unchanged} halaman tidak berubah (hash sama), "
+                     f"{self.misses} halaman baru/berubah")
@@ -0,0 +1,130 @@
+import os
+import logging
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import make_headers
+
+# Ukuran pool koneksi per host (naikkan jika jumlah worker scraper dinaikkan)
+POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', '4'))
+POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '8'))
+
+# Accept-Encoding berisi gzip/deflate, plus br (dan zstd) jika paket brotli terpasang
+DEFAULT_HEADERS = {
+    **make_headers(accept_encoding=True),
+    'Connection': 'keep-alive',
+}
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+# Penghitung per host: jumlah request dan jumlah koneksi TCP(/TLS) yang benar-benar dibuka
+_stats_lock = threading.Lock()
+_request_counts = {}
+_connect_counts = {}
+
+
+def _count(counter, host):
+    with _stats_lock:
+        counter[host] = counter.get(host, 0) + 1
+
+
+def _connection_key(scheme, host, port, default_port):
+    # Disamakan dengan _host_key(url): port hanya ditulis jika bukan port default
+    return f"{scheme}://{host}".lower() + (f":{port}" if port and port != default_port else "")
+
+
+class _CountingHTTPConnection(HTTPConnection):
+    def connect(self):
+        _count(_connect_counts, _connection_key('http', self.host, self.port, 80))
+        super().connect()
+
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        _count(_connect_counts, _connection_key('https', self.host, self.port, 443))
+        super().connect()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools count every socket connect, including reconnects after a server close."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CountingHTTPConnectionPool,
+            'https': _CountingHTTPSConnectionPool,
+        }
+
+
+def _host_key(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def get_session(url):
+    """Returns the shared keep-alive Session for the URL's host, creating it on first use."""
+    key = _host_key(url)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = PooledHTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update(DEFAULT_HEADERS)
+            _sessions[key] = session
+        return session
+
+
+def get(url, headers=None, timeout=30, **kwargs):
+    """requests.get replacement that reuses pooled connections to the same host."""
+    _count(_request_counts, _host_key(url))
+    return get_session(url).get(url, headers=headers, timeout=timeout, **kwargs)
+
+
+def connection_stats():
+    """Returns {host: {'requests', 'connections', 'reused'}} since the process started."""
+    with _stats_lock:
+        hosts = sorted(set(_request_counts) | set(_connect_counts))
+        return {
+            host: {
+                'requests': _request_counts.get(host, 0),
+                'connections': _connect_counts.get(host, 0),
+                'reused': max(_request_counts.get(host, 0) - _connect_counts.get(host, 0), 0),
+            }
+            for host in hosts
+        }
+
+
+def log_connection_stats():
+    """Logs per-host connection reuse, i.e. how many TCP/TLS handshakes were saved."""
+    stats = connection_stats()
+    if not stats:
+        return
+    total_requests = sum(s['requests'] for s in stats.values())
+    total_connections = sum(s['connections'] for s in stats.values())
+    for host, s in stats.items():
+        logging.info(f"[HTTP] {host}: {s['requests']} request, {s['connections']} koneksi baru, {s['reused']} pakai ulang")
+    logging.info(f"[HTTP] Total {total_requests} request lewat {total_connections} koneksi "
+                 f"({max(total_requests - total_connections, 0)} handshake TCP/TLS dihemat)")
+
+
+def close_sessions():
+    """Closes every pooled session (e.g. at the end of a run)."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
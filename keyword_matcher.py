@@ -0,0 +1,104 @@
+"""Tags articles with every search keyword they contain, in one pass over the text.
+
+An Aho-Corasick automaton over the case-folded keywords finds all keyword
+occurrences at once, so the cost depends on the text length, not on the
+number of keywords. A hit only counts when it starts and ends on a word
+boundary ("kdrt" does not match inside "kdrtnya"), and runs of whitespace in
+the text count as one space.
+"""
+from collections import deque
+
+# Daftar kata kunci pencarian (dipakai scrapper.py dan scrapper2.py)
+KEYWORDS = [
+    "kekerasan perempuan", "kdrt", "pemerkosaan", "pelecehan seksual",
+    "pelecehan", "eksploitasi perempuan", "tindak kekerasan",
+    "korban perempuan", "kasus perempuan", "perkosaan", "kekerasan seksual",
+    "perempuan jadi korban", "femicide", "perdagangan manusia", "trafficking"
+]
+
+# Naikkan jika KEYWORDS atau aturan pencocokan berubah agar backfill menandai ulang keywords_found lama
+KEYWORDS_VERSION = 1
+
+
+def _normalize(text):
+    return ' '.join(text.casefold().split())
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over a keyword list; match() returns the keywords found in list order."""
+
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(keywords))
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]  # Per state: (indeks keyword, panjang) yang berakhir di sini, termasuk lewat fail link
+        for index, keyword in enumerate(self.keywords):
+            pattern = _normalize(keyword)
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                state = next_state
+            self._output[state] += ((index, len(pattern)),)
+
+        # Fail link dihitung BFS: state di kedalaman d hanya bergantung pada state yang lebih dangkal
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def match(self, *texts):
+        """Keywords occurring as whole words in any of texts, in keyword-list order."""
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        for text in texts:
+            if not isinstance(text, str) or not text:
+                continue
+            text = _normalize(text)
+            last = len(text) - 1
+            state = 0
+            for position, char in enumerate(text):
+                while state and char not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(char, 0)
+                if not output[state]:
+                    continue
+                if position < last and text[position + 1].isalnum():
+                    continue  # Berakhir di tengah kata
+                for index, length in output[state]:
+                    start = position - length + 1
+                    if start == 0 or not text[start - 1].isalnum():
+                        found.add(index)
+        return [self.keywords[index] for index in sorted(found)]
+
+
+_DEFAULT_MATCHER = KeywordMatcher(KEYWORDS)
+
+
+def match_keywords(*texts):
+    """KEYWORDS occurring as whole words in texts (e.g. title and content), in KEYWORDS order."""
+    return _DEFAULT_MATCHER.match(*texts)
+
+
+def keyword_fields(title, content, keywords_found=()):
+    """Returns the keywords_found / keywords_version fields stored on every article.
+
+    keywords_found passed in (tags from an older version, see
+    news_store.backfill_keywords) are kept, after the matched KEYWORDS.
+    """
+    matched = match_keywords(title, content)
+    extra = [keyword for keyword in keywords_found if isinstance(keyword, str) and keyword and keyword not in matched]
+    return {"keywords_found": matched + list(dict.fromkeys(extra)), "keywords_version": KEYWORDS_VERSION}
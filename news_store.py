@@ -0,0 +1,751 @@
+import os
+import re
+import math
+import time
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from bson import json_util
+from pymongo import UpdateOne
+
+from date_parser import date_fields, utcnow, local_to_utc
+from text_tokens import TERMS_VERSION, term_fields
+from keyword_matcher import KEYWORDS_VERSION, keyword_fields
+from daily_rollup import rollup_collection, update_rollup, ensure_rollup, rebuild_rollup
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+LINK_KEY_INDEX = "link_key_unique"
+SIMHASH_INDEX = "simhash_bands"
+DATE_INDEX = "date_desc"
+SOURCE_DATE_INDEX = "source_date"
+# Pencarian dashboard; "none": tanpa stemming/stopwords (MongoDB tidak punya bahasa Indonesia)
+TEXT_INDEX = "title_content_text"
+TEXT_INDEX_WEIGHTS = {"title": 3, "content": 1}
+# Backfill saat scraper mulai mencari versi lama ($ne): dengan index hanya dokumen lama yang diperiksa
+DEDUP_VERSION_INDEX = "dedup_version"
+TERMS_VERSION_INDEX = "terms_version"
+# scraped_at dulu ditulis dalam waktu lokal mesin; dokumen baru ditandai scraped_at_tz = 'UTC'
+SCRAPED_AT_TZ_INDEX = "scraped_at_tz"
+KEYWORDS_VERSION_INDEX = "keywords_version"
+# Naikkan jika aturan normalize_link/simhash berubah agar backfill menghitung ulang data lama
+DEDUP_VERSION = 3
+# Versi backfill yang sudah selesai per koleksi ({_id: nama koleksi, <backfill>: versi}); startup hanya menjalankan yang berubah
+BACKFILL_STATE_COLLECTION = "backfill_state"
+
+# Parameter query pelacak yang tidak mengubah isi artikel.
+# 'page', 'src', 'source', 'from' sengaja tidak masuk: di beberapa situs parameter itu memilih halaman/isi artikel.
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+    'ref', 'ref_src', 'utm', 'amp', 'single', 'tag_from',
+    '_ga', '_gl', 'share', 'cx_testid', 'cx_testvariant',
+}
+TRACKING_PREFIXES = ('utm_', 'ga_', 'cx_')
+# Subdomain mobile/AMP yang menyajikan artikel yang sama dengan host utamanya
+HOST_PREFIXES = ('www.', 'm.', 'amp.', 'mobile.')
+
+# SimHash 64-bit, dipecah 8 band x 8 bit: jarak Hamming <= 7 pasti berbagi minimal satu band.
+# Cuplikan hasil pencarian pendek, jadi berita yang sama berjarak ~3-5, berita lain >= ~15.
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 8
+SIMHASH_MAX_DISTANCE = 6
+# Teks pendek (judul saja, "No description") tidak stabil: satu kata beda ("di Bekasi" vs "di Bogor")
+# sudah menggeser 6-8 bit. Di bawah SIMHASH_MIN_WORDS kata tidak pernah dianggap near-duplicate,
+# di bawah SIMHASH_SHORT_WORDS kata batasnya SIMHASH_SHORT_MAX_DISTANCE.
+SIMHASH_MIN_WORDS = 12
+SIMHASH_SHORT_WORDS = 30
+SIMHASH_SHORT_MAX_DISTANCE = 2
+# Sindikasi/near-duplicate muncul berdekatan waktunya; kandidat dari DB dibatasi jendela ini
+NEAR_DUPLICATE_WINDOW_DAYS = 14
+_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _canonical_host(host):
+    host = host.lower().rstrip('.')
+    if host.endswith(':80') or host.endswith(':443'):
+        host = host.rsplit(':', 1)[0]
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix) and host.count('.') > 1:
+            return host[len(prefix):]
+    return host
+
+
+def _canonical_path(path):
+    # Varian AMP: /amp/..., .../amp, dan /amp.html
+    segments = [seg for seg in path.split('/') if seg and seg.lower() != 'amp']
+    path = '/' + '/'.join(segments)
+    if path.lower().endswith('.amp'):
+        path = path[:-4]
+    return path
+
+
+def normalize_link(link, canonical=None):
+    """Returns the canonical dedup key for an article link.
+
+    The <link rel="canonical"> URL is used instead when it is known. The key
+    is https, with no www/m/amp host prefix, no AMP path segment, no tracking
+    parameters (utm_*, fbclid, ...), sorted remaining query and no fragment.
+    """
+    link = (canonical or link or '').strip()
+    if not link:
+        return None
+    parts = urlsplit(link)
+    if not parts.netloc:
+        return None
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    return urlunsplit(('https', _canonical_host(parts.netloc), _canonical_path(parts.path), urlencode(query), ''))
+
+
+def _to_int64(value):
+    # MongoDB hanya menyimpan int64 bertanda
+    return value - (1 << SIMHASH_BITS) if value >= 1 << (SIMHASH_BITS - 1) else value
+
+
+def _from_int64(value):
+    return value + (1 << SIMHASH_BITS) if value < 0 else value
+
+
+def _features(text):
+    return [word for word in _WORD_RE.findall((text or '').lower()) if len(word) > 2]
+
+
+def simhash(text):
+    """Returns the 64-bit SimHash (as signed int64) of text's words longer than two letters, or None."""
+    words = _features(text)
+    if not words:
+        return None
+    vector = [0] * SIMHASH_BITS
+    for feature in words:
+        h = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(SIMHASH_BITS):
+            vector[bit] += 1 if h >> bit & 1 else -1
+    value = sum(1 << bit for bit in range(SIMHASH_BITS) if vector[bit] > 0)
+    return _to_int64(value)
+
+
+def simhash_bands(fingerprint):
+    """Splits a fingerprint into SIMHASH_BANDS tagged ints for the multikey band index."""
+    value = _from_int64(fingerprint)
+    mask = (1 << _BAND_BITS) - 1
+    return [(band << _BAND_BITS) | (value >> (band * _BAND_BITS) & mask) for band in range(SIMHASH_BANDS)]
+
+
+def hamming_distance(a, b):
+    return bin(_from_int64(a) ^ _from_int64(b)).count('1')
+
+
+def _article_text(title, content):
+    content = '' if content == 'No description' else content
+    return f"{title or ''} {content or ''}"
+
+
+def article_fingerprint(title, content):
+    """SimHash over title + content; 'No description' placeholders are ignored."""
+    return simhash(_article_text(title, content))
+
+
+def article_word_count(title, content):
+    """Number of distinct SimHash features (words longer than two letters) in title + content."""
+    return len(set(_features(_article_text(title, content))))
+
+
+def near_duplicate_distance(words, max_distance=SIMHASH_MAX_DISTANCE):
+    """Largest SimHash distance still counted as near-duplicate for a text of this many words, or None."""
+    if not words or words < SIMHASH_MIN_WORDS:
+        return None
+    if words < SIMHASH_SHORT_WORDS:
+        return min(max_distance, SIMHASH_SHORT_MAX_DISTANCE)
+    return max_distance
+
+
+class NearDuplicateIndex:
+    """Flags near-duplicate articles (SimHash distance <= SIMHASH_MAX_DISTANCE) before insert.
+
+    Fingerprints seen in this run are kept in memory; stored ones scraped in the
+    last NEAR_DUPLICATE_WINDOW_DAYS are looked up through the simhash_bands
+    index with one query per batch (prefetch). The allowed distance follows the
+    shorter of the two texts (near_duplicate_distance), so title-only articles
+    are never suppressed.
+    """
+
+    def __init__(self, collection=None, max_distance=SIMHASH_MAX_DISTANCE, window_days=NEAR_DUPLICATE_WINDOW_DAYS):
+        self.collection = collection
+        self.max_distance = max_distance
+        self.window_days = window_days
+        self._by_band = {}
+
+    def add(self, fingerprint, words):
+        if fingerprint is None or near_duplicate_distance(words) is None:
+            return
+        for band in simhash_bands(fingerprint):
+            known = self._by_band.setdefault(band, {})  # fingerprint -> jumlah kata
+            known[fingerprint] = max(words, known.get(fingerprint, 0))
+
+    def prefetch(self, fingerprints):
+        """Loads stored fingerprints sharing a band with any of the given ones."""
+        bands = {band for fp in fingerprints if fp is not None for band in simhash_bands(fp)}
+        if self.collection is None or not bands:
+            return
+        query = {
+            "simhash_bands": {"$in": list(bands)},
+            "scraped_at": {"$gte": utcnow() - timedelta(days=self.window_days)},
+        }
+        for doc in self.collection.find(query, {"simhash": 1, "simhash_words": 1, "_id": 0}):
+            self.add(doc.get("simhash"), doc.get("simhash_words"))
+
+    def find_duplicate(self, fingerprint, words):
+        """Returns a known fingerprint near enough to this one (see near_duplicate_distance), or None."""
+        if fingerprint is None or near_duplicate_distance(words) is None:
+            return None
+        for band in simhash_bands(fingerprint):
+            for candidate, candidate_words in self._by_band.get(band, {}).items():
+                max_distance = near_duplicate_distance(min(words, candidate_words), self.max_distance)
+                if hamming_distance(candidate, fingerprint) <= max_distance:
+                    return candidate
+        return None
+
+
+def dedup_fields(link, title, content, canonical=None):
+    """Returns the link_key / simhash fields stored on every article."""
+    fingerprint = article_fingerprint(title, content)
+    return {
+        "link_key": normalize_link(link, canonical),
+        "simhash": fingerprint,
+        "simhash_bands": simhash_bands(fingerprint) if fingerprint is not None else [],
+        "simhash_words": article_word_count(title, content),
+        "dedup_version": DEDUP_VERSION,
+    }
+
+
+def ensure_indexes(collection):
+    """Creates the link_key (unique), simhash band, date, source/date, version and text indexes,
+    then runs the backfills that are out of date (run_backfills) and ensures the daily rollup.
+    See query_plans.py for the queries they serve.
+    """
+    collection.create_index(
+        "link_key", unique=True, name=LINK_KEY_INDEX,
+        partialFilterExpression={"link_key": {"$exists": True}}
+    )
+    collection.create_index([("simhash_bands", 1), ("scraped_at", -1)], name=SIMHASH_INDEX)
+    collection.create_index([("date", -1)], name=DATE_INDEX)
+    collection.create_index([("source", 1), ("date", -1)], name=SOURCE_DATE_INDEX)
+    collection.create_index([("dedup_version", 1)], name=DEDUP_VERSION_INDEX)
+    collection.create_index([("terms_version", 1)], name=TERMS_VERSION_INDEX)
+    collection.create_index([("scraped_at_tz", 1)], name=SCRAPED_AT_TZ_INDEX)
+    collection.create_index([("keywords_version", 1)], name=KEYWORDS_VERSION_INDEX)
+    collection.create_index([("title", "text"), ("content", "text")], name=TEXT_INDEX,
+                            weights=TEXT_INDEX_WEIGHTS, default_language="none", language_override="text_language")
+    run_backfills(collection)
+    ensure_rollup(collection)
+
+
+def run_backfills(collection):
+    """Runs every backfill in BACKFILLS whose version differs from the one recorded after its last
+    complete run, in order; returns the names of the backfills that ran.
+    """
+    state = collection.database[BACKFILL_STATE_COLLECTION]
+    done = state.find_one({"_id": collection.name}) or {}
+    ran = []
+    for name, version, backfill in BACKFILLS:
+        if done.get(name) == version:
+            continue
+        updated = backfill(collection)
+        if name == "keywords" and updated:
+            rebuild_rollup(collection) # Baris kata kunci rollup dihitung dari keywords_found yang baru
+        # Dicatat hanya setelah selesai: backfill yang gagal di tengah diulang saat startup berikutnya
+        state.update_one({"_id": collection.name}, {"$set": {name: version}}, upsert=True)
+        ran.append(name)
+    return ran
+
+
+def backfill_dedup_fields(collection):
+    """Recomputes link_key/simhash/simhash_words on documents from an older DEDUP_VERSION; returns how many were updated."""
+    updated = 0
+    query = {"dedup_version": {"$ne": DEDUP_VERSION}, "link": {"$exists": True}}
+    for doc in collection.find(query, {"link": 1, "title": 1, "content": 1}):
+        fields = dedup_fields(doc.get("link"), doc.get("title"), doc.get("content"))
+        if not fields["link_key"]:
+            continue
+        try:
+            collection.update_one({"_id": doc["_id"]}, {"$set": fields})
+            updated += 1
+        except DuplicateKeyError:
+            # Dokumen lama yang sama dengan dokumen lain setelah normalisasi: tandai tanpa link_key
+            collection.update_one({"_id": doc["_id"]}, {"$set": {"dedup_version": DEDUP_VERSION, "duplicate_of_link": fields["link_key"]},
+                                                        "$unset": {"link_key": ""}})
+            logging.warning(f"Link duplikat di data lama (setelah normalisasi): {doc.get('link')}")
+    if updated:
+        logging.info(f"link_key/simhash dihitung ulang untuk {updated} dokumen lama.")
+    return updated
+
+
+def backfill_scraped_at(collection, batch_size=500):
+    """Converts scraped_at written in the machine's local time by older scrapers to UTC; returns how many were updated.
+
+    Documents are marked with scraped_at_tz = 'UTC', so each is converted once.
+    The conversion uses this machine's zone, so run it where the scrapers ran.
+    """
+    updated = 0
+    operations = []
+    for doc in collection.find({"scraped_at_tz": {"$ne": "UTC"}, "scraped_at": {"$type": "date"}}, {"scraped_at": 1}):
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"scraped_at": local_to_utc(doc["scraped_at"]), "scraped_at_tz": "UTC"}}))
+        if len(operations) >= batch_size:
+            updated += collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        updated += collection.bulk_write(operations, ordered=False).modified_count
+    if updated:
+        logging.info(f"scraped_at {updated} dokumen lama dikonversi dari waktu lokal ke UTC.")
+    return updated
+
+
+def backfill_dates(collection, batch_size=500):
+    """Converts date strings of older documents into UTC datetimes (date, date_tz, date_raw).
+
+    Relative dates ("2 jam yang lalu") are resolved against scraped_at. Documents
+    without a source come from the newsdata API, whose pubDate is in UTC.
+    Unparseable dates become None, with the original text kept in date_raw.
+    """
+    updated = 0
+    operations = []
+    for doc in collection.find({"date": {"$type": "string"}}, {"date": 1, "source": 1, "scraped_at": 1}):
+        default_tz = 'WIB' if doc.get("source") else 'UTC'
+        fields = date_fields(doc["date"], default_tz, now=doc.get("scraped_at"))
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": fields}))
+        if len(operations) >= batch_size:
+            updated += collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        updated += collection.bulk_write(operations, ordered=False).modified_count
+    if updated:
+        logging.info(f"Tanggal {updated} dokumen lama dinormalisasi ke datetime UTC.")
+    return updated
+
+
+def backfill_term_counts(collection, batch_size=500):
+    """Stores term_counts on documents without them or from an older TERMS_VERSION; returns how many were updated."""
+    updated = 0
+    operations = []
+    for doc in collection.find({"terms_version": {"$ne": TERMS_VERSION}}, {"title": 1, "content": 1}):
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": term_fields(doc.get("title"), doc.get("content"))}))
+        if len(operations) >= batch_size:
+            updated += collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        updated += collection.bulk_write(operations, ordered=False).modified_count
+    if updated:
+        logging.info(f"term_counts dihitung untuk {updated} dokumen lama.")
+    return updated
+
+
+def backfill_keywords(collection, batch_size=500):
+    """Re-tags documents without keywords_version or from an older KEYWORDS_VERSION with every matching
+    keyword; existing keywords_found entries are kept. Returns how many were updated.
+    """
+    updated = 0
+    operations = []
+    for doc in collection.find({"keywords_version": {"$ne": KEYWORDS_VERSION}}, {"title": 1, "content": 1, "keywords_found": 1}):
+        fields = keyword_fields(doc.get("title"), doc.get("content"), doc.get("keywords_found") or [])
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": fields}))
+        if len(operations) >= batch_size:
+            updated += collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        updated += collection.bulk_write(operations, ordered=False).modified_count
+    if updated:
+        logging.info(f"keywords_found ditandai ulang untuk {updated} dokumen lama.")
+    return updated
+
+
+# (nama, versi, fungsi) dalam urutan jalan; naikkan versi (atau *_VERSION-nya) agar backfill dijalankan ulang.
+# scraped_at sebelum dates: tanggal relatif dihitung dari scraped_at UTC.
+BACKFILLS = [
+    ("dedup", DEDUP_VERSION, backfill_dedup_fields),
+    ("scraped_at", 1, backfill_scraped_at),
+    ("dates", 1, backfill_dates),
+    ("terms", TERMS_VERSION, backfill_term_counts),
+    ("keywords", KEYWORDS_VERSION, backfill_keywords),
+]
+
+
+def existing_link_keys(collection, link_keys):
+    """Returns the subset of link_keys already stored (one indexed $in query per batch)."""
+    link_keys = [key for key in set(link_keys) if key]
+    if not link_keys:
+        return set()
+    return {doc["link_key"] for doc in collection.find({"link_key": {"$in": link_keys}}, {"link_key": 1, "_id": 0})}
+
+
+def bulk_upsert(collection, news_items, rollup=None, rejected=None):
+    """Writes articles with insert-if-absent upserts on link_key (ordered=False).
+
+    Articles actually inserted are added to the daily rollup collection when
+    one is given. Returns a report dict with the counts of inserted, duplicate
+    and failed documents; failed documents are also appended to rejected when
+    a list is given.
+    """
+    report = {"inserted": 0, "duplicates": 0, "failed": 0}
+    if rejected is None:
+        rejected = []
+    operations = []
+    written = []
+    for item in news_items:
+        link_key = item.get("link_key") or normalize_link(item.get("link"))
+        if not link_key:
+            report["failed"] += 1
+            rejected.append(item)
+            continue
+        item["link_key"] = link_key
+        operations.append(UpdateOne({"link_key": link_key}, {"$setOnInsert": item}, upsert=True))
+        written.append(item)
+    if not operations:
+        return report
+
+    try:
+        result = collection.bulk_write(operations, ordered=False)
+        details = result.bulk_api_result
+    except BulkWriteError as bwe:
+        details = bwe.details
+        for error in details.get("writeErrors", []):
+            # E11000 dari dua upsert yang balapan tetap berarti "sudah ada"
+            if error.get("code") == 11000:
+                report["duplicates"] += 1
+            else:
+                report["failed"] += 1
+                rejected.append(written[error["index"]])
+                logging.warning(f"Gagal menulis dokumen: {error.get('errmsg')}")
+    report["inserted"] += details.get("nUpserted", 0)
+    report["duplicates"] += details.get("nMatched", 0)
+    if rollup is not None and details.get("upserted"):
+        try:
+            update_rollup(rollup, [written[upsert["index"]] for upsert in details["upserted"]])
+        except Exception as e:
+            # Artikel sudah tersimpan; rollup bisa diperbaiki dengan `python daily_rollup.py --rebuild`
+            logging.error(f"Gagal memperbarui rollup harian: {e}")
+    return report
+
+
+def merge_keywords(collection, keywords_by_link, rollup=None):
+    """Adds keywords to the keywords_found of stored articles with $addToSet; returns how many were updated.
+
+    keywords_by_link maps link_key -> keywords the article was found under.
+    Only articles missing some of those keywords are written, and only the
+    missing ones are added to the daily rollup when one is given.
+    """
+    link_keys = [key for key, keywords in keywords_by_link.items() if key and keywords]
+    if not link_keys:
+        return 0
+    operations = []
+    added = []
+    for doc in collection.find({"link_key": {"$in": link_keys}},
+                               {"link_key": 1, "keywords_found": 1, "date": 1, "source": 1}):
+        stored = set(doc.get("keywords_found") or [])
+        new = [keyword for keyword in dict.fromkeys(keywords_by_link[doc["link_key"]]) if keyword not in stored]
+        if not new:
+            continue
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$addToSet": {"keywords_found": {"$each": new}}}))
+        added.append({"date": doc.get("date"), "source": doc.get("source"), "keywords_found": new})
+    if not operations:
+        return 0
+    updated = collection.bulk_write(operations, ordered=False).modified_count
+    if rollup is not None:
+        try:
+            update_rollup(rollup, added, totals=False)
+        except Exception as e:
+            logging.error(f"Gagal memperbarui rollup harian: {e}")
+    return updated
+
+
+# Spool lokal: artikel ditulis ke sini sebelum masuk buffer, diputar ulang saat run berikutnya dimulai.
+# Satu file per scraper (<SPOOL_DIR>/<nama>.jsonl) agar run scrapper.py tidak mengosongkan spool scrapper2.py.
+SPOOL_DIR = os.getenv('SPOOL_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.spool'))
+# Dokumen yang ditolak MongoDB (bukan duplikat) dicadangkan ke failed_inserts_<nama>_<waktu>.json di sini
+REJECT_DIR = os.getenv('REJECT_DIR', os.path.dirname(os.path.abspath(__file__)))
+# Baris spool untuk merge keyword ({_SPOOL_MERGE: link_key, "keywords": [...]}), dibedakan dari baris artikel
+_SPOOL_MERGE = "_spool_merge"
+WRITE_BATCH_SIZE = int(os.getenv('WRITE_BATCH_SIZE', '50'))
+WRITE_FLUSH_SECONDS = float(os.getenv('WRITE_FLUSH_SECONDS', '30'))
+
+
+class BatchWriter:
+    """Streams articles to MongoDB in batches of batch_size or every flush_interval seconds.
+
+    Every article is appended to a local JSONL spool (<SPOOL_DIR>/<name>.jsonl,
+    one per scraper) before it is buffered. The spool is cleared once everything
+    in it has been written, and whatever a crashed run left behind is replayed
+    by replay_spool(). Replays are safe because bulk_upsert is idempotent on
+    link_key. Documents MongoDB rejects one by one are backed up to a
+    failed_inserts_*.json file in REJECT_DIR; if that backup fails they stay
+    in the spool.
+
+    merge_keywords() records extra keywords for an article already added or
+    stored: buffered articles are updated in place, stored ones with
+    $addToSet after the next batch is written. Every merge is also spooled as
+    its own record, and replay_spool() applies them after the articles.
+    """
+
+    def __init__(self, collection, name, batch_size=None, flush_interval=None, spool_path=None):
+        self.collection = collection
+        self.name = name
+        self.rollup = rollup_collection(collection)
+        self.batch_size = batch_size or WRITE_BATCH_SIZE
+        self.flush_interval = WRITE_FLUSH_SECONDS if flush_interval is None else flush_interval
+        self.spool_path = spool_path or os.path.join(SPOOL_DIR, f'{name}.jsonl')
+        self.reject_path = None  # Dibuat saat dokumen pertama ditolak
+        self.report = {"inserted": 0, "duplicates": 0, "failed": 0, "merged": 0}
+        self._buffer = []
+        self._buffered = {}  # link_key -> artikel di buffer
+        self._merges = {}  # link_key -> keyword tambahan untuk artikel yang sudah ditulis
+        self._rejected = []  # Semua dokumen yang ditolak di run ini (ditulis ulang utuh ke reject_path)
+        self._last_flush = time.monotonic()
+        self._spool_dirty = False  # True jika ada artikel yang belum aman (batch gagal / cadangan gagal): spool tidak dikosongkan
+        os.makedirs(os.path.dirname(self.spool_path), exist_ok=True)
+        self._spool = open(self.spool_path, 'a', encoding='utf-8')
+
+    def replay_spool(self):
+        """Writes articles and keyword merges left in the spool by an interrupted run; returns how many articles were replayed."""
+        self._spool.flush()
+        try:
+            with open(self.spool_path, 'r', encoding='utf-8') as f:
+                records = [json_util.loads(line) for line in f if line.strip()]
+        except (OSError, ValueError) as e:
+            logging.error(f"Gagal membaca spool {self.spool_path}: {e}")
+            return 0
+        items, merges = [], {}
+        for record in records:
+            if _SPOOL_MERGE in record:
+                found = merges.setdefault(record[_SPOOL_MERGE], [])
+                found.extend(keyword for keyword in record.get("keywords", []) if keyword not in found)
+            else:
+                items.append(record)
+        if not items and not merges:
+            return 0
+        logging.info(f"Memutar ulang {len(items)} artikel dan {len(merges)} merge keyword dari spool run sebelumnya...")
+        for start in range(0, len(items), self.batch_size):
+            self._write(items[start:start + self.batch_size])
+        if merges:
+            self._merge(merges) # Setelah artikelnya: merge bisa menunjuk artikel dari spool yang sama
+        self._truncate_spool_if_clean()
+        return len(items)
+
+    def _spool_write(self, record):
+        self._spool.write(json_util.dumps(record, ensure_ascii=False) + '\n')
+        self._spool.flush()
+
+    def add(self, news_item):
+        """Spools and buffers one article, flushing when the batch or time window is full."""
+        self._spool_write(news_item)
+        self._buffer.append(news_item)
+        if news_item.get("link_key"):
+            self._buffered[news_item["link_key"]] = news_item
+        self.maybe_flush()
+
+    def merge_keywords(self, link_key, keywords):
+        """Adds keywords to the keywords_found of an article added earlier or already stored."""
+        keywords = list(dict.fromkeys(keywords))
+        self._spool_write({_SPOOL_MERGE: link_key, "keywords": keywords})
+        item = self._buffered.get(link_key)
+        if item is not None:
+            found = item.setdefault("keywords_found", [])
+            found.extend(keyword for keyword in keywords if keyword not in found)
+            return
+        merges = self._merges.setdefault(link_key, [])
+        merges.extend(keyword for keyword in keywords if keyword not in merges)
+
+    def maybe_flush(self):
+        if len(self._buffer) + len(self._merges) >= self.batch_size or (
+                (self._buffer or self._merges) and time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered batch, then the keyword merges; on failure they stay in the spool for the next run."""
+        if self._buffer:
+            batch, self._buffer, self._buffered = self._buffer, [], {}
+            self._write(batch)
+        if self._merges:
+            merges, self._merges = self._merges, {}
+            self._merge(merges)
+        self._truncate_spool_if_clean()
+        self._last_flush = time.monotonic()
+
+    def _merge(self, merges):
+        try:
+            self.report["merged"] += merge_keywords(self.collection, merges, self.rollup)
+        except Exception as e:
+            self._spool_dirty = True
+            logging.error(f"❌ Gagal menggabungkan keyword untuk {len(merges)} artikel: {e}. Merge tetap di spool {self.spool_path}.")
+
+    def _write(self, batch):
+        rejected = []
+        try:
+            report = bulk_upsert(self.collection, batch, self.rollup, rejected)
+        except Exception as e:
+            self._spool_dirty = True
+            self.report["failed"] += len(batch)
+            logging.error(f"❌ Gagal menyimpan batch {len(batch)} artikel: {e}. Artikel tetap di spool {self.spool_path}.")
+            return
+        for key in report:
+            self.report[key] += report[key]
+        logging.info(f"💾 Batch {len(batch)} artikel disimpan: {report['inserted']} baru, {report['duplicates']} duplikat, {report['failed']} gagal.")
+        if report["failed"]:
+            self._reject(rejected)
+
+    def _reject(self, items):
+        """Backs up documents MongoDB rejected; the spool is kept when the backup cannot be written."""
+        self._rejected.extend(items)
+        if self.reject_path is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self.reject_path = os.path.join(REJECT_DIR, f'failed_inserts_{self.name}_{timestamp}.json')
+        try:
+            os.makedirs(os.path.dirname(self.reject_path), exist_ok=True)
+            with open(self.reject_path, 'w', encoding='utf-8') as f:
+                f.write(json_util.dumps(self._rejected, ensure_ascii=False, indent=2))
+        except (OSError, TypeError, ValueError) as e:
+            self._spool_dirty = True
+            logging.error(f"❌ Gagal mencadangkan {len(items)} dokumen yang ditolak ke {self.reject_path}: {e}. Artikel tetap di spool {self.spool_path}.")
+            return
+        logging.warning(f"⚠️ {len(items)} dokumen ditolak MongoDB, dicadangkan ke {self.reject_path}")
+
+    def _truncate_spool_if_clean(self):
+        if self._spool_dirty or self._buffer or self._merges:
+            return
+        self._spool.truncate(0)
+        self._spool.seek(0)
+
+    def close(self):
+        """Flushes what is left and closes the spool; returns the cumulative report."""
+        self.flush()
+        self._spool.close()
+        return self.report
+
+
+# Bloom filter link_key yang sudah tersimpan (dipakai untuk early stop paginasi)
+BLOOM_PATH = os.getenv('LINK_BLOOM_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.checkpoints', 'link_bloom'))
+BLOOM_ERROR_RATE = 0.001
+
+
+class LinkBloomFilter:
+    """Compact membership filter over stored link_keys.
+
+    No false negatives and a ~0.1% false-positive rate at ~1.8 bytes per
+    link. It is only used to decide when pagination can stop; whether an
+    article is new is still decided by existing_link_keys/upsert.
+
+    A written article is only added once sync() reads its link_key back from
+    the collection, so a link whose insert failed is not remembered as stored
+    (scrapper2 also adds results it would reject again, e.g. irrelevant ones).
+    Links processed in the current run go through mark_seen(): they count for
+    membership but are not saved.
+    """
+
+    def __init__(self, capacity=100_000, error_rate=BLOOM_ERROR_RATE):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0  # Perkiraan jumlah link unik: hanya naik jika add() membalik minimal satu bit
+        self.synced_id = None  # _id terbesar yang sudah dimasukkan dari DB
+        self._run_seen = set()  # link_key yang diproses di run ini (juga yang ditolak); tidak ikut save()
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, key):
+        """Sets the bits of key; returns True (and counts it) only if at least one bit was still 0."""
+        if not key:
+            return False
+        flipped = False
+        for pos in self._positions(key):
+            mask = 1 << (pos & 7)
+            if not self.bits[pos >> 3] & mask:
+                self.bits[pos >> 3] |= mask
+                flipped = True
+        if flipped:
+            self.count += 1
+        return flipped
+
+    def mark_seen(self, key):
+        """Remembers a link processed in this run (stored or not) without adding it to the saved filter."""
+        if key:
+            self._run_seen.add(key)
+
+    def __contains__(self, key):
+        if not key:
+            return False
+        return key in self._run_seen or all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def sync(self, collection):
+        """Adds link_keys of documents inserted since the last sync (by _id); returns how many were read."""
+        query = {"link_key": {"$exists": True}}
+        if self.synced_id is not None:
+            query["_id"] = {"$gt": self.synced_id}
+        added = 0
+        for doc in collection.find(query, {"link_key": 1}).sort("_id", 1).batch_size(5000):
+            self.add(doc["link_key"])
+            self.synced_id = doc["_id"]
+            added += 1
+        return added
+
+    def save(self, path=None):
+        path = path or BLOOM_PATH
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        meta = {"capacity": self.capacity, "error_rate": self.error_rate, "count": self.count,
+                "synced_id": self.synced_id}
+        with open(path + '.bin.tmp', 'wb') as f:
+            f.write(self.bits)
+        with open(path + '.json.tmp', 'w', encoding='utf-8') as f:
+            f.write(json_util.dumps(meta))
+        os.replace(path + '.bin.tmp', path + '.bin')
+        os.replace(path + '.json.tmp', path + '.json')
+
+    @classmethod
+    def load(cls, path=None):
+        path = path or BLOOM_PATH
+        with open(path + '.json', 'r', encoding='utf-8') as f:
+            meta = json_util.loads(f.read())
+        bloom = cls(meta["capacity"], meta["error_rate"])
+        with open(path + '.bin', 'rb') as f:
+            bits = f.read()
+        if len(bits) != len(bloom.bits):
+            raise ValueError("Ukuran file bloom tidak cocok dengan metadata")
+        bloom.bits = bytearray(bits)
+        bloom.count = meta["count"]
+        bloom.synced_id = meta["synced_id"]
+        return bloom
+
+
+def load_link_bloom(collection, path=None):
+    """Loads the on-disk link Bloom filter and syncs it with documents inserted since it was saved.
+
+    The filter is rebuilt from the collection when it is missing, unreadable or
+    filled past its capacity.
+    """
+    try:
+        bloom = LinkBloomFilter.load(path)
+    except FileNotFoundError:
+        bloom = None
+    except (OSError, ValueError, KeyError) as e:
+        logging.warning(f"Bloom filter link tidak bisa dibaca, dibangun ulang: {e}")
+        bloom = None
+
+    if bloom is not None:
+        added = bloom.sync(collection)
+        if bloom.count <= bloom.capacity:
+            logging.info(f"Bloom filter link dimuat ({bloom.count} link, {added} baru dari DB).")
+            return bloom
+        logging.info("Bloom filter link melebihi kapasitas, dibangun ulang.")
+
+    total = collection.estimated_document_count()
+    bloom = LinkBloomFilter(capacity=max(100_000, total * 2))
+    bloom.sync(collection)
+    logging.info(f"Bloom filter link dibangun dari DB: {bloom.count} link, {len(bloom.bits) / 1024:.0f} KB.")
+    return bloom
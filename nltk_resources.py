@@ -0,0 +1,73 @@
+"""Provisions and loads the NLTK data used by the dashboard.
+
+Run once at build/deploy time so the app never downloads at runtime:
+
+    python nltk_resources.py            # unduh ke ./nltk_data (atau NLTK_DATA_DIR)
+    python nltk_resources.py --force    # unduh ulang
+
+The dashboard only needs the stopwords corpus: tokenizing happens at ingest
+(text_tokens), so punkt is no longer used.
+"""
+import os
+import logging
+import argparse
+
+# Folder data NLTK milik proyek, di samping kode (bukan cwd, yang berbeda-beda saat deploy)
+NLTK_DATA_DIR = os.getenv('NLTK_DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), "nltk_data"))
+# Unduh saat pertama dipakai jika provisioning saat build terlewat (butuh akses jaringan)
+AUTO_DOWNLOAD = os.getenv('NLTK_AUTO_DOWNLOAD', '1') == '1'
+
+RESOURCES = {"corpora/stopwords": "stopwords"}
+
+
+def provision(download_dir=NLTK_DATA_DIR, force=False):
+    """Downloads the RESOURCES missing from download_dir; returns the names downloaded."""
+    import nltk
+    downloaded = []
+    for resource_path, resource_name in RESOURCES.items():
+        if not force:
+            try:
+                nltk.data.find(resource_path, paths=[download_dir])
+                continue
+            except LookupError:
+                pass
+        os.makedirs(download_dir, exist_ok=True)
+        if not nltk.download(resource_name, download_dir=download_dir, quiet=True, force=force):
+            raise LookupError(f"Gagal mengunduh NLTK resource '{resource_name}' ke {download_dir}")
+        logging.info(f"NLTK resource '{resource_name}' diunduh ke {download_dir}.")
+        downloaded.append(resource_name)
+    return downloaded
+
+
+def load_stopwords(language='indonesian'):
+    """Stopword set for language, read from NLTK_DATA_DIR without importing nltk when provisioned.
+
+    Falls back to nltk's own data paths, then (if NLTK_AUTO_DOWNLOAD=1) to a
+    one-time download. Raises LookupError when the list is unavailable.
+    """
+    path = os.path.join(NLTK_DATA_DIR, "corpora", "stopwords", language)
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            return frozenset(line.strip() for line in f if line.strip())
+
+    import nltk
+    if NLTK_DATA_DIR not in nltk.data.path:
+        nltk.data.path.insert(0, NLTK_DATA_DIR)
+    try:
+        return frozenset(nltk.corpus.stopwords.words(language))
+    except LookupError:
+        if not AUTO_DOWNLOAD:
+            raise
+    logging.warning(f"Stopwords NLTK belum diprovisikan, mengunduh ke {NLTK_DATA_DIR} (jalankan 'python nltk_resources.py' saat build).")
+    provision()
+    return frozenset(nltk.corpus.stopwords.words(language))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Unduh data NLTK yang dipakai dashboard.")
+    parser.add_argument("--dir", default=NLTK_DATA_DIR, help="Folder tujuan (default: NLTK_DATA_DIR)")
+    parser.add_argument("--force", action="store_true", help="Unduh ulang meskipun sudah ada")
+    args = parser.parse_args()
+    names = provision(args.dir, force=args.force)
+    print(f"✅ Data NLTK siap di {args.dir} ({', '.join(names) if names else 'sudah lengkap'}).")
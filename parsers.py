@@ -0,0 +1,375 @@
+import logging
+from urllib.parse import urljoin
+
+import lxml.html
+from lxml import etree
+from bs4 import BeautifulSoup
+
+# Backend parsing halaman hasil pencarian: 'bs4' (jalur lama) atau 'lxml' (XPath terkompilasi, cepat).
+# Tetap 'bs4' sampai benchmarks/bench_parsers.py menunjukkan hasil identik pada halaman asli
+# yang direkam dengan benchmarks/record_fixtures.py (fixture sintetis dibuat dari selektor yang sama)
+DEFAULT_BACKEND = 'bs4'
+BACKENDS = ('bs4', 'lxml')
+
+
+def _cls(name):
+    """XPath predicate matching elements whose class list contains `name` (like BeautifulSoup's class_)."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# --- Tabel selektor per situs (satu-satunya tempat selektor jalur cepat) ---
+# items    : XPath daftar elemen artikel (alternatif dicoba berurutan sampai ada hasil)
+# required : XPath relatif item yang wajib ada (opsional)
+# link     : XPath elemen <a> relatif item
+# title    : XPath kandidat judul; teks tidak kosong pertama yang dipakai
+# desc/date/image : XPath kandidat; yang pertama ketemu dipakai
+# link_policy: 'absolute' (wajib http), 'join' (urljoin dengan base_url), 'join_root' (urljoin hanya untuk '/...')
+SITE_SELECTORS = {
+    "Detik.com": {
+        "base_url": "https://www.detik.com",
+        "items": ["//article"],
+        "required": f"(.//div[{_cls('media__text')}])[1]",
+        "link": f"((.//div[{_cls('media__text')}])[1]//*[(self::h2 or self::h3) and {_cls('media__title')}])[1]//a",
+        "title": [f"((.//div[{_cls('media__text')}])[1]//*[(self::h2 or self::h3) and {_cls('media__title')}])[1]"],
+        "desc": [f"(.//div[{_cls('media__text')}])[1]//p[{_cls('media__desc')}]"],
+        "date": [f".//span[{_cls('media__date')}]"],
+        "image": [f"(.//div[{_cls('media__image')}])[1]//img", ".//img"],
+        "link_policy": "join_root",
+    },
+    "CNN Indonesia": {
+        "base_url": "https://www.cnnindonesia.com",
+        "items": ["//article"],
+        "link": ".//a",
+        "title": ["(.//a)[1]//h2", "(.//a)[1]", ".//h2"],
+        "desc": [".//p"],
+        "date": [f".//span[{_cls('text-cnn_grey')}]", f".//span[{_cls('date')}]"],
+        "image": ["(.//a)[1]//img", ".//img"],
+        "link_policy": "join",
+    },
+    "Kompas.com": {
+        "base_url": "https://www.kompas.com",
+        "items": [f"//div[{_cls('article__list')}]"],
+        "link": f"(.//h3[{_cls('article__title')}])[1]//a",
+        "title": [f"((.//h3[{_cls('article__title')}])[1]//a)[1]"],
+        "desc": [f".//p[{_cls('article__lead')}]"],
+        "date": [f".//div[{_cls('article__date')}]"],
+        "image": [f"(.//div[{_cls('article__asset')}])[1]//img"],
+        "link_policy": "absolute",
+    },
+    "Tribunnews.com": {
+        "base_url": "https://www.tribunnews.com",
+        "items": ["(//ul[@id='lists'])[1]/li", f"(//div[{_cls('lst-berita')}])[1]/li"],
+        "link": "(.//h3)[1]//a",
+        "title": ["((.//h3)[1]//a)[1]"],
+        "desc": [".//div[@class='grey sumari']", ".//p"],
+        "date": [f".//time[{_cls('grey')}]", ".//time", f".//span[{_cls('grey')}]"],
+        "image": [f"(.//div[{_cls('fr')}])[1]//img", f"(.//div[{_cls('img-ovh')}])[1]//img", ".//img"],
+        "link_policy": "absolute",
+    },
+    "Suara.com": {
+        "base_url": "https://www.suara.com",
+        "items": [f"//article[{_cls('item')}]", f"(//div[{_cls('widget-content')}])[1]//article"],
+        "link": f"(.//*[(self::h4 or self::h2) and ({_cls('item-title')} or {_cls('post-title')})])[1]//a",
+        "title": [f"((.//*[(self::h4 or self::h2) and ({_cls('item-title')} or {_cls('post-title')})])[1]//a)[1]"],
+        "desc": [f".//p[{_cls('item-desc')}]", f".//div[{_cls('post-excerpt')}]"],
+        "date": [f".//*[(self::span or self::div) and ({_cls('item-date')} or {_cls('post-date')})]"],
+        "date_split": "|",  # " | Selasa, 02 Mei 2025 | 15:00 WIB" -> bagian terakhir
+        "image": [f"(.//*[(self::figure or self::div) and ({_cls('item-img')} or {_cls('post-thumb')})])[1]//img"],
+        "link_policy": "join",
+    },
+}
+
+# Teks seperti get_text(strip=True) BeautifulSoup: tanpa isi <script>/<style>/komentar
+_TEXT_XPATH = etree.XPath(".//text()[not(parent::script or parent::style)]")
+
+
+def _compile_table(table):
+    compiled = {}
+    for source_name, spec in table.items():
+        entry = dict(spec)
+        entry["items"] = [etree.XPath(expr) for expr in spec["items"]]
+        entry["required"] = etree.XPath(spec["required"]) if spec.get("required") else None
+        entry["link"] = etree.XPath(spec["link"])
+        for field in ("title", "desc", "date", "image"):
+            entry[field] = [etree.XPath(expr) for expr in spec.get(field, [])]
+        compiled[source_name] = entry
+    return compiled
+
+
+_COMPILED = _compile_table(SITE_SELECTORS)
+
+
+def _text(element):
+    return ''.join(t.strip() for t in _TEXT_XPATH(element))
+
+
+def _first(xpaths, element):
+    for xpath in xpaths:
+        found = xpath(element)
+        if found:
+            return found[0]
+    return None
+
+
+def _resolve_link(link, base_url, policy):
+    if not link or not link.strip() or link.startswith('#'):
+        return None
+    if policy == "join":
+        link = urljoin(base_url, link)
+    elif policy == "join_root" and link.startswith('/'):
+        link = urljoin(base_url, link)
+    return link if link.startswith('http') else None
+
+
+def parse_search_results(source_name, html, max_articles=25):
+    """Parses a search result page of `source_name` with the compiled selectors.
+
+    Returns the same article dicts as the BeautifulSoup scrapers
+    (title, link, date_str, content, image, source); date_str is None when
+    the result shows no date.
+    """
+    spec = _COMPILED[source_name]
+    if not html:
+        return []
+    try:
+        tree = lxml.html.document_fromstring(html)
+    except (etree.ParserError, ValueError) as e:
+        logging.warning(f"[{source_name}] HTML tidak bisa di-parse: {e}")
+        return []
+
+    items = []
+    for xpath in spec["items"]:
+        items = xpath(tree)
+        if items:
+            break
+
+    articles_found = []
+    for item in items:
+        if len(articles_found) >= max_articles:
+            break
+        if spec["required"] is not None and not spec["required"](item):
+            continue
+        link_tags = spec["link"](item)
+        if not link_tags or link_tags[0].get('href') is None:
+            continue
+        link = _resolve_link(link_tags[0].get('href'), spec["base_url"], spec["link_policy"])
+        if not link:
+            continue
+
+        title = ''
+        for xpath in spec["title"]:
+            found = xpath(item)
+            if found:
+                title = _text(found[0])
+                if title:
+                    break
+        if not title:
+            continue
+
+        desc_tag = _first(spec["desc"], item)
+        description = _text(desc_tag) if desc_tag is not None else 'No description'
+
+        date_tag = _first(spec["date"], item)
+        if date_tag is not None:
+            pub_date_str = _text(date_tag)
+            if spec.get("date_split"):
+                parts = pub_date_str.split(spec["date_split"])
+                pub_date_str = parts[-1].strip() if len(parts) > 1 else pub_date_str
+        else:
+            pub_date_str = None  # Tanpa tanggal: date tetap None, bukan waktu scrape yang dikarang
+
+        img_tag = _first(spec["image"], item)
+        image_url = (img_tag.get('data-src') or img_tag.get('src')) if img_tag is not None else None
+
+        articles_found.append({
+            "title": title, "link": link, "date_str": pub_date_str,
+            "content": description, "image": image_url or 'No image', "source": source_name
+        })
+    return articles_found
+
+
+# --- Jalur BeautifulSoup (backend 'bs4'): satu fungsi daftar elemen + satu fungsi per elemen per situs ---
+
+def _image_url(img_tag):
+    # Cek 'src' atau 'data-src' (untuk lazy loading)
+    image_url = (img_tag.get('data-src') or img_tag.get('src')) if img_tag else None
+    return image_url or 'No image'
+
+
+def _detik_items(soup):
+    # Selektor Detik mungkin berubah. Coba cari <article> atau div.list-berita__item
+    return soup.find_all('article')
+
+
+def _detik_article(article, base_url):
+    # Cari link dan title di dalam struktur umum (misal h2/h3 di dalam div .media__text)
+    media_body = article.find('div', class_='media__text')
+    if not media_body: return None # Skip jika struktur dasar tidak ada
+    title_tag = media_body.find(['h2', 'h3'], class_='media__title')
+    link_tag = title_tag.find('a') if title_tag else None
+    if not link_tag or not link_tag.has_attr('href') or not title_tag: return None
+    link = link_tag['href']
+    title = title_tag.get_text(strip=True)
+    if not link or link.startswith('#') or not link.startswith('http'):
+        # Gabungkan jika link relatif (jarang di detik search, tapi antisipasi)
+        if not link.startswith('/'): return None
+        link = urljoin(base_url, link)
+    description_tag = media_body.find('p', class_='media__desc')
+    date_tag = article.find('span', class_='media__date')
+    image_container = article.find('div', class_='media__image')
+    img_tag = image_container.find('img') if image_container else article.find('img')
+    return {
+        "title": title, "link": link, "date_str": date_tag.get_text(strip=True) if date_tag else None,
+        "content": description_tag.get_text(strip=True) if description_tag else 'No description',
+        "image": _image_url(img_tag),
+    }
+
+
+def _cnn_items(soup):
+    return soup.find_all('article')
+
+
+def _cnn_article(article, base_url):
+    link_tag = article.find('a')
+    if not link_tag or not link_tag.has_attr('href'): return None
+    link = link_tag['href']
+    # Validasi link awal (penting untuk CNN karena banyak '#'), lalu perbaiki link relatif
+    if not link or link == '#' or link.strip() == '': return None
+    link = urljoin(base_url, link)
+    if not link.startswith('http'): return None
+    # Judul: h2 di dalam link, teks link itu sendiri, lalu h2 di luar link
+    title_tag = link_tag.find('h2')
+    title = title_tag.get_text(strip=True) if title_tag else link_tag.get_text(strip=True)
+    if not title:
+        title_tag_alt = article.find('h2')
+        title = title_tag_alt.get_text(strip=True) if title_tag_alt else ''
+    if not title: return None
+    # CNN jarang ada deskripsi di search, cari <p> saja
+    description_tag = article.find('p')
+    date_tag = article.find('span', class_='text-cnn_grey') or article.find('span', class_='date')
+    return {
+        "title": title, "link": link, "date_str": date_tag.get_text(strip=True) if date_tag else None,
+        "content": description_tag.get_text(strip=True) if description_tag else 'No description',
+        "image": _image_url(link_tag.find('img') or article.find('img')),
+    }
+
+
+def _kompas_items(soup):
+    return soup.find_all('div', class_='article__list')
+
+
+def _kompas_article(article, base_url):
+    title_tag = article.find('h3', class_='article__title')
+    link_tag = title_tag.find('a') if title_tag else None
+    if not link_tag or not link_tag.has_attr('href') or not title_tag: return None
+    link = link_tag['href']
+    # Kompas memakai link absolut
+    if not link or link.startswith('#') or not link.startswith('http'): return None
+    description_tag = article.find('p', class_='article__lead')
+    date_tag = article.find('div', class_='article__date')
+    image_container = article.find('div', class_='article__asset')
+    return {
+        "title": link_tag.get_text(strip=True), "link": link,
+        "date_str": date_tag.get_text(strip=True) if date_tag else None,
+        "content": description_tag.get_text(strip=True) if description_tag else 'No description',
+        "image": _image_url(image_container.find('img') if image_container else None),
+    }
+
+
+def _tribun_items(soup):
+    # <li> langsung di bawah ul#lists, atau div.lst-berita sebagai alternatif
+    list_container = soup.find('ul', id='lists')
+    if list_container:
+        return list_container.find_all('li', recursive=False)
+    logging.warning("[Tribunnews.com] Container utama (ul#lists) tidak ditemukan, coba div.lst-berita")
+    list_container_alt = soup.find('div', class_='lst-berita')
+    return list_container_alt.find_all('li', recursive=False) if list_container_alt else []
+
+
+def _tribun_article(article, base_url):
+    title_tag = article.find('h3')
+    link_tag = title_tag.find('a') if title_tag else None
+    if not link_tag or not link_tag.has_attr('href') or not title_tag: return None
+    link = link_tag['href']
+    # Tribun memakai link absolut di search
+    if not link or link.startswith('#') or not link.startswith('http'): return None
+    description_tag = article.find('div', class_='grey sumari') or article.find('p')
+    date_tag = article.find('time', class_='grey') or article.find('time') or article.find('span', class_='grey')
+    image_container = article.find('div', class_='fr') or article.find('div', class_='img-ovh')
+    return {
+        "title": link_tag.get_text(strip=True), "link": link,
+        "date_str": date_tag.get_text(strip=True) if date_tag else None,
+        "content": description_tag.get_text(strip=True) if description_tag else 'No description',
+        "image": _image_url(image_container.find('img') if image_container else article.find('img')),
+    }
+
+
+def _suara_items(soup):
+    list_article_elements = soup.find_all('article', class_='item')
+    if list_article_elements:
+        return list_article_elements
+    container_alt = soup.find('div', class_='widget-content')
+    return container_alt.find_all('article') if container_alt else []
+
+
+def _suara_article(article, base_url):
+    title_tag = article.find(['h4', 'h2'], class_=['item-title', 'post-title'])
+    link_tag = title_tag.find('a') if title_tag else None
+    if not link_tag or not link_tag.has_attr('href') or not title_tag: return None
+    link = urljoin(base_url, link_tag['href']) # Suara bisa memakai link relatif
+    if not link or link.startswith('#') or not link.startswith('http'): return None
+    description_tag = article.find('p', class_='item-desc') or article.find('div', class_='post-excerpt')
+    date_tag = article.find(['span', 'div'], class_=['item-date', 'post-date'])
+    pub_date_str = None
+    if date_tag:
+        # Suara sering punya format " | Selasa, 02 Mei 2025 | 15:00 WIB": ambil bagian terakhir
+        parts = date_tag.get_text(strip=True).split('|')
+        pub_date_str = parts[-1].strip() if len(parts) > 1 else parts[0]
+    image_container = article.find(['figure', 'div'], class_=['item-img', 'post-thumb'])
+    return {
+        "title": link_tag.get_text(strip=True), "link": link, "date_str": pub_date_str,
+        "content": description_tag.get_text(strip=True) if description_tag else 'No description',
+        "image": _image_url(image_container.find('img') if image_container else None),
+    }
+
+
+BS4_PARSERS = {
+    "Detik.com": (_detik_items, _detik_article),
+    "CNN Indonesia": (_cnn_items, _cnn_article),
+    "Kompas.com": (_kompas_items, _kompas_article),
+    "Tribunnews.com": (_tribun_items, _tribun_article),
+    "Suara.com": (_suara_items, _suara_article),
+}
+
+
+def parse_search_results_bs4(source_name, html, max_articles=25):
+    """Parses a search result page of `source_name` with BeautifulSoup (the original scraper code)."""
+    find_items, parse_item = BS4_PARSERS[source_name]
+    base_url = SITE_SELECTORS[source_name]["base_url"]
+    list_article_elements = find_items(BeautifulSoup(html or '', 'lxml'))
+    if not list_article_elements:
+        logging.warning(f"[{source_name}] Tidak ada elemen artikel ditemukan (cek selektor)")
+        return []
+    articles_found = []
+    for article in list_article_elements:
+        if len(articles_found) >= max_articles: break
+        try:
+            found = parse_item(article, base_url)
+        except AttributeError as ae:
+            # Elemen yang strukturnya beda dari yang diharapkan
+            logging.debug(f"[{source_name}] AttributeError saat proses elemen: {ae}", exc_info=False)
+            continue
+        except Exception as e:
+            logging.warning(f"[{source_name}] Gagal memproses satu elemen artikel: {e}", exc_info=False)
+            continue
+        if found:
+            found["source"] = source_name
+            articles_found.append(found)
+    return articles_found
+
+
+def parse_search_page(source_name, html, max_articles=25, backend=DEFAULT_BACKEND):
+    """Parses a search result page with the given backend ('bs4' or 'lxml'); both return the same article dicts."""
+    if backend == 'lxml':
+        return parse_search_results(source_name, html, max_articles)
+    return parse_search_results_bs4(source_name, html, max_articles)
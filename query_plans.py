@@ -0,0 +1,211 @@
+"""Runs explain() on every query the dashboard and scrapers send to MongoDB and flags bad plans.
+
+The queries are recorded from the real functions (dashboard_queries,
+ArticleFrameCache, news_store, daily_rollup) with sample values taken from
+the data, so the report follows the code. A query is flagged when its
+winning plan contains a COLLSCAN, or when it examines more than --max-ratio
+index keys or documents per document it needs.
+
+    python query_plans.py                 # exit 1 jika ada query yang ditandai
+    python query_plans.py --max-ratio 5
+"""
+import os
+import sys
+import argparse
+
+from pymongo.errors import OperationFailure
+
+import dashboard_queries
+from article_cache import ArticleFrameCache, CATEGORY, DATETIME, MAPPING
+from daily_rollup import rollup_collection, rebuild_rollup
+from news_store import (NearDuplicateIndex, LinkBloomFilter, existing_link_keys, backfill_dedup_fields,
+                        backfill_scraped_at, backfill_dates, backfill_term_counts, backfill_keywords)
+
+MAX_EXAMINED_RATIO = float(os.getenv('QUERY_PLAN_MAX_RATIO', '10'))
+# Seperti ARTICLE_COLUMNS di app.py (hanya menentukan proyeksi)
+_FRAME_COLUMNS = {"source": CATEGORY, "date": DATETIME, "term_counts": MAPPING}
+
+
+class _RecordedCursor:
+    def __init__(self, command):
+        self.command = command
+
+    def sort(self, key, direction=1):
+        self.command["sort"] = {key: direction}
+        return self
+
+    def limit(self, limit):
+        self.command["limit"] = limit
+        return self
+
+    def batch_size(self, size):
+        return self
+
+    def __iter__(self):
+        return iter(())
+
+
+class _RecordingDatabase:
+    """Stands in for the database: every collection is a _QueryRecorder sharing one command list."""
+
+    def __init__(self):
+        self.commands = []
+
+    def __getitem__(self, name):
+        return _QueryRecorder(name, self)
+
+
+class _QueryRecorder:
+    """Stands in for a collection: records find/aggregate commands, returns no documents, ignores writes."""
+
+    def __init__(self, name, database):
+        self.name = name
+        self.database = database
+
+    def find(self, filter=None, projection=None, **kwargs):
+        command = {"find": self.name, "filter": filter or {}}
+        if projection:
+            command["projection"] = projection
+        self.database.commands.append(command)
+        return _RecordedCursor(command)
+
+    def find_one(self, filter=None, projection=None, **kwargs):
+        self.find(filter, projection).limit(1)
+        return None
+
+    def aggregate(self, pipeline, **kwargs):
+        self.database.commands.append({"aggregate": self.name, "pipeline": pipeline, "cursor": {}})
+        return iter(())
+
+    def estimated_document_count(self):
+        return 0
+
+    def __getattr__(self, name):
+        # bulk_write, delete_many, drop, ... tidak pernah sampai ke database sungguhan
+        return lambda *args, **kwargs: None
+
+
+def _record(collection, func, *args, **kwargs):
+    database = _RecordingDatabase()
+    func(database[collection.name], *args, **kwargs)
+    return database.commands
+
+
+def access_patterns(collection):
+    """Returns (name, command) for the dashboard and scraper queries, using sample values from the data."""
+    rollup = rollup_collection(collection)
+    recent = list(collection.find({}, {"source": 1, "link_key": 1, "simhash": 1, "title": 1}).sort("_id", -1).limit(50))
+    sources = list(dict.fromkeys(doc["source"] for doc in recent if doc.get("source")))[:2] or [dashboard_queries.UNKNOWN_SOURCE]
+    link_keys = [doc["link_key"] for doc in recent if doc.get("link_key")]
+    fingerprints = [doc["simhash"] for doc in recent if doc.get("simhash") is not None][:10]
+    middle_id = recent[len(recent) // 2]["_id"] if recent else None
+    search_word = max((recent[0].get("title") or "kekerasan").split(), key=len) if recent else "kekerasan"
+
+    patterns = []
+
+    def add(name, commands):
+        patterns.extend((name if len(commands) == 1 else f"{name}[{i}]", command) for i, command in enumerate(commands))
+
+    # Dashboard
+    frame = ArticleFrameCache(_RecordingDatabase()[collection.name], dashboard_queries.ARTICLE_FRAME_QUERY, _FRAME_COLUMNS)
+    frame._load(full=True)
+    frame._high_water = middle_id
+    frame._load(full=False)
+    add("dashboard: frame full + delta", frame.collection.database.commands)
+    for func in (dashboard_queries.rollup_source_stats, dashboard_queries.rollup_daily_counts,
+                 dashboard_queries.rollup_keyword_counts):
+        add(f"dashboard: {func.__name__}", _record(rollup, func, sources))
+    for func in (dashboard_queries.source_stats, dashboard_queries.daily_counts, dashboard_queries.keyword_counts):
+        add(f"dashboard (tanpa rollup): {func.__name__}", _record(collection, func, sources))
+    add("dashboard: search_articles", _record(collection, dashboard_queries.search_articles, search_word, sources))
+
+    # Scraper
+    add("scraper: existing_link_keys", _record(collection, existing_link_keys, link_keys or ["contoh.com/tidak-ada"]))
+    add("scraper: near-duplicate prefetch", _record(collection, lambda c: NearDuplicateIndex(c).prefetch(fingerprints or [0])))
+    bloom = LinkBloomFilter(capacity=1000)
+    bloom.synced_id = middle_id
+    add("scraper: bloom sync", _record(collection, bloom.sync))
+    for func in (backfill_dedup_fields, backfill_scraped_at, backfill_dates, backfill_term_counts, backfill_keywords):
+        add(f"scraper: {func.__name__}", _record(collection, func))
+    add("scraper: rebuild_rollup", _record(collection, rebuild_rollup))
+    return patterns
+
+
+def _find_key(node, key):
+    """Yields every value stored under key anywhere in a nested explain document."""
+    if isinstance(node, dict):
+        for k, value in node.items():
+            if k == key:
+                yield value
+            else:
+                yield from _find_key(value, key)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _find_key(value, key)
+
+
+def plan_summary(explain):
+    """Stages of the winning plan(s) and the summed executionStats counters of an explain result."""
+    stages = []
+    for plan in _find_key(explain, "winningPlan"):
+        stages.extend(_find_key(plan, "stage"))
+    stats = {"nReturned": 0, "totalKeysExamined": 0, "totalDocsExamined": 0}
+    for execution in _find_key(explain, "executionStats"):
+        for counter in stats:
+            stats[counter] += execution.get(counter, 0) if isinstance(execution, dict) else 0
+    return stages, stats
+
+
+def check_plan(collection, command, explain, max_ratio=MAX_EXAMINED_RATIO):
+    """Returns (needed, stages, stats, problems) for one explained command."""
+    stages, stats = plan_summary(explain)
+    if "aggregate" in command:
+        # nReturned agregasi bisa berupa jumlah grup: bandingkan dengan dokumen yang cocok $match pertama
+        first = command["pipeline"][0] if command["pipeline"] else {}
+        needed = collection.count_documents(first.get("$match", {}))
+    else:
+        needed = stats["nReturned"]
+    problems = []
+    if "COLLSCAN" in stages:
+        problems.append("COLLSCAN")
+    for counter, label in (("totalKeysExamined", "keys"), ("totalDocsExamined", "docs")):
+        ratio = stats[counter] / max(needed, 1)
+        if ratio > max_ratio:
+            problems.append(f"{label}/dibutuhkan {ratio:.1f}")
+    return needed, stages, stats, problems
+
+
+def report(collection, max_ratio=MAX_EXAMINED_RATIO):
+    """Explains every access pattern and prints one line each; returns the number of flagged queries."""
+    flagged = 0
+    print(f"{'query':58s} {'butuh':>7s} {'keys':>8s} {'docs':>8s}  plan")
+    for name, command in access_patterns(collection):
+        target = collection.database[command.get("find") or command.get("aggregate")]
+        try:
+            explain = collection.database.command("explain", command, verbosity="executionStats")
+        except OperationFailure as e:
+            print(f"{name:58s} ❌ explain gagal: {e}")
+            flagged += 1
+            continue
+        needed, stages, stats, problems = check_plan(target, command, explain, max_ratio)
+        plan = " > ".join(dict.fromkeys(stage for stage in stages if stage in ("COLLSCAN", "IXSCAN", "IDHACK", "EOF")))
+        mark = f"⚠️  {', '.join(problems)}" if problems else "✅"
+        print(f"{name:58s} {needed:7d} {stats['totalKeysExamined']:8d} {stats['totalDocsExamined']:8d}  {plan or '-'} {mark}")
+        flagged += bool(problems)
+    return flagged
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from pymongo import MongoClient
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Laporan explain() query dashboard dan scraper pada koleksi woman_abuse.")
+    parser.add_argument("--mongo-uri", default=os.getenv('MONGO_URI'))
+    parser.add_argument("--max-ratio", type=float, default=MAX_EXAMINED_RATIO,
+                        help="Batas keys/docs yang diperiksa per dokumen yang dibutuhkan")
+    args = parser.parse_args()
+    collection = MongoClient(args.mongo_uri, serverSelectionTimeoutMS=5000)["sr"]["woman_abuse"]
+    flagged = report(collection, args.max_ratio)
+    print(f"\n{'⚠️ ' if flagged else '✅'} {flagged} query ditandai.")
+    sys.exit(1 if flagged else 0)
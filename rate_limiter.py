@@ -0,0 +1,137 @@
+import os
+import time
+import logging
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+# Laju awal, minimum, dan maksimum per domain (request per detik)
+BASE_RATE = float(os.getenv('SCRAPER_RATE', '0.2'))        # 1 request / 5 detik
+MIN_RATE = float(os.getenv('SCRAPER_MIN_RATE', '0.0167'))  # 1 request / menit saat ditekan balik
+MAX_RATE = float(os.getenv('SCRAPER_MAX_RATE', '1.0'))
+BURST = 1  # Kapasitas bucket: tanpa burst agar tetap sopan
+
+# Respons lebih cepat dari ini dianggap "domain sehat" dan lajunya dinaikkan
+FAST_RESPONSE_SECONDS = 1.5
+SLOW_RESPONSE_SECONDS = 8.0
+RATE_INCREASE_STEP = 0.05   # Additive increase
+RATE_DECREASE_FACTOR = 0.5  # Multiplicative decrease saat 429/5xx
+MAX_RETRY_AFTER_SECONDS = 600
+# Tunggu yang bisa dibatalkan (stop_event) dicek ulang paling lama tiap sekian detik
+WAIT_SLICE_SECONDS = 1.0
+
+
+def domain_of(url_or_domain):
+    """Returns the lowercase host of a URL (or the value itself if it is already a host)."""
+    host = urlsplit(url_or_domain).hostname if '://' in url_or_domain else url_or_domain
+    return (host or url_or_domain).lower()
+
+
+def parse_retry_after(value):
+    """Parses a Retry-After header (seconds or HTTP date) into seconds, or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return min(int(value), MAX_RETRY_AFTER_SECONDS)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    return min(max(delay, 0), MAX_RETRY_AFTER_SECONDS)
+
+
+class _Bucket:
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = BURST
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def refill(self, now):
+        self.tokens = min(BURST, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class DomainRateLimiter:
+    """Token bucket per domain whose rate adapts to how that domain responds.
+
+    Rates grow additively while a domain answers quickly and are halved on
+    429/5xx or network failures; a Retry-After header blocks the domain until
+    the requested time.
+    """
+
+    def __init__(self, base_rate=None, min_rate=None, max_rate=None):
+        self.base_rate = BASE_RATE if base_rate is None else base_rate
+        self.min_rate = MIN_RATE if min_rate is None else min_rate
+        self.max_rate = MAX_RATE if max_rate is None else max_rate
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def _bucket(self, domain):
+        bucket = self._buckets.get(domain)
+        if bucket is None:
+            bucket = self._buckets[domain] = _Bucket(self.base_rate)
+        return bucket
+
+    def acquire(self, url_or_domain, stop_event=None):
+        """Blocks until the domain has a free slot; returns the seconds spent waiting.
+
+        With a stop_event the wait (up to MAX_RETRY_AFTER_SECONDS after a
+        Retry-After) is done on the event in WAIT_SLICE_SECONDS slices, and
+        None is returned without taking a slot as soon as it is set.
+        """
+        domain = domain_of(url_or_domain)
+        start = time.monotonic()
+        while True:
+            if stop_event is not None and stop_event.is_set():
+                return None
+            with self._lock:
+                bucket = self._bucket(domain)
+                now = time.monotonic()
+                bucket.refill(now)
+                if now < bucket.blocked_until:
+                    wait = bucket.blocked_until - now
+                elif bucket.tokens >= 1:
+                    bucket.tokens -= 1
+                    return now - start
+                else:
+                    wait = (1 - bucket.tokens) / bucket.rate
+            if stop_event is None:
+                time.sleep(wait)
+            elif stop_event.wait(min(wait, WAIT_SLICE_SECONDS)):
+                return None
+
+    def record(self, url_or_domain, status_code, elapsed, retry_after=None):
+        """Adjusts the domain's rate from one response (status, latency, Retry-After)."""
+        domain = domain_of(url_or_domain)
+        retry_after_seconds = parse_retry_after(retry_after)
+        with self._lock:
+            bucket = self._bucket(domain)
+            old_rate = bucket.rate
+            if status_code == 429 or status_code >= 500:
+                bucket.rate = max(self.min_rate, bucket.rate * RATE_DECREASE_FACTOR)
+            elif elapsed <= FAST_RESPONSE_SECONDS:
+                bucket.rate = min(self.max_rate, bucket.rate + RATE_INCREASE_STEP)
+            elif elapsed >= SLOW_RESPONSE_SECONDS:
+                bucket.rate = max(self.min_rate, bucket.rate * 0.8)
+            if retry_after_seconds is not None and (status_code == 429 or status_code >= 500):
+                bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + retry_after_seconds)
+                bucket.tokens = 0
+            new_rate = bucket.rate
+        if new_rate < old_rate:
+            logging.warning(f"[RateLimit] {domain} merespons {status_code}; laju turun {old_rate:.3f} -> {new_rate:.3f} req/s"
+                            + (f", tunggu {retry_after_seconds:.0f} detik (Retry-After)" if retry_after_seconds else ""))
+
+    def record_failure(self, url_or_domain):
+        """Backs off a domain after a timeout or connection error."""
+        self.record(url_or_domain, 599, 0.0)
+
+    def snapshot(self):
+        """Returns {domain: current rate} for logging."""
+        with self._lock:
+            return {domain: round(bucket.rate, 3) for domain, bucket in self._buckets.items()}
@@ -1,9 +1,13 @@
 import os
 import requests
 from pymongo import MongoClient
-from datetime import datetime
 import logging
 from dotenv import load_dotenv
+import http_client
+from date_parser import date_fields, utcnow
+from text_tokens import term_fields
+from keyword_matcher import keyword_fields
+from news_store import ensure_indexes, dedup_fields, existing_link_keys, NearDuplicateIndex, BatchWriter
 
 # Load environment variables
 load_dotenv()
@@ -29,6 +33,11 @@ try:
 except Exception as e:
     logging.error(f"❌ Gagal terhubung ke MongoDB: {e}")
     raise
+try:
+    # Unique index pada link ternormalisasi + backfill data lama yang versinya berubah
+    ensure_indexes(collection)
+except Exception as e:
+    logging.error(f"Gagal menyiapkan index/backfill: {e}. Dedup hanya mengandalkan upsert.")
 
 def scrape_news():
     try:
@@ -41,7 +50,7 @@ def scrape_news():
             )
         }
 
-        response = requests.get(url, headers=headers, timeout=30)
+        response = http_client.get(url, headers=headers, timeout=30)
         logging.info(f"Status respons: {response.status_code}")
         response.raise_for_status()
 
@@ -54,16 +63,19 @@ def scrape_news():
         articles = data.get('results', [])
         logging.info(f"✅ Ditemukan {len(articles)} artikel dari API")
 
-        news_data = []
-        keywords = [
-            "kekerasan perempuan", "kdrt", "pemerkosaan", "pelecehan seksual",
-            "pelecehan", "eksploitasi perempuan", "tindak kekerasan",
-            "korban perempuan", "kasus perempuan", "perkosaan",
-            "kekerasan seksual", "perempuan jadi korban", "femicide",
-            "perdagangan manusia", "trafficking"
-        ]
+        writer = BatchWriter(collection, 'scrapper')
+        writer.replay_spool()  # Artikel yang tertinggal dari run sebelumnya
+        new_count = 0
+
+        articles = articles[:100]  # Batasi 100 artikel
+        # Satu query $in ber-index untuk seluruh batch, bukan find_one per artikel
+        for article in articles:
+            article['_dedup'] = dedup_fields(article.get('link'), article.get('title'), article.get('description'))
+        stored_links = existing_link_keys(collection, [a['_dedup']['link_key'] for a in articles])
+        near_duplicates = NearDuplicateIndex(collection)
+        near_duplicates.prefetch([a['_dedup']['simhash'] for a in articles])
 
-        for article in articles[:100]:  # Batasi 100 artikel
+        for article in articles:
             try:
                 title = article.get('title', '')
                 description = article.get('description', '')
@@ -75,34 +87,42 @@ def scrape_news():
                 if not link:
                     logging.info(f"Artikel tanpa link, dilewati: {title}")
                     continue
-                if collection.find_one({"link": link}):
+                dedup = article['_dedup']
+                if dedup['link_key'] in stored_links:
                     logging.info(f"Duplikat, sudah ada di DB: {title}")
                     continue
-
-                # Periksa kata kunci di judul dan deskripsi
-                content_to_check = (title.lower() + " " + (description.lower() if description else ""))
-                matching_keywords = [keyword for keyword in keywords if keyword in content_to_check]
+                if near_duplicates.find_duplicate(dedup['simhash'], dedup['simhash_words']) is not None:
+                    logging.info(f"Near-duplicate (SimHash), dilewati: {title}")
+                    continue
 
                 news_item = {
                     "title": title,
                     "link": link,
-                    "date": article.get('pubDate', datetime.now().strftime('%Y-%m-%d')),
+                    **dedup,
+                    # pubDate newsdata dalam UTC; disimpan sebagai datetime (date_tz, date_raw menyertai), None jika kosong
+                    **date_fields(article.get('pubDate'), default_tz='UTC'),
                     "content": description or 'No description',
+                    **term_fields(title, description),
                     "image": article.get('image_url', 'No image'),
-                    "scraped_at": datetime.now(),
-                    "keywords_found": matching_keywords
+                    "scraped_at": utcnow(), # UTC naif, sama dengan date
+                    "scraped_at_tz": "UTC",
+                    # Semua KEYWORDS yang muncul utuh di judul/deskripsi (satu lintasan Aho-Corasick)
+                    **keyword_fields(title, description)
                 }
 
-                news_data.append(news_item)
+                writer.add(news_item)
+                new_count += 1
+                stored_links.add(dedup['link_key'])
+                near_duplicates.add(dedup['simhash'], dedup['simhash_words'])
                 logging.info(f"✅ Artikel baru ditambahkan: {title}")
 
             except Exception as e:
                 logging.error(f"❌ Gagal memproses artikel '{title}': {e}")
                 continue
 
-        if news_data:
-            collection.insert_many(news_data)
-            logging.info(f"✅ Menyimpan {len(news_data)} artikel baru ke MongoDB")
+        report = writer.close()
+        if new_count or any(report.values()):
+            logging.info(f"✅ Laporan simpan: {report['inserted']} baru, {report['duplicates']} duplikat, {report['failed']} gagal")
         else:
             logging.info("📭 Tidak ada artikel baru untuk disimpan")
 
@@ -112,6 +132,8 @@ def scrape_news():
         logging.error(f"❌ Gagal mengakses API: {e}")
     except Exception as e:
         logging.error(f"❌ Error saat scraping: {e}")
+    finally:
+        http_client.log_connection_stats()
 
 if __name__ == "__main__":
     scrape_news()
\ No newline at end of file
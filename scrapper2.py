@@ -1,12 +1,25 @@
 import os
 import requests
-from bs4 import BeautifulSoup
 from pymongo import MongoClient
-from datetime import datetime
+from datetime import timedelta
 import logging
 from dotenv import load_dotenv
 import time
-from urllib.parse import quote_plus, urljoin # urljoin sudah ada
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
+from urllib.parse import quote_plus
+import http_client
+from http_cache import HttpCache
+from parsers import DEFAULT_BACKEND, BACKENDS, parse_search_page
+from rate_limiter import DomainRateLimiter
+from checkpoint import RunCheckpoint
+from date_parser import date_fields, utcnow
+from text_tokens import term_fields
+from keyword_matcher import KEYWORDS, keyword_fields, match_keywords
+from news_store import (ensure_indexes, normalize_link, dedup_fields, existing_link_keys, NearDuplicateIndex,
+                        BatchWriter, load_link_bloom)
 
 # Load environment variables
 load_dotenv()
@@ -17,28 +30,34 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
-# MongoDB connection
-try:
-    # Pastikan MONGO_URI di file .env sudah benar
-    MONGO_URI = os.getenv('MONGO_URI')
-    client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000)
-    # Test the connection
-    client.server_info()
-    db = client["sr"] # Ganti jika nama DB beda
-    collection = db["woman_abuse"] # Ganti jika nama collection beda
-    logging.info("✅ Berhasil terhubung ke MongoDB")
-except Exception as e:
-    logging.error(f"❌ Gagal terhubung ke MongoDB: {e}")
-    # Mungkin ingin keluar dari skrip jika DB tidak bisa diakses
-    raise SystemExit(f"Koneksi DB Gagal: {e}")
-
-# Daftar kata kunci
-KEYWORDS = [
-    "kekerasan perempuan", "kdrt", "pemerkosaan", "pelecehan seksual",
-    "pelecehan", "eksploitasi perempuan", "tindak kekerasan",
-    "korban perempuan", "kasus perempuan", "perkosaan", "kekerasan seksual",
-    "perempuan jadi korban", "femicide", "perdagangan manusia", "trafficking"
-]
+# MongoDB connection (dibuat saat pertama kali dibutuhkan agar modul bisa diimpor tanpa DB)
+_collection = None
+
+def get_collection():
+    """Returns the woman_abuse collection, connecting to MongoDB on first use."""
+    global _collection
+    if _collection is not None:
+        return _collection
+    try:
+        # Pastikan MONGO_URI di file .env sudah benar
+        MONGO_URI = os.getenv('MONGO_URI')
+        client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000)
+        # Test the connection
+        client.server_info()
+        db = client["sr"] # Ganti jika nama DB beda
+        collection = db["woman_abuse"] # Ganti jika nama collection beda
+        logging.info("✅ Berhasil terhubung ke MongoDB")
+    except Exception as e:
+        logging.error(f"❌ Gagal terhubung ke MongoDB: {e}")
+        # Mungkin ingin keluar dari skrip jika DB tidak bisa diakses
+        raise SystemExit(f"Koneksi DB Gagal: {e}")
+    try:
+        # Unique index pada link ternormalisasi (dedup oleh server) + backfill data lama yang versinya berubah
+        ensure_indexes(collection)
+    except Exception as e:
+        logging.error(f"Gagal menyiapkan index/backfill: {e}. Dedup hanya mengandalkan upsert.")
+    _collection = collection
+    return _collection
 
 # Header User-Agent (Gunakan User-Agent yang umum)
 HEADERS = {
@@ -48,588 +67,527 @@ HEADERS = {
     )
 }
 
-# --- Fungsi Scraper Detik.com (PERLU VERIFIKASI SELEKTOR) ---
-def scrape_detik(keyword, max_articles_per_keyword=25): # Naikkan sedikit batas per keyword
-    """Scrapes Detik.com search results for a given keyword."""
-    base_url = "https://www.detik.com"
-    # Format URL pencarian Detik bisa berubah, ini salah satu format umum
-    search_url = f"{base_url}/search/searchall?query={quote_plus(keyword)}&sortby=time&page=1"
-    articles_found = []
-    logging.info(f"[Detik] Mencari: {keyword} di {search_url}")
-    try:
-        response = requests.get(search_url, headers=HEADERS, timeout=45)
-        response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
-        soup = BeautifulSoup(response.text, 'lxml')
+# Limiter per domain: setiap scraper mengambil slot dari sini, bukan time.sleep tetap
+RATE_LIMITER = DomainRateLimiter()
+# stop_event dari main_scrape yang sedang berjalan: tunggu di RATE_LIMITER berhenti saat target tercapai
+STOP_EVENT = None
 
-        # Selektor Detik mungkin berubah. Coba cari <article> atau div.list-berita__item
-        # Lebih baik spesifik jika memungkinkan, misal: soup.select('div.list-berita article')
-        list_article_elements = soup.find_all('article')
 
-        if not list_article_elements:
-            logging.warning(f"[Detik] Tidak ada elemen artikel ditemukan (cek selektor <article>) untuk: {keyword}")
-            return []
+class ScrapeStopped(Exception):
+    """The run was stopped while a request was waiting for its rate-limit slot."""
 
-        logging.info(f"[Detik] Ditemukan {len(list_article_elements)} potensi elemen artikel untuk: {keyword}")
-        count = 0
-        for article in list_article_elements:
-            if count >= max_articles_per_keyword: break
-            try:
-                # Cari link dan title di dalam struktur umum (misal h2/h3 di dalam div .media__text)
-                media_body = article.find('div', class_='media__text')
-                if not media_body: continue # Skip jika struktur dasar tidak ada
-
-                title_tag = media_body.find(['h2', 'h3'], class_='media__title')
-                link_tag = title_tag.find('a') if title_tag else None
-
-                if not link_tag or not link_tag.has_attr('href') or not title_tag: continue # Skip jika link/title tidak ada
-
-                link = link_tag['href']
-                title = title_tag.get_text(strip=True)
-
-                # Validasi Link Awal
-                if not link or link.startswith('#') or not link.startswith('http'):
-                    # Coba gabungkan jika link relatif (jarang di detik search, tapi antisipasi)
-                    if link.startswith('/'):
-                       link = urljoin(base_url, link)
-                    else:
-                       continue # Skip jika format tidak dikenal
-
-                # Deskripsi
-                description_tag = media_body.find('p', class_='media__desc')
-                description = description_tag.get_text(strip=True) if description_tag else 'No description'
-
-                # Tanggal
-                date_tag = article.find('span', class_='media__date') # Cari di luar media_body jika perlu
-                pub_date_str = date_tag.get_text(strip=True) if date_tag else datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-                # Gambar
-                image_container = article.find('div', class_='media__image')
-                img_tag = image_container.find('img') if image_container else article.find('img')
-                # Cek 'src' atau 'data-src' (untuk lazy loading)
-                image_url = None
-                if img_tag:
-                    image_url = img_tag.get('data-src') or img_tag.get('src')
-                if not image_url: image_url = 'No image'
-
-
-                articles_found.append({
-                    "title": title, "link": link, "date_str": pub_date_str,
-                    "content": description, "image": image_url, "source": "Detik.com"
-                })
-                count += 1
-            except AttributeError as ae:
-                # Log error ini jika terjadi, mungkin ada elemen <article> yang strukturnya beda
-                logging.debug(f"[Detik] AttributeError saat proses elemen: {ae}", exc_info=False)
-                continue # Lanjut ke elemen berikutnya
-            except Exception as e:
-                logging.warning(f"[Detik] Gagal memproses satu elemen artikel: {e}", exc_info=False)
-                continue # Lanjut ke elemen berikutnya
+# Backend parsing: 'bs4' (BeautifulSoup, default) atau 'lxml' (selektor XPath terkompilasi), lihat parsers.py
+PARSER_BACKEND = os.getenv('SCRAPER_PARSER', DEFAULT_BACKEND)
 
-        logging.info(f"[Detik] Berhasil mengekstrak {len(articles_found)} artikel dari {count} elemen yang diproses untuk: {keyword}")
-        return articles_found
-    # Error Handling
-    except requests.Timeout:
-        logging.error(f"[Detik] Timeout saat mengakses: {search_url}")
-        return []
-    except requests.RequestException as e:
-        logging.error(f"[Detik] Gagal mengakses: {search_url} - {e}")
-        return []
-    except Exception as e:
-        logging.error(f"[Detik] Error tidak terduga saat scraping {keyword}: {e}", exc_info=True)
-        return []
+# Cache conditional-GET untuk halaman pencarian (matikan dengan HTTP_CACHE=0 atau --no-cache)
+HTTP_CACHE = HttpCache() if os.getenv('HTTP_CACHE', '1') != '0' else None
 
+class SearchResults(list):
+    """Articles of one search page, plus the HTTP cache entry to commit once they have all been processed.
 
-# --- Fungsi Scraper CNN Indonesia (PERLU VERIFIKASI SELEKTOR) ---
-def scrape_cnn(keyword, max_articles_per_keyword=25):
-    """Scrapes CNNIndonesia.com search results for a given keyword."""
-    base_url = "https://www.cnnindonesia.com"
-    search_url = f"{base_url}/search/?query={quote_plus(keyword)}"
-    articles_found = []
-    logging.info(f"[CNN] Mencari: {keyword} di {search_url}")
-    try:
-        response = requests.get(search_url, headers=HEADERS, timeout=45)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'lxml')
+    On the last page of a walk, iter_pages sets walk_end to the reason pagination stopped.
+    """
 
-        # Selektor CNN bisa berubah, coba <article>
-        list_article_elements = soup.find_all('article')
+    def __init__(self, articles=(), cache_entry=None):
+        super().__init__(articles)
+        self.cache_entry = cache_entry
+        self.walk_end = None
 
-        if not list_article_elements:
-            logging.warning(f"[CNN] Tidak ada elemen artikel ditemukan (cek selektor <article>) untuk: {keyword}")
-            return []
 
-        logging.info(f"[CNN] Ditemukan {len(list_article_elements)} potensi elemen artikel untuk: {keyword}")
-        count = 0
-        for article in list_article_elements:
-            if count >= max_articles_per_keyword: break
-            try:
-                link_tag = article.find('a')
-                if not link_tag or not link_tag.has_attr('href'): continue
-
-                link = link_tag['href']
-                # Validasi Link Awal (Sangat Penting untuk CNN karena banyak '#')
-                if not link or link == '#' or link.strip() == '': continue
-
-                # Perbaiki link relatif (penting!)
-                link = urljoin(base_url, link)
-                if not link.startswith('http'): continue # Lewati jika format masih aneh
-
-                # Judul (Coba cari h2 di dalam link, atau teks link itu sendiri)
-                title_tag = link_tag.find('h2') # Asumsi judul ada di h2 dalam link
-                title = title_tag.get_text(strip=True) if title_tag else link_tag.get_text(strip=True) # Fallback ke teks link
-                if not title: # Jika judul masih kosong, coba cari h2 di luar link tapi dalam article
-                     title_tag_alt = article.find('h2')
-                     title = title_tag_alt.get_text(strip=True) if title_tag_alt else 'No Title Found'
-
-                # Deskripsi (CNN jarang ada deskripsi di search, cari <p> saja)
-                description_tag = article.find('p')
-                description = description_tag.get_text(strip=True) if description_tag else 'No description'
-
-                # Tanggal (Cari span dengan class 'text-cnn_grey' atau 'date')
-                date_tag = article.find('span', class_='text-cnn_grey') or article.find('span', class_='date')
-                pub_date_str = date_tag.get_text(strip=True) if date_tag else datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-                # Gambar (Cari img di dalam link atau article)
-                img_tag = link_tag.find('img') or article.find('img')
-                image_url = None
-                if img_tag:
-                    image_url = img_tag.get('data-src') or img_tag.get('src')
-                if not image_url: image_url = 'No image'
-
-                # Hanya tambahkan jika judul dan link valid
-                if title != 'No Title Found' and link:
-                    articles_found.append({
-                        "title": title, "link": link, "date_str": pub_date_str,
-                        "content": description, "image": image_url, "source": "CNN Indonesia"
-                    })
-                    count += 1
-            except AttributeError as ae:
-                logging.debug(f"[CNN] AttributeError saat proses elemen: {ae}", exc_info=False)
-                continue
-            except Exception as e:
-                logging.warning(f"[CNN] Gagal memproses satu elemen artikel: {e}", exc_info=False)
-                continue
+def commit_page(results):
+    """Records a fully processed page in HTTP_CACHE so the next run can skip it while it is unchanged."""
+    entry = getattr(results, 'cache_entry', None)
+    if HTTP_CACHE is not None and entry is not None:
+        HTTP_CACHE.commit(entry)
 
-        logging.info(f"[CNN] Berhasil mengekstrak {len(articles_found)} artikel dari {count} elemen yang diproses untuk: {keyword}")
-        return articles_found
-    # Error Handling
-    except requests.Timeout:
-        logging.error(f"[CNN] Timeout saat mengakses: {search_url}")
-        return []
-    except requests.RequestException as e:
-        logging.error(f"[CNN] Gagal mengakses: {search_url} - {e}")
-        return []
-    except Exception as e:
-        logging.error(f"[CNN] Error tidak terduga saat scraping {keyword}: {e}", exc_info=True)
-        return []
-
-# --- Fungsi Scraper Kompas.com (BARU - PERLU VERIFIKASI SELEKTOR) ---
-def scrape_kompas(keyword, max_articles_per_keyword=25):
-    """Scrapes Kompas.com search results for a given keyword."""
-    base_url = "https://www.kompas.com"
-    # Kompas mungkin menggunakan sub-domain atau path /search/
-    search_url = f"https://search.kompas.com/search/?q={quote_plus(keyword)}&sort=desc" # Sort by newest
-    articles_found = []
-    logging.info(f"[Kompas] Mencari: {keyword} di {search_url}")
-    try:
-        response = requests.get(search_url, headers=HEADERS, timeout=45)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'lxml')
 
-        # Selektor Kompas: Coba cari div.article__list (umumnya dipakai)
-        list_article_elements = soup.find_all('div', class_='article__list')
+def fetch_page(url, timeout=45):
+    """GETs a page over the pooled session after taking a slot from the domain's rate limiter.
 
-        if not list_article_elements:
-            # Coba alternatif jika struktur berubah, misal: soup.select('.latest--topic article')
-            logging.warning(f"[Kompas] Tidak ada elemen artikel ditemukan (cek selektor div.article__list) untuk: {keyword}")
+    Returns None when the page has not changed since the last run (304 Not
+    Modified or an identical body hash), so the caller can skip parsing. A new
+    page carries its pending cache entry in response.cache_entry. Raises
+    ScrapeStopped when STOP_EVENT is set while waiting for the rate limiter.
+    """
+    headers = dict(HEADERS)
+    if HTTP_CACHE is not None:
+        headers.update(HTTP_CACHE.conditional_headers(url))
+    if RATE_LIMITER.acquire(url, STOP_EVENT) is None:
+        raise ScrapeStopped(url)
+    start = time.monotonic()
+    try:
+        response = http_client.get(url, headers=headers, timeout=timeout)
+    except requests.RequestException:
+        RATE_LIMITER.record_failure(url)
+        raise
+    RATE_LIMITER.record(url, response.status_code, time.monotonic() - start, response.headers.get('Retry-After'))
+    if HTTP_CACHE is not None:
+        if response.status_code == 304:
+            HTTP_CACHE.mark_not_modified(url)
+            return None
+        if response.status_code == 200:
+            response.cache_entry = HTTP_CACHE.check(url, response)
+            if response.cache_entry is None:
+                return None
+    return response
+
+def scrape_search_page(source_name, keyword, search_url, max_articles, timeout=45):
+    """Fetches one search result page and parses it with parsers.parse_search_page (PARSER_BACKEND).
+
+    Returns the article list as SearchResults (empty when the page is
+    unchanged since the last run), or None when the request failed.
+    """
+    logging.info(f"[{source_name}] Mencari: {keyword} di {search_url}")
+    try:
+        response = fetch_page(search_url, timeout=timeout)
+        if response is None:
+            logging.info(f"[{source_name}] Hasil pencarian tidak berubah sejak run terakhir, parsing dilewati: {keyword}")
             return []
-
-        logging.info(f"[Kompas] Ditemukan {len(list_article_elements)} potensi elemen artikel untuk: {keyword}")
-        count = 0
-        for article in list_article_elements:
-            if count >= max_articles_per_keyword: break
-            try:
-                # Cari link dan title: h3.article__title a
-                title_tag = article.find('h3', class_='article__title')
-                link_tag = title_tag.find('a') if title_tag else None
-
-                if not link_tag or not link_tag.has_attr('href') or not title_tag: continue
-
-                link = link_tag['href']
-                title = link_tag.get_text(strip=True) # Judul biasanya ada di dalam link
-
-                # Validasi dan pastikan link absolut (Kompas sering pakai link absolut)
-                if not link or link.startswith('#') or not link.startswith('http'): continue
-
-                # Deskripsi: Mungkin tidak ada, coba p.article__lead (jika ada)
-                description_tag = article.find('p', class_='article__lead')
-                description = description_tag.get_text(strip=True) if description_tag else 'No description'
-
-                # Tanggal: div.article__date
-                date_tag = article.find('div', class_='article__date')
-                pub_date_str = date_tag.get_text(strip=True) if date_tag else datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-                # Gambar: div.article__asset img
-                image_container = article.find('div', class_='article__asset')
-                img_tag = image_container.find('img') if image_container else None
-                image_url = None
-                if img_tag:
-                    image_url = img_tag.get('data-src') or img_tag.get('src') # Prioritaskan data-src
-                if not image_url: image_url = 'No image'
-
-                articles_found.append({
-                    "title": title, "link": link, "date_str": pub_date_str,
-                    "content": description, "image": image_url, "source": "Kompas.com"
-                })
-                count += 1
-            except AttributeError as ae:
-                logging.debug(f"[Kompas] AttributeError saat proses elemen: {ae}", exc_info=False)
-                continue
-            except Exception as e:
-                logging.warning(f"[Kompas] Gagal memproses satu elemen artikel: {e}", exc_info=False)
-                continue
-
-        logging.info(f"[Kompas] Berhasil mengekstrak {len(articles_found)} artikel dari {count} elemen yang diproses untuk: {keyword}")
-        return articles_found
+        response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
+        articles_found = parse_search_page(source_name, response.text, max_articles, PARSER_BACKEND)
+        logging.info(f"[{source_name}] Berhasil mengekstrak {len(articles_found)} artikel ({PARSER_BACKEND}) untuk: {keyword}")
+        # Validator cache baru disimpan lewat commit_page setelah semua artikelnya diproses
+        return SearchResults(articles_found, getattr(response, 'cache_entry', None))
     # Error Handling
+    except ScrapeStopped:
+        logging.debug(f"[{source_name}] Run dihentikan, request dibatalkan: {search_url}")
+        return None
     except requests.Timeout:
-        logging.error(f"[Kompas] Timeout saat mengakses: {search_url}")
-        return []
+        logging.error(f"[{source_name}] Timeout saat mengakses: {search_url}")
+        return None
     except requests.RequestException as e:
-        logging.error(f"[Kompas] Gagal mengakses: {search_url} - {e}")
-        return []
+        logging.error(f"[{source_name}] Gagal mengakses: {search_url} - {e}")
+        return None
     except Exception as e:
-        logging.error(f"[Kompas] Error tidak terduga saat scraping {keyword}: {e}", exc_info=True)
-        return []
-
-# --- Fungsi Scraper Tribunnews.com (BARU - PERLU VERIFIKASI SELEKTOR) ---
-def scrape_tribun(keyword, max_articles_per_keyword=25):
-    """Scrapes Tribunnews.com search results for a given keyword."""
-    base_url = "https://www.tribunnews.com"
-    # Format URL pencarian Tribun
-    search_url = f"{base_url}/search?q={quote_plus(keyword)}"
-    articles_found = []
-    logging.info(f"[Tribun] Mencari: {keyword} di {search_url}")
-    try:
-        # Tribun kadang butuh timeout lebih lama
-        response = requests.get(search_url, headers=HEADERS, timeout=60)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'lxml')
-
-        # Selektor Tribun: Coba cari elemen list <li> di dalam <ul id='lists'>
-        list_container = soup.find('ul', id='lists')
-        if not list_container:
-             logging.warning(f"[Tribun] Container utama (ul#lists) tidak ditemukan untuk: {keyword}. Coba cari div.lst-berita")
-             # Alternatif: coba cari div.lst-berita li (struktur lain yang mungkin)
-             list_container_alt = soup.find('div', class_='lst-berita')
-             if list_container_alt:
-                 list_article_elements = list_container_alt.find_all('li', recursive=False)
-             else:
-                 logging.warning("[Tribun] Alternatif container (div.lst-berita) juga tidak ditemukan.")
-                 return []
-        else:
-            list_article_elements = list_container.find_all('li', recursive=False) # Ambil li langsung di bawah ul
-
-        if not list_article_elements:
-            logging.warning(f"[Tribun] Tidak ada elemen artikel (li) ditemukan di dalam container yang teridentifikasi untuk: {keyword}")
-            return []
+        logging.error(f"[{source_name}] Error tidak terduga saat scraping {keyword}: {e}", exc_info=True)
+        return None
 
-        logging.info(f"[Tribun] Ditemukan {len(list_article_elements)} potensi elemen artikel untuk: {keyword}")
-        count = 0
-        for article in list_article_elements:
-            if count >= max_articles_per_keyword: break
-            try:
-                # Link dan Title: Coba cari di h3 a
-                title_tag = article.find('h3')
-                link_tag = title_tag.find('a') if title_tag else None
-
-                if not link_tag or not link_tag.has_attr('href') or not title_tag: continue
-
-                link = link_tag['href']
-                title = link_tag.get_text(strip=True) # Ambil teks dari link
-
-                # Validasi dan pastikan link absolut (Tribun sering pakai link absolut di search)
-                if not link or link.startswith('#') or not link.startswith('http'): continue
-
-                # Deskripsi: Coba div.grey.sumari atau p
-                description_tag = article.find('div', class_='grey sumari') or article.find('p')
-                description = description_tag.get_text(strip=True) if description_tag else 'No description'
-
-                # Tanggal: Cari tag <time> (mungkin punya class 'grey') atau span.grey
-                date_tag = article.find('time', class_='grey') or article.find('time') or article.find('span', class_='grey')
-                pub_date_str = date_tag.get_text(strip=True) if date_tag else datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-                # Gambar: Cari img, mungkin di dalam div.fr.mt5 atau langsung
-                # Tribun sering pakai class 'fr' atau 'img-ovh'
-                image_container = article.find('div', class_='fr') or article.find('div', class_='img-ovh')
-                img_tag = image_container.find('img') if image_container else article.find('img')
-                image_url = None
-                if img_tag:
-                    image_url = img_tag.get('data-src') or img_tag.get('src')
-                if not image_url: image_url = 'No image'
-
-
-                articles_found.append({
-                    "title": title, "link": link, "date_str": pub_date_str,
-                    "content": description, "image": image_url, "source": "Tribunnews.com"
-                })
-                count += 1
-            except AttributeError as ae:
-                logging.debug(f"[Tribun] AttributeError saat proses elemen: {ae}", exc_info=False)
-                continue
-            except Exception as e:
-                logging.warning(f"[Tribun] Gagal memproses satu elemen artikel: {e}", exc_info=False)
-                continue
 
-        logging.info(f"[Tribun] Berhasil mengekstrak {len(articles_found)} artikel dari {count} elemen yang diproses untuk: {keyword}")
-        return articles_found
-    # Error Handling
-    except requests.Timeout:
-        logging.error(f"[Tribun] Timeout saat mengakses: {search_url}")
-        return []
-    except requests.RequestException as e:
-        logging.error(f"[Tribun] Gagal mengakses: {search_url} - {e}")
-        return []
-    except Exception as e:
-        logging.error(f"[Tribun] Error tidak terduga saat scraping {keyword}: {e}", exc_info=True)
-        return []
-
-# --- Fungsi Scraper Suara.com (BARU - PERLU VERIFIKASI SELEKTOR) ---
-def scrape_suara(keyword, max_articles_per_keyword=25):
-    """Scrapes Suara.com search results for a given keyword."""
-    base_url = "https://www.suara.com"
-    search_url = f"{base_url}/search?q={quote_plus(keyword)}"
-    articles_found = []
-    logging.info(f"[Suara] Mencari: {keyword} di {search_url}")
-    try:
-        response = requests.get(search_url, headers=HEADERS, timeout=45)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'lxml')
-
-        # Selektor Suara: Coba cari <article class="item"> atau div.item
-        list_article_elements = soup.find_all('article', class_='item')
-        if not list_article_elements:
-            # Alternatif: Coba cari div.widget-content article
-            container_alt = soup.find('div', class_='widget-content')
-            if container_alt:
-                list_article_elements = container_alt.find_all('article')
-            else:
-                logging.warning(f"[Suara] Tidak ada elemen artikel ditemukan (cek selektor article.item atau div.widget-content article) untuk: {keyword}")
-                return []
-
-
-        logging.info(f"[Suara] Ditemukan {len(list_article_elements)} potensi elemen artikel untuk: {keyword}")
-        count = 0
-        for article in list_article_elements:
-            if count >= max_articles_per_keyword: break
-            try:
-                # Link dan Title: Cari di h4.item-title a atau h2.post-title a
-                title_tag = article.find(['h4', 'h2'], class_=['item-title', 'post-title'])
-                link_tag = title_tag.find('a') if title_tag else None
-
-                if not link_tag or not link_tag.has_attr('href') or not title_tag: continue
-
-                link = link_tag['href']
-                title = link_tag.get_text(strip=True) # Judul ada di dalam link
-
-                # Validasi dan pastikan link absolut
-                link = urljoin(base_url, link) # Penting karena Suara bisa pakai relatif
-                if not link or link.startswith('#') or not link.startswith('http'): continue
-
-                # Deskripsi: p.item-desc atau div.post-excerpt
-                description_tag = article.find('p', class_='item-desc') or article.find('div', class_='post-excerpt')
-                description = description_tag.get_text(strip=True) if description_tag else 'No description'
-
-                # Tanggal: span.item-date atau div.post-date
-                date_tag = article.find(['span', 'div'], class_=['item-date', 'post-date'])
-                pub_date_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S') # Default
-                if date_tag:
-                    # Suara sering punya format " | Selasa, 02 Mei 2025 | 15:00 WIB"
-                    date_text = date_tag.get_text(strip=True)
-                    parts = date_text.split('|')
-                    if len(parts) > 1:
-                        pub_date_str = parts[-1].strip() # Ambil bagian terakhir setelah '|'
-                    else:
-                         pub_date_str = date_text # Ambil teks apa adanya jika tidak ada '|'
-
-
-                # Gambar: figure.item-img img atau div.post-thumb img
-                image_container = article.find(['figure', 'div'], class_=['item-img', 'post-thumb'])
-                img_tag = image_container.find('img') if image_container else None
-                # Suara sering pakai data-src untuk lazy loading
-                image_url = None
-                if img_tag:
-                    image_url = img_tag.get('data-src') or img_tag.get('src')
-                if not image_url: image_url = 'No image'
-
-
-                articles_found.append({
-                    "title": title, "link": link, "date_str": pub_date_str,
-                    "content": description, "image": image_url, "source": "Suara.com"
-                })
-                count += 1
-            except AttributeError as ae:
-                logging.debug(f"[Suara] AttributeError saat proses elemen: {ae}", exc_info=False)
-                continue
-            except Exception as e:
-                logging.warning(f"[Suara] Gagal memproses satu elemen artikel: {e}", exc_info=False)
-                continue
+# --- Scraper per situs: hanya URL pencarian; selektor ada di parsers.py (PERLU VERIFIKASI SELEKTOR) ---
+def scrape_detik(keyword, max_articles_per_keyword=25, page=1): # Naikkan sedikit batas per keyword
+    """Scrapes one page of Detik.com search results for a given keyword."""
+    # Format URL pencarian Detik bisa berubah, ini salah satu format umum
+    search_url = f"https://www.detik.com/search/searchall?query={quote_plus(keyword)}&sortby=time&page={page}"
+    return scrape_search_page("Detik.com", keyword, search_url, max_articles_per_keyword)
 
-        logging.info(f"[Suara] Berhasil mengekstrak {len(articles_found)} artikel dari {count} elemen yang diproses untuk: {keyword}")
-        return articles_found
-    # Error Handling
-    except requests.Timeout:
-        logging.error(f"[Suara] Timeout saat mengakses: {search_url}")
-        return []
-    except requests.RequestException as e:
-        logging.error(f"[Suara] Gagal mengakses: {search_url} - {e}")
-        return []
-    except Exception as e:
-        logging.error(f"[Suara] Error tidak terduga saat scraping {keyword}: {e}", exc_info=True)
-        return []
 
+def scrape_cnn(keyword, max_articles_per_keyword=25, page=1):
+    """Scrapes one page of CNNIndonesia.com search results for a given keyword."""
+    search_url = f"https://www.cnnindonesia.com/search/?query={quote_plus(keyword)}&page={page}"
+    return scrape_search_page("CNN Indonesia", keyword, search_url, max_articles_per_keyword)
 
-# --- Fungsi Utama (Modifikasi untuk memanggil semua scraper dan filter) ---
-def main_scrape(max_total_articles=100): # Target total artikel BARU yang ingin disimpan
-    """Main function to orchestrate scraping from multiple sources and saving."""
-    final_news_data_to_save = [] # List untuk menampung artikel BARU yang valid
-    processed_links = set()      # Set untuk melacak link yang sudah ada atau sudah diproses
 
-    try:
-        # Ambil link yang sudah ada di DB untuk menghindari duplikasi
-        existing_links = set(item['link'] for item in collection.find({}, {'link': 1}))
-        processed_links.update(existing_links)
-        logging.info(f"Ditemukan {len(existing_links)} link yang sudah ada di database. Link ini akan dilewati.")
-    except Exception as e:
-        logging.error(f"Gagal mengambil link dari DB: {e}. Melanjutkan tanpa cek duplikat awal.")
-        # Jika DB gagal, setidaknya kita masih bisa scrape, tapi mungkin ada duplikat
-
-    # --- Tentukan scraper yang akan dijalankan ---
-    scrapers = {
-        "Detik.com": scrape_detik,
-        "CNN Indonesia": scrape_cnn,
-        "Kompas.com": scrape_kompas,
-        "Tribunnews.com": scrape_tribun,
-        "Suara.com": scrape_suara
-    }
-    num_sources = len(scrapers)
-    # Perkiraan berapa banyak yang diambil per sumber per keyword agar tidak terlalu banyak request
-    max_articles_per_keyword_per_source = 30 # Ambil lebih banyak, nanti difilter
+def scrape_kompas(keyword, max_articles_per_keyword=25, page=1):
+    """Scrapes one page of Kompas.com search results for a given keyword."""
+    # Kompas memakai sub-domain search, urut terbaru
+    search_url = f"https://search.kompas.com/search/?q={quote_plus(keyword)}&sort=desc&page={page}"
+    return scrape_search_page("Kompas.com", keyword, search_url, max_articles_per_keyword)
 
-    articles_collected_count = 0 # Lacak jumlah artikel BARU yang valid ditemukan
 
-    logging.info(f"Memulai scraping untuk {len(KEYWORDS)} keywords di {num_sources} sumber berita. Target: {max_total_articles} artikel baru.")
+def scrape_tribun(keyword, max_articles_per_keyword=25, page=1):
+    """Scrapes one page of Tribunnews.com search results for a given keyword."""
+    search_url = f"https://www.tribunnews.com/search?q={quote_plus(keyword)}&page={page}"
+    # Tribun kadang butuh timeout lebih lama
+    return scrape_search_page("Tribunnews.com", keyword, search_url, max_articles_per_keyword, timeout=60)
 
-    # Loop utama per keyword
-    for keyword in KEYWORDS:
-        if articles_collected_count >= max_total_articles:
-            logging.info(f"Target {max_total_articles} artikel baru tercapai. Menghentikan proses scraping.")
-            break # Hentikan jika target sudah tercapai
 
-        logging.info(f"===== Memproses Keyword: '{keyword}' =====")
-        keyword_start_time = time.time()
-        articles_found_this_keyword = 0
+def scrape_suara(keyword, max_articles_per_keyword=25, page=1):
+    """Scrapes one page of Suara.com search results for a given keyword."""
+    search_url = f"https://www.suara.com/search?q={quote_plus(keyword)}&page={page}"
+    return scrape_search_page("Suara.com", keyword, search_url, max_articles_per_keyword)
 
-        # Loop per sumber berita
-        for source_name, scraper_func in scrapers.items():
-            if articles_collected_count >= max_total_articles: break # Cek lagi sebelum scrape sumber baru
 
-            logging.debug(f"[{source_name}] Mulai scrape untuk keyword: '{keyword}'")
-            # Panggil fungsi scraper yang sesuai
-            results = scraper_func(keyword, max_articles_per_keyword=max_articles_per_keyword_per_source)
+# --- Daftar scraper yang dijalankan per sumber berita ---
+# Kontrak scraper: list artikel (boleh kosong) jika halaman berhasil diproses, None jika request gagal
+SCRAPERS = {
+    "Detik.com": scrape_detik,
+    "CNN Indonesia": scrape_cnn,
+    "Kompas.com": scrape_kompas,
+    "Tribunnews.com": scrape_tribun,
+    "Suara.com": scrape_suara
+}
 
-            if not results:
-                logging.info(f"[{source_name}] Tidak ada hasil ditemukan atau gagal scrape untuk keyword: '{keyword}'")
-                time.sleep(2) # Jeda singkat meski gagal
-                continue # Lanjut ke sumber berikutnya
+# Jumlah worker paralel (1 = loop serial); jarak antar request per situs diatur RATE_LIMITER
+DEFAULT_WORKERS = int(os.getenv('SCRAPER_WORKERS', len(SCRAPERS)))
+# Paginasi: berhenti di halaman yang semua link-nya sudah tersimpan, atau setelah N halaman
+DEFAULT_MAX_PAGES = int(os.getenv('SCRAPER_MAX_PAGES', '5'))
+# --resume melewati triple (keyword, sumber, halaman) yang selesai kurang dari N jam lalu
+DEFAULT_MAX_AGE_HOURS = float(os.getenv('SCRAPER_MAX_AGE_HOURS', '24'))
+# Paginasi juga berhenti di halaman yang artikel terbarunya lebih tua dari N hari (0 = tanpa batas umur)
+DEFAULT_MAX_ARTICLE_AGE_DAYS = float(os.getenv('SCRAPER_MAX_ARTICLE_AGE_DAYS', '0'))
+_SKIPPED = object() # Penanda job yang dibatalkan karena stop_event
+
+
+def _parse_or_query_batch(value):
+    """Parses "Sumber=N,Sumber2=M" into {source_name: N}."""
+    batch = {}
+    for item in value.split(','):
+        name, _, size = item.partition('=')
+        if name.strip() and size.strip():
+            batch[name.strip()] = int(size)
+    return batch
+
+# Sumber yang pencariannya mendukung operator OR -> jumlah keyword per request, mis. SCRAPER_OR_QUERY="Kompas.com=4".
+# Kosong secara default: aktifkan hanya untuk situs yang hasil pencarian OR-nya sudah dicek manual
+OR_QUERY_BATCH = _parse_or_query_batch(os.getenv('SCRAPER_OR_QUERY', ''))
+
+
+def search_queries(keywords, source_name, or_query_batch=None):
+    """Returns [(query, keywords)] for one source: one query per keyword, or for sources in
+    OR_QUERY_BATCH groups of keywords joined with OR (phrases quoted) in a single search request.
+    """
+    size = (OR_QUERY_BATCH if or_query_batch is None else or_query_batch).get(source_name, 1)
+    if size <= 1:
+        return [(keyword, [keyword]) for keyword in keywords]
+    queries = []
+    for start in range(0, len(keywords), size):
+        group = keywords[start:start + size]
+        query = " OR ".join(f'"{keyword}"' if ' ' in keyword else keyword for keyword in group)
+        queries.append((query if len(group) > 1 else group[0], group))
+    return queries
+
+
+def iter_pages(scraper_func, keyword, source_name, max_articles, max_pages=1, seen_links=None, skip=None, stop_event=None,
+               max_article_age_days=0):
+    """Yields (page, results) while walking a site's search pages for one keyword.
+
+    The date_str of every result is normalized here (date, date_tz, date_raw).
+    Stops after a failed or empty page, after a page whose links are all in
+    seen_links (e.g. a LinkBloomFilter of processed links), after a page whose
+    newest article is older than max_article_age_days, or after max_pages.
+    The results of the page that ends the walk carry the reason in walk_end
+    ('empty', 'all_seen', 'too_old' or 'max_pages'); a failed page (None) does
+    not end it as finished. The whole walk is skipped when
+    skip(keyword, source_name, None) is true, single pages when
+    skip(keyword, source_name, page) is.
+    """
+    if skip is not None and skip(keyword, source_name, None): return
+    for page in range(1, max_pages + 1):
+        if stop_event is not None and stop_event.is_set(): return
+        if skip is not None and skip(keyword, source_name, page): continue
+        logging.debug(f"[{source_name}] Mulai scrape untuk keyword: '{keyword}' halaman {page}")
+        results = scraper_func(keyword, max_articles_per_keyword=max_articles, page=page)
+        if stop_event is not None and stop_event.is_set(): return # Halaman yang dibatalkan/terlambat tidak diproses
+        if results is not None and not isinstance(results, SearchResults):
+            results = SearchResults(results)
+        for article in results or []:
+            article.update(date_fields(article.get('date_str')))
+        # Dicek sebelum yield: setelah yield, link halaman ini sudah ditambahkan ke seen_links oleh pemanggil
+        all_seen = bool(results) and seen_links is not None and all(
+            normalize_link(a.get('link'), a.get('canonical')) in seen_links for a in results)
+        newest = max((a['date'] for a in results or [] if a['date'] is not None), default=None)
+        too_old = bool(max_article_age_days) and newest is not None and \
+            newest < utcnow() - timedelta(days=max_article_age_days)
+        if results is not None:
+            results.walk_end = ('empty' if not results else 'all_seen' if all_seen else 'too_old' if too_old
+                                else 'max_pages' if page == max_pages else None)
+        yield page, results
+        if not results: return
+        if all_seen:
+            logging.info(f"[{source_name}] Semua link di halaman {page} untuk '{keyword}' sudah tersimpan, paginasi berhenti.")
+            return
+        if too_old:
+            logging.info(f"[{source_name}] Artikel di halaman {page} untuk '{keyword}' lebih tua dari {max_article_age_days:g} hari, paginasi berhenti.")
+            return
+
+
+def _run_scrape_job(stop_event, source_name, scraper_func, keyword, max_articles, max_pages, seen_links, skip,
+                    max_article_age_days=0):
+    """Runs the page walk of one (keyword, source) pair inside a worker thread."""
+    if stop_event.is_set():
+        return _SKIPPED # Target sudah tercapai, job yang belum jalan dilewati
+    return list(iter_pages(scraper_func, keyword, source_name, max_articles, max_pages, seen_links, skip, stop_event,
+                           max_article_age_days))
+
+
+def iter_scrape_results(keywords, scrapers, max_articles_per_source, workers=1, stop_event=None, skip=None,
+                        max_pages=1, seen_links=None, max_article_age_days=0):
+    """Yields (query, source_name, page, results) for every search query/source pair and search page.
+
+    The queries of each source come from search_queries(): the keywords
+    themselves, or OR-joined groups of them for sources in OR_QUERY_BATCH.
+    workers <= 1 walks the pairs one after another; with more workers the
+    sources are fetched in parallel. In both modes the pacing per site comes
+    from RATE_LIMITER inside each scraper, not from fixed sleeps here.
+    Pagination and its early stop are handled by iter_pages.
+    results is None when the scrape failed.
+    """
+    stop_event = stop_event or threading.Event()
+    queries = {source_name: [query for query, _ in search_queries(keywords, source_name)] for source_name in scrapers}
+    rounds = max(map(len, queries.values()), default=0)
+
+    if workers <= 1:
+        for i in range(rounds):
+            if stop_event.is_set(): return
+            logging.info(f"===== Memproses query ke-{i + 1}/{rounds} =====")
+            round_start_time = time.time()
+            for source_name, scraper_func in scrapers.items():
+                if stop_event.is_set(): return # Cek lagi sebelum scrape sumber baru
+                if i >= len(queries[source_name]): continue # Sumber dengan query OR punya lebih sedikit ronde
+                query = queries[source_name][i]
+                for page, results in iter_pages(scraper_func, query, source_name, max_articles_per_source,
+                                                max_pages, seen_links, skip, stop_event, max_article_age_days):
+                    yield query, source_name, page, results
+            logging.info(f"===== Selesai query ke-{i + 1}. Waktu: {time.time() - round_start_time:.2f} detik =====")
+        return
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scraper")
+    try:
+        # Urutan submit query-major: setiap situs mengerjakan keyword sesuai urutan KEYWORDS
+        futures = {
+            executor.submit(_run_scrape_job, stop_event, source_name, scraper_func, queries[source_name][i],
+                            max_articles_per_source, max_pages, seen_links, skip, max_article_age_days):
+                (queries[source_name][i], source_name)
+            for i in range(rounds)
+            for source_name, scraper_func in scrapers.items() if i < len(queries[source_name])
+        }
+        for future in as_completed(futures):
+            query, source_name = futures[future]
+            try:
+                pages = future.result()
+            except Exception as e:
+                logging.error(f"[{source_name}] Job scraping gagal untuk '{query}': {e}", exc_info=True)
+                pages = [(1, None)]
+            if pages is _SKIPPED: continue # Job dibatalkan karena stop_event
+            for page, results in pages:
+                yield query, source_name, page, results
+    finally:
+        stop_event.set()
+        executor.shutdown(wait=True, cancel_futures=True)
 
-            logging.info(f"[{source_name}] Ditemukan {len(results)} artikel mentah. Memulai penyaringan...")
 
-            # Filter hasil dari sumber ini untuk keyword ini
-            newly_added_count_source = 0
-            for article in results:
-                if articles_collected_count >= max_total_articles: break # Cek lagi di dalam loop artikel
+# --- Fungsi Utama (Modifikasi untuk memanggil semua scraper dan filter) ---
+def main_scrape(max_total_articles=100, workers=DEFAULT_WORKERS, batch_size=None, flush_interval=None,
+                resume=False, max_age_hours=DEFAULT_MAX_AGE_HOURS, max_pages=DEFAULT_MAX_PAGES,
+                max_article_age_days=DEFAULT_MAX_ARTICLE_AGE_DAYS): # Target total artikel BARU yang ingin disimpan
+    """Main function to orchestrate scraping from multiple sources and saving.
+
+    Accepted articles are streamed to MongoDB through a BatchWriter, so memory
+    stays bounded and a crash only loses what is not yet in the local spool.
+    An article found again under another keyword (or already stored) is not
+    written twice: its extra keywords are merged into keywords_found.
+    Every finished (query, source, page) triple and every finished page walk
+    of a (query, source) pair is recorded in a RunCheckpoint; with resume=True
+    walks and triples finished less than max_age_hours ago are skipped.
+    Each source is paginated up to max_pages, stopping early at the first page
+    whose links are all already stored (checked against a link Bloom filter)
+    or, with max_article_age_days, whose articles are all older than that.
+    Dates are stored as UTC datetimes (date) with the site's zone (date_tz), and scraped_at in UTC too.
+    """
+    collection = get_collection()
+    writer = BatchWriter(collection, 'scrapper2', batch_size=batch_size, flush_interval=flush_interval)
+    writer.replay_spool() # Artikel yang tertinggal dari run sebelumnya yang terhenti
+    processed_links = set()      # link_key yang sudah masuk writer di run ini: target merge keyword (cek DB dilakukan per batch hasil)
+    near_duplicates = NearDuplicateIndex(collection)
+    near_duplicate_links = set() # link_key near-duplicate yang dilewati; tidak pernah disimpan, jadi bukan target merge
+    near_duplicate_count = 0
+    merged_count = 0 # Hit ulang artikel yang sama di bawah keyword lain, digabung ke keywords_found
+
+    num_sources = len(SCRAPERS)
+    # Perkiraan berapa banyak yang diambil per sumber per keyword agar tidak terlalu banyak request
+    max_articles_per_keyword_per_source = 30 # Ambil lebih banyak, nanti difilter
 
-                link = article.get('link')
-                title = article.get('title', '')
-                content = article.get('content', '') # Deskripsi/konten singkat
+    articles_collected_count = 0 # Lacak jumlah artikel BARU yang valid ditemukan
+    mode = f"konkuren ({workers} worker)" if workers > 1 else "serial"
+
+    logging.info(f"Memulai scraping ({mode}) untuk {len(KEYWORDS)} keywords di {num_sources} sumber berita. Target: {max_total_articles} artikel baru.")
+
+    checkpoint = RunCheckpoint()
+    skipped_pages = 0
+    skipped_walks = 0
+    def is_fresh(keyword, source_name, page):
+        nonlocal skipped_pages, skipped_walks
+        if not resume:
+            return False
+        if page is None:
+            # Walk yang sudah selesai (berhenti di halaman mana pun) dilewati seluruhnya
+            if checkpoint.is_walk_fresh(keyword, source_name, max_age_hours):
+                skipped_walks += 1
+                return True
+            return False
+        if checkpoint.is_fresh(keyword, source_name, page, max_age_hours):
+            skipped_pages += 1
+            return True
+        return False
+
+    def mark_page_done(query, source_name, page, results, new_articles=0):
+        checkpoint.mark_done(query, source_name, page, new_articles)
+        if results.walk_end is not None:
+            checkpoint.mark_walk_done(query, source_name, results.walk_end, page)
+        commit_page(results)
+
+    # Bloom filter link tersimpan (disinkronkan dengan DB lewat _id) + link yang diproses di run ini, untuk early stop paginasi
+    try:
+        seen_links = load_link_bloom(collection)
+    except Exception as e:
+        logging.error(f"Gagal memuat bloom filter link: {e}. Paginasi hanya dibatasi {max_pages} halaman.")
+        seen_links = None
 
-                # 1. Cek Link valid dan belum diproses/ada di DB
-                if not link or link in processed_links:
-                    # logging.debug(f"[{source_name}] Link duplikat atau tidak valid dilewati: {link}")
-                    continue
+    # Query pencarian -> keyword yang dicakupnya (lebih dari satu untuk query OR)
+    query_keywords = {query: group for source_name in SCRAPERS for query, group in search_queries(KEYWORDS, source_name)}
 
-                # 2. Cek Relevansi Keyword (di judul atau konten) - case insensitive
-                # Pastikan keyword ada di teks artikel
-                content_to_check = (title.lower() + " " + content.lower())
-                # Cek apakah keyword saat ini ada di konten (bisa diperluas ke semua KEYWORDS jika perlu)
-                if keyword.lower() not in content_to_check:
-                     # Cek juga keyword lain jika ingin lebih luas, tapi fokus ke keyword pencarian lebih baik
-                     # matching_keywords = [kw for kw in KEYWORDS if kw.lower() in content_to_check]
-                     # if not matching_keywords:
-                     #    logging.debug(f"[{source_name}] Artikel tidak relevan (keyword '{keyword}' tidak ditemukan): {title[:60]}...")
-                     #    continue
-                     logging.debug(f"[{source_name}] Artikel tidak relevan (keyword '{keyword}' tidak ditemukan): {title[:60]}...")
-                     continue
-
-
-                # 3. Jika relevan dan belum ada, format dan tambahkan
-                news_item = {
-                    "title": title,
-                    "link": link,
-                    "date": article.get('date_str', datetime.now().strftime('%Y-%m-%d %H:%M:%S')), # Gunakan date_str dari scrape
-                    "content": content,
-                    "image": article.get('image'),
-                    "source": source_name, # Gunakan nama sumber dari loop
-                    "scraped_at": datetime.now(),
-                    "keywords_found": [keyword] # Tandai keyword yang memicu penemuan ini
-                }
-                final_news_data_to_save.append(news_item) # Tambahkan ke list utama
-                processed_links.add(link) # Tandai link ini sudah diproses (termasuk yang dari DB)
-                articles_collected_count += 1 # Hitung artikel BARU yang valid
-                newly_added_count_source += 1
-                logging.info(f"✅ [{source_name}] Artikel baru valid ({articles_collected_count}/{max_total_articles}): {title[:60]}...")
-
-            logging.info(f"[{source_name}] Selesai filter. Menambahkan {newly_added_count_source} artikel baru dari sumber ini.")
-            time.sleep(3) # Jeda antar sumber berita
-
-        # Log setelah selesai memproses satu keyword di semua sumber
-        keyword_end_time = time.time()
-        logging.info(f"===== Selesai Keyword: '{keyword}'. Ditemukan {articles_found_this_keyword} artikel baru yang relevan. Waktu: {keyword_end_time - keyword_start_time:.2f} detik. Total artikel baru terkumpul: {articles_collected_count} =====")
-        time.sleep(5) # Jeda lebih lama antar keyword
-
-    # --- Simpan Semua Data BARU yang Terkumpul ke MongoDB ---
-    if final_news_data_to_save:
-        logging.info(f"Total {len(final_news_data_to_save)} artikel baru akan disimpan ke MongoDB...")
-        try:
-            # Gunakan insert_many untuk efisiensi
-            result = collection.insert_many(final_news_data_to_save, ordered=False) # ordered=False agar tidak berhenti jika 1 gagal (misal karena duplikat race condition)
-            logging.info(f"✅ Berhasil menyimpan {len(result.inserted_ids)} artikel baru ke database.")
-        except Exception as e:
-            logging.error(f"❌ Gagal menyimpan data ke MongoDB: {e}")
-            # Pertimbangkan menyimpan ke file cadangan jika DB gagal
-            try:
-                import json
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                backup_file = f'failed_inserts_{timestamp}.json'
-                with open(backup_file, 'w', encoding='utf-8') as f:
-                    # Konversi datetime ke string untuk JSON serialization
-                    def default_serializer(o):
-                        if isinstance(o, datetime):
-                            return o.isoformat()
-                        raise TypeError(f"Object of type {o.__class__.__name__} is not JSON serializable")
-                    json.dump(final_news_data_to_save, f, default=default_serializer, indent=2, ensure_ascii=False)
-                logging.info(f"Data gagal simpan telah dicadangkan ke {backup_file}")
-            except Exception as backup_e:
-                logging.error(f"Gagal menyimpan backup ke file JSON: {backup_e}")
+    global STOP_EVENT
+    stop_event = STOP_EVENT = threading.Event()
+    scrape_results = iter_scrape_results(KEYWORDS, SCRAPERS, max_articles_per_keyword_per_source, workers, stop_event,
+                                         skip=is_fresh, max_pages=max_pages, seen_links=seen_links,
+                                         max_article_age_days=max_article_age_days)
+    try:
+        with closing(scrape_results):
+            for query, source_name, page, results in scrape_results:
+                writer.maybe_flush() # Flush berdasarkan jendela waktu meski tidak ada artikel baru
+                if results is None:
+                    logging.info(f"[{source_name}] Gagal scrape untuk query: '{query}' halaman {page} (tidak dicatat di checkpoint)")
+                    continue # Lanjut ke sumber berikutnya
+                if not results:
+                    logging.info(f"[{source_name}] Tidak ada hasil ditemukan untuk query: '{query}' halaman {page}")
+                    mark_page_done(query, source_name, page, results)
+                    continue
 
+                logging.info(f"[{source_name}] Ditemukan {len(results)} artikel mentah untuk '{query}' halaman {page}. Memulai penyaringan...")
+                search_keywords = query_keywords.get(query, [query])
+
+                # Normalisasi link (canonical) dan fingerprint SimHash untuk seluruh batch hasil
+                for article in results:
+                    article.update(dedup_fields(article.get('link'), article.get('title', ''),
+                                                article.get('content', ''), article.get('canonical')))
+
+                # Cek link / near-duplicate yang sudah ada di DB hanya untuk batch ini (query ber-index, bukan seluruh koleksi)
+                try:
+                    stored_links = existing_link_keys(collection, [a['link_key'] for a in results])
+                    near_duplicates.prefetch([a['simhash'] for a in results])
+                except Exception as e:
+                    logging.error(f"Gagal cek link di DB: {e}. Duplikat akan disaring oleh upsert saat simpan.")
+                    stored_links = set()
+
+                # Filter hasil dari sumber ini untuk query ini
+                newly_added_count_source = 0
+                batch_complete = True
+                for article in results:
+                    if articles_collected_count >= max_total_articles:
+                        batch_complete = False
+                        break # Cek lagi di dalam loop artikel
+
+                    link = article.get('link')
+                    link_key = article['link_key']
+                    title = article.get('title', '')
+                    content = article.get('content', '') # Deskripsi/konten singkat
+
+                    if not link_key:
+                        continue
+                    # Semua hasil yang diproses (juga yang ditolak) dianggap terlihat untuk early stop paginasi di run ini.
+                    # Ke Bloom filter yang disimpan hanya masuk link yang pasti ditolak lagi (tidak relevan, near-duplicate);
+                    # link yang ditulis masuk lewat sync dari DB, jadi insert yang gagal tidak tercatat "tersimpan".
+                    if seen_links is not None: seen_links.mark_seen(link_key)
+
+                    # 1. Cek Relevansi Keyword: keyword query yang muncul utuh di judul/konten menurut KeywordMatcher
+                    # (aturan yang sama dengan keywords_found, jadi "kdrt" di "kdrtnya" tidak lolos)
+                    hit_keywords = [keyword for keyword in match_keywords(title, content) if keyword in search_keywords]
+                    if not hit_keywords:
+                         if seen_links is not None: seen_links.add(link_key)
+                         logging.debug(f"[{source_name}] Artikel tidak relevan (keyword '{query}' tidak ditemukan): {title[:60]}...")
+                         continue
+
+                    # 2. Sudah diproses di run ini / ada di DB: gabungkan keyword-nya, jangan tulis ulang artikel
+                    if link_key in processed_links or link_key in stored_links:
+                        writer.merge_keywords(link_key, hit_keywords)
+                        merged_count += 1
+                        continue
+
+                    # 3. Cek near-duplicate (berita sama dengan URL lain, mis. sindikasi Tribun regional)
+                    if link_key in near_duplicate_links:
+                        continue
+                    if near_duplicates.find_duplicate(article['simhash'], article['simhash_words']) is not None:
+                        near_duplicate_count += 1
+                        near_duplicate_links.add(link_key)
+                        if seen_links is not None: seen_links.add(link_key)
+                        logging.info(f"[{source_name}] Near-duplicate (SimHash) dilewati: {title[:60]}... ({link})")
+                        continue
+
+                    # 4. Jika relevan dan belum ada, format dan tambahkan
+                    news_item = {
+                        "title": title,
+                        "link": link,
+                        "link_key": link_key,
+                        "simhash": article['simhash'],
+                        "simhash_bands": article['simhash_bands'],
+                        "simhash_words": article['simhash_words'],
+                        "dedup_version": article['dedup_version'],
+                        "date": article['date'], # UTC, hasil normalisasi date_str di iter_pages (None jika tak terbaca)
+                        "date_tz": article['date_tz'],
+                        "date_raw": article['date_raw'],
+                        "content": content,
+                        **term_fields(title, content), # Hitungan kata untuk word cloud dashboard
+                        "image": article.get('image'),
+                        "source": source_name, # Gunakan nama sumber dari loop
+                        "scraped_at": utcnow(), # UTC naif, sama dengan date (parse_date)
+                        "scraped_at_tz": "UTC",
+                        **keyword_fields(title, content), # Semua KEYWORDS yang cocok (termasuk hit_keywords)
+                    }
+                    writer.add(news_item) # Masuk spool + buffer, di-flush per batch
+                    processed_links.add(link_key) # Tandai link ini sudah diproses di run ini
+                    near_duplicates.add(article['simhash'], article['simhash_words'])
+                    articles_collected_count += 1 # Hitung artikel BARU yang valid
+                    newly_added_count_source += 1
+                    logging.info(f"✅ [{source_name}] Artikel baru valid ({articles_collected_count}/{max_total_articles}): {title[:60]}...")
+
+                logging.info(f"[{source_name}] Selesai filter. Menambahkan {newly_added_count_source} artikel baru dari sumber ini.")
+                if batch_complete:
+                    # Artikel sudah aman di spool writer, jadi triple ini (dan walk-nya jika halaman terakhir) boleh ditandai selesai
+                    mark_page_done(query, source_name, page, results, newly_added_count_source)
+
+                if articles_collected_count >= max_total_articles:
+                    logging.info(f"Target {max_total_articles} artikel baru tercapai. Menghentikan proses scraping.")
+                    stop_event.set()
+                    break # Hentikan jika target sudah tercapai
+    finally:
+        # Flush sisa buffer (juga saat run terhenti karena error)
+        report = writer.close()
+        if seen_links is not None:
+            seen_links.save()
+
+    if resume:
+        logging.info(f"--resume: {skipped_walks} walk keyword/sumber dan {skipped_pages} halaman dilewati (selesai < {max_age_hours:g} jam lalu).")
+    logging.info(f"{near_duplicate_count} artikel near-duplicate (SimHash) dilewati.")
+    logging.info(f"{merged_count} hit ulang lintas keyword digabung ({report['merged']} artikel tersimpan mendapat keyword baru).")
+    logging.info(f"Laju akhir per domain (request/detik): {RATE_LIMITER.snapshot()}")
+    http_client.log_connection_stats()
+    if HTTP_CACHE is not None:
+        HTTP_CACHE.log_stats()
+
+    # --- Laporan akhir ---
+    if articles_collected_count or any(report.values()):
+        logging.info(f"✅ Laporan simpan: {report['inserted']} baru, {report['duplicates']} duplikat, {report['failed']} gagal.")
     else:
         logging.info("📭 Tidak ada artikel baru yang relevan untuk disimpan setelah memproses semua keyword.")
 
 
 if __name__ == "__main__":
-    start_time = time.time()
+    parser = argparse.ArgumentParser(description="Scraper berita kekerasan terhadap perempuan.")
     # Set target TOTAL artikel BARU yang ingin Anda dapatkan dari proses scraping ini
-    main_scrape(max_total_articles=150)
+    parser.add_argument("--target", type=int, default=150, help="Target total artikel baru (default: 150)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Jumlah worker paralel; 1 = loop serial lama (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--batch-size", type=int, default=None, help="Jumlah artikel per batch tulis ke MongoDB (default: WRITE_BATCH_SIZE=50)")
+    parser.add_argument("--flush-interval", type=float, default=None, help="Flush batch paling lambat setiap N detik (default: WRITE_FLUSH_SECONDS=30)")
+    parser.add_argument("--resume", action="store_true", help="Lewati keyword/sumber/halaman yang sudah selesai menurut checkpoint")
+    parser.add_argument("--max-age-hours", type=float, default=DEFAULT_MAX_AGE_HOURS,
+                        help=f"Dengan --resume, scrape ulang hanya yang selesai lebih dari N jam lalu (default: {DEFAULT_MAX_AGE_HOURS:g})")
+    parser.add_argument("--max-pages", type=int, default=DEFAULT_MAX_PAGES,
+                        help=f"Maksimum halaman hasil pencarian per keyword/sumber (default: {DEFAULT_MAX_PAGES})")
+    parser.add_argument("--max-article-age-days", type=float, default=DEFAULT_MAX_ARTICLE_AGE_DAYS,
+                        help="Berhenti paginasi di halaman yang artikelnya lebih tua dari N hari (default: 0 = tanpa batas)")
+    parser.add_argument("--parser", choices=BACKENDS, default=PARSER_BACKEND,
+                        help=f"Backend parsing halaman pencarian (default: {PARSER_BACKEND})")
+    parser.add_argument("--no-cache", action="store_true", help="Jangan pakai cache conditional-GET halaman pencarian")
+    args = parser.parse_args()
+    if args.no_cache:
+        HTTP_CACHE = None
+    PARSER_BACKEND = args.parser
+
+    start_time = time.time()
+    main_scrape(max_total_articles=args.target, workers=args.workers,
+                batch_size=args.batch_size, flush_interval=args.flush_interval,
+                resume=args.resume, max_age_hours=args.max_age_hours, max_pages=args.max_pages,
+                max_article_age_days=args.max_article_age_days)
     end_time = time.time()
-    logging.info(f"Proses scraping keseluruhan selesai dalam {end_time - start_time:.2f} detik.")
\ No newline at end of file
+    logging.info(f"Proses scraping keseluruhan selesai dalam {end_time - start_time:.2f} detik.")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modul repo ada di root (bukan paket), jadi root dimasukkan ke path agar bisa diimport dari tests/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
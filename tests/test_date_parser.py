@@ -0,0 +1,56 @@
+from datetime import datetime
+
+import pytest
+
+from date_parser import date_fields, parse_date
+
+NOW = datetime(2025, 5, 12, 5, 0)  # UTC, = 12:00 WIB
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Senin, 12 Mei 2025 10:15 WIB", (datetime(2025, 5, 12, 3, 15), 'WIB')),
+    ("12/05/2025, 10:15 WITA", (datetime(2025, 5, 12, 2, 15), 'WITA')),
+    ("Selasa, 13 Mei 2025 | 09:00 WIT", (datetime(2025, 5, 13, 0, 0), 'WIT')),
+    # Lewat tengah malam WIB -> hari sebelumnya di UTC
+    ("Rabu, 1 Januari 2025 00:30 WIB", (datetime(2024, 12, 31, 17, 30), 'WIB')),
+    # Tanpa zona: default WIB
+    ("12 Agustus 2024", (datetime(2024, 8, 11, 17, 0), 'WIB')),
+    ("2025-05-12 10:15", (datetime(2025, 5, 12, 3, 15), 'WIB')),
+])
+def test_indonesian_dates_convert_to_utc(text, expected):
+    assert parse_date(text, now=NOW) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2025-05-12T10:15:00+07:00", (datetime(2025, 5, 12, 3, 15), '+07:00')),
+    ("2025-05-12T03:15:00Z", (datetime(2025, 5, 12, 3, 15), 'UTC')),
+])
+def test_iso_dates_keep_their_offset(text, expected):
+    assert parse_date(text, now=NOW) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2 jam yang lalu", datetime(2025, 5, 12, 3, 0)),
+    ("5 menit lalu", datetime(2025, 5, 12, 4, 55)),
+    ("kemarin", datetime(2025, 5, 11, 5, 0)),
+    ("baru saja", NOW),
+])
+def test_relative_dates_count_back_from_now(text, expected):
+    assert parse_date(text, now=NOW) == (expected, 'WIB')
+
+
+def test_default_tz_applies_to_naive_strings():
+    assert parse_date("2025-05-12 10:15:00", default_tz='UTC') == (datetime(2025, 5, 12, 10, 15), 'UTC')
+
+
+@pytest.mark.parametrize("text", [None, "", "bukan tanggal"])
+def test_unparseable_dates_return_none(text):
+    assert parse_date(text, now=NOW) == (None, None)
+
+
+def test_date_fields_keep_the_raw_string():
+    assert date_fields("Senin, 12 Mei 2025 10:15 WIB") == {
+        'date': datetime(2025, 5, 12, 3, 15),
+        'date_tz': 'WIB',
+        'date_raw': "Senin, 12 Mei 2025 10:15 WIB",
+    }
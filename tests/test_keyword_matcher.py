@@ -0,0 +1,42 @@
+import pytest
+
+from keyword_matcher import KeywordMatcher, match_keywords
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Kasus KDRT di Bekasi", ["kdrt"]),
+    ("kdrt, kata polisi", ["kdrt"]),
+    ("(KDRT)", ["kdrt"]),
+    # Bukan kata utuh
+    ("kdrtnya", []),
+    ("antikdrt", []),
+    ("kdrt2", []),
+])
+def test_matches_whole_words_only(text, expected):
+    assert KeywordMatcher(["kdrt"]).match(text) == expected
+
+
+def test_overlapping_keywords_are_all_found_in_list_order():
+    matcher = KeywordMatcher(["pelecehan", "seksual", "pelecehan seksual", "kekerasan seksual"])
+    assert matcher.match("Korban pelecehan seksual melapor") == ["pelecehan", "seksual", "pelecehan seksual"]
+    assert matcher.match("kekerasan seksual", "pelecehan") == ["pelecehan", "seksual", "kekerasan seksual"]
+
+
+def test_shared_suffixes_follow_fail_links():
+    matcher = KeywordMatcher(["he", "she", "hers", "his"])
+    assert matcher.match("ushers") == []
+    assert matcher.match("she hers") == ["she", "hers"]
+    assert matcher.match("his he") == ["he", "his"]
+
+
+def test_case_and_whitespace_runs_are_normalized():
+    matcher = KeywordMatcher(["Kekerasan  Seksual"])
+    assert matcher.match("KEKERASAN\n\tseksual terjadi") == ["Kekerasan  Seksual"]
+
+
+def test_non_string_texts_are_skipped():
+    assert KeywordMatcher(["kdrt"]).match(None, float('nan'), "", "kdrt") == ["kdrt"]
+
+
+def test_default_keywords():
+    assert match_keywords("Dugaan pelecehan seksual", "bukan kdrtnya") == ["pelecehan seksual", "pelecehan"]
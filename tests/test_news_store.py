@@ -0,0 +1,103 @@
+import random
+
+import pytest
+
+from news_store import (SIMHASH_BANDS, SIMHASH_BITS, LinkBloomFilter, NearDuplicateIndex,
+                        hamming_distance, normalize_link, simhash, simhash_bands)
+
+_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+
+
+def _flip(fingerprint, bits):
+    value = fingerprint % (1 << SIMHASH_BITS)
+    for bit in bits:
+        value ^= 1 << bit
+    return value - (1 << SIMHASH_BITS) if value >= 1 << (SIMHASH_BITS - 1) else value
+
+
+@pytest.mark.parametrize("link, expected", [
+    ("https://www.detik.com/news/berita-1?utm_source=fb&utm_medium=social&fbclid=abc",
+     "https://detik.com/news/berita-1"),
+    ("http://m.kompas.com/read/2025/05/12/x?id=7&gclid=1&_ga=2#komentar",
+     "https://kompas.com/read/2025/05/12/x?id=7"),
+    ("https://amp.tribunnews.com/amp/news/2025/x", "https://tribunnews.com/news/2025/x"),
+    ("https://news.example.com/x.amp?b=2&a=1", "https://news.example.com/x?a=1&b=2"),
+    # 'page' memilih halaman artikel, jadi tetap dipertahankan
+    ("https://www.liputan6.com/news/read/1?page=2&utm_campaign=x", "https://liputan6.com/news/read/1?page=2"),
+    ("HTTPS://WWW.Detik.com:443/news/", "https://detik.com/news"),
+])
+def test_normalize_link_strips_tracking_and_mobile_variants(link, expected):
+    assert normalize_link(link) == expected
+
+
+def test_normalize_link_prefers_canonical():
+    assert normalize_link("https://m.detik.com/x?utm_source=a", canonical="https://www.detik.com/y") == "https://detik.com/y"
+
+
+@pytest.mark.parametrize("link", [None, "", "   ", "bukan-url"])
+def test_normalize_link_without_host_is_none(link):
+    assert normalize_link(link) is None
+
+
+def test_simhash_is_signed_int64():
+    fingerprint = simhash("polisi menangkap pelaku kekerasan rumah tangga di jakarta selatan")
+    assert -(1 << 63) <= fingerprint < 1 << 63
+    assert simhash("") is None and simhash("di ke") is None
+
+
+def test_fingerprints_within_seven_bits_share_a_band():
+    rng = random.Random(7)
+    for _ in range(500):
+        fingerprint = rng.randrange(-(1 << 63), 1 << 63)
+        other = _flip(fingerprint, rng.sample(range(SIMHASH_BITS), 7))
+        assert hamming_distance(fingerprint, other) == 7
+        assert set(simhash_bands(fingerprint)) & set(simhash_bands(other))
+
+
+def test_one_bit_per_band_shares_no_band():
+    fingerprint = simhash("polisi menangkap pelaku kekerasan rumah tangga di jakarta selatan")
+    other = _flip(fingerprint, [band * _BAND_BITS for band in range(SIMHASH_BANDS)])
+    assert not set(simhash_bands(fingerprint)) & set(simhash_bands(other))
+
+
+def test_bands_are_tagged_per_position():
+    # Nilai band yang sama di posisi berbeda tidak boleh bertabrakan
+    assert len(set(simhash_bands(0))) == SIMHASH_BANDS
+
+
+def test_near_duplicate_index_uses_word_count_thresholds():
+    index = NearDuplicateIndex()
+    fingerprint = simhash("polisi menangkap pelaku kekerasan rumah tangga di jakarta selatan")
+    index.add(fingerprint, 40)
+    assert index.find_duplicate(_flip(fingerprint, [0, 9, 18, 27, 36, 45]), 40) == fingerprint
+    assert index.find_duplicate(_flip(fingerprint, [0, 9, 18, 27, 36, 45, 54]), 40) is None
+    # Teks pendek: hanya jarak <= 2
+    assert index.find_duplicate(_flip(fingerprint, [0, 9, 18]), 20) is None
+    assert index.find_duplicate(_flip(fingerprint, [0, 9]), 20) == fingerprint
+    # Terlalu pendek (judul saja): tidak pernah dianggap duplikat
+    assert index.find_duplicate(fingerprint, 5) is None
+
+
+def test_bloom_re_add_does_not_count_twice():
+    bloom = LinkBloomFilter(capacity=1000)
+    assert bloom.add("https://detik.com/a") is True
+    assert bloom.add("https://detik.com/a") is False
+    assert bloom.add("https://detik.com/b") is True
+    assert bloom.add("") is False
+    assert bloom.count == 2
+    assert "https://detik.com/a" in bloom and "https://detik.com/c" not in bloom
+
+
+def test_bloom_run_seen_links_are_not_saved(tmp_path):
+    path = str(tmp_path / "bloom")
+    bloom = LinkBloomFilter(capacity=1000)
+    bloom.add("https://detik.com/disimpan")
+    bloom.mark_seen("https://detik.com/ditolak")
+    assert "https://detik.com/ditolak" in bloom
+    assert bloom.count == 1
+    bloom.save(path)
+
+    loaded = LinkBloomFilter.load(path)
+    assert loaded.count == 1
+    assert "https://detik.com/disimpan" in loaded
+    assert "https://detik.com/ditolak" not in loaded
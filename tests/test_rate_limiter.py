@@ -0,0 +1,88 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from rate_limiter import (MAX_RETRY_AFTER_SECONDS, RATE_INCREASE_STEP, DomainRateLimiter,
+                          domain_of, parse_retry_after)
+
+
+def _http_date(delta):
+    return format_datetime(datetime.now(timezone.utc) + delta, usegmt=True)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("30", 30),
+    (" 120 ", 120),
+    ("100000", MAX_RETRY_AFTER_SECONDS),
+    (None, None),
+    ("", None),
+    ("nanti saja", None),
+])
+def test_parse_retry_after_seconds(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    assert 50 <= parse_retry_after(_http_date(timedelta(seconds=60))) <= 60
+    assert parse_retry_after(_http_date(timedelta(days=1))) == MAX_RETRY_AFTER_SECONDS
+    assert parse_retry_after(_http_date(timedelta(hours=-1))) == 0
+
+
+def test_domain_of():
+    assert domain_of("https://News.Detik.com/berita/1?x=1") == "news.detik.com"
+    assert domain_of("kompas.com") == "kompas.com"
+
+
+def test_429_and_5xx_halve_the_rate_down_to_min_rate():
+    limiter = DomainRateLimiter(base_rate=0.2, min_rate=0.03, max_rate=1.0)
+    limiter.record("https://detik.com/a", 429, 0.5)
+    assert limiter.snapshot() == {"detik.com": 0.1}
+    limiter.record("https://detik.com/b", 503, 0.5)
+    assert limiter.snapshot() == {"detik.com": 0.05}
+    limiter.record_failure("https://detik.com/c")
+    limiter.record("https://detik.com/d", 429, 0.5)
+    assert limiter.snapshot() == {"detik.com": 0.03}
+
+
+def test_fast_responses_increase_additively_up_to_max_rate():
+    limiter = DomainRateLimiter(base_rate=0.2, min_rate=0.01, max_rate=0.3)
+    limiter.record("detik.com", 200, 0.4)
+    assert limiter.snapshot()["detik.com"] == pytest.approx(0.2 + RATE_INCREASE_STEP)
+    for _ in range(10):
+        limiter.record("detik.com", 200, 0.4)
+    assert limiter.snapshot()["detik.com"] == 0.3
+    # Respons lambat menurunkan laju, respons biasa tidak mengubahnya
+    limiter.record("detik.com", 200, 9.0)
+    assert limiter.snapshot()["detik.com"] == pytest.approx(0.24)
+    limiter.record("detik.com", 200, 3.0)
+    assert limiter.snapshot()["detik.com"] == pytest.approx(0.24)
+
+
+def test_domains_are_limited_independently():
+    limiter = DomainRateLimiter(base_rate=0.2, min_rate=0.01, max_rate=1.0)
+    limiter.record("detik.com", 429, 0.5)
+    assert limiter.acquire("kompas.com") == pytest.approx(0, abs=0.05)
+    assert limiter.snapshot() == {"detik.com": 0.1, "kompas.com": 0.2}
+
+
+def test_retry_after_block_is_capped_and_stoppable():
+    limiter = DomainRateLimiter(base_rate=1.0, min_rate=0.01, max_rate=1.0)
+    limiter.record("detik.com", 429, 0.5, retry_after="100000")
+    bucket = limiter._buckets["detik.com"]
+    assert bucket.blocked_until - time.monotonic() <= MAX_RETRY_AFTER_SECONDS
+
+    stop_event = threading.Event()
+    threading.Timer(0.2, stop_event.set).start()
+    start = time.monotonic()
+    assert limiter.acquire("https://detik.com/x", stop_event) is None
+    assert time.monotonic() - start < 2
+
+
+def test_acquire_returns_none_when_already_stopped():
+    limiter = DomainRateLimiter(base_rate=1.0)
+    stop_event = threading.Event()
+    stop_event.set()
+    assert limiter.acquire("detik.com", stop_event) is None
@@ -0,0 +1,18 @@
+from text_tokens import term_counts, tokenize
+
+
+def test_unicode_quotes_and_dashes_separate_words():
+    assert tokenize("“Kekerasan” di—jakarta ‘pelaku’ «korban» 2025–2026") == [
+        "kekerasan", "di", "jakarta", "pelaku", "korban"]
+
+
+def test_ascii_punctuation_and_urls_are_removed():
+    assert tokenize("KDRT, kata polisi (Senin). https://detik.com/x ke-3 korban's") == [
+        "kdrt", "kata", "polisi", "senin", "ke", "korbans"]
+
+
+def test_term_counts_drop_stopwords_and_short_words():
+    counts = term_counts("“Korban” KDRT", "korban melapor ke polisi—korban selamat")
+    assert counts["korban"] == 3
+    assert counts["kdrt"] == 1
+    assert "ke" not in counts
@@ -0,0 +1,79 @@
+import re
+import string
+import unicodedata
+from collections import Counter
+
+# Naikkan jika aturan tokenisasi/CUSTOM_STOPWORDS berubah agar backfill menghitung ulang term_counts lama
+TERMS_VERSION = 2
+
+# Kata umum situs berita yang tidak bermakna untuk analisis (stopwords NLTK diterapkan di dashboard)
+CUSTOM_STOPWORDS = frozenset({
+    'detik', 'cnn', 'indonesia', 'com', 'artikel', 'berita', 'antara', 'liputan6', 'kompas', 'tribunnews', 'suara',
+    'mengatakan', 'menyebutkan', 'ujar', 'kata', 'menurut', 'yakni', 'tersebut', 'selasa', 'dilansir', 'dikutip',
+    'rabu', 'kamis', 'jumat', 'sabtu', 'minggu', 'senin', 'januari', 'februari', 'maret', 'tribun', 'news',
+    'april', 'mei', 'juni', 'juli', 'agustus', 'september', 'oktober', 'november', 'desember',
+    'wib', 'wit', 'wita', 'pukul', 'tahun', 'lalu', 'usai', 'saat', 'akan', 'agar', 'oleh', 'pada', 'ke',
+    'dari', 'di', 'itu', 'ini', 'yang', 'dan', 'rp', 'ada', 'adalah', 'atau', 'jadi', 'juga', 'pun', 'kah',
+    'no', 'description', 'baca', 'simak', 'klik', 'hal', 'lain', 'pihak', 'terkait', 'kasus'
+})
+
+_URL_RE = re.compile(r'http\S+|www\S+|https\S+')
+_DIGITS_RE = re.compile(r'\d+')
+
+
+class _PunctuationTable(dict):
+    """str.translate table filled on first sight of each character.
+
+    ASCII punctuation is deleted (as the dashboard always did: "anak-anak" ->
+    "anakanak"), any other Unicode punctuation (typographic quotes, dashes,
+    guillemets, ...) becomes a space, like nltk.word_tokenize split it.
+    """
+
+    def __missing__(self, code):
+        char = chr(code)
+        if char in string.punctuation:
+            value = None
+        elif unicodedata.category(char).startswith('P'):
+            value = ' '
+        else:
+            value = code
+        self[code] = value
+        return value
+
+
+_PUNCTUATION_TABLE = _PunctuationTable()
+
+
+def tokenize(text):
+    """Lowercased word tokens of text with URLs, punctuation and digits removed.
+
+    ASCII punctuation and digits never separate words, so the text is split
+    first and only tokens that are not already alphabetic get cleaned; other
+    Unicode punctuation (typographic quotes, em dashes) separates the words
+    around it.
+    """
+    if not isinstance(text, str) or not text:
+        return []
+    text = text.lower()
+    if 'http' in text or 'www' in text:
+        text = _URL_RE.sub('', text)
+    tokens = []
+    for word in text.split():
+        if word.isalpha():
+            tokens.append(word)
+        else:
+            tokens.extend(_DIGITS_RE.sub('', word.translate(_PUNCTUATION_TABLE)).split())
+    return tokens
+
+
+def term_counts(title, content, stopwords=CUSTOM_STOPWORDS):
+    """Counts of the alphabetic terms (longer than 2 characters, not stopwords) in title and content."""
+    counts = Counter(tokenize(title))
+    counts.update(tokenize(content))
+    # Saring kata unik setelah dihitung: lebih sedikit pengecekan daripada per token
+    return {word: n for word, n in counts.items() if len(word) > 2 and word.isalpha() and word not in stopwords}
+
+
+def term_fields(title, content):
+    """Returns the term_counts / terms_version fields stored on every article."""
+    return {"term_counts": term_counts(title, content), "terms_version": TERMS_VERSION}
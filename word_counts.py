@@ -0,0 +1,106 @@
+import os
+import threading
+from collections import Counter, OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Batas partial Counter (sumber, hari) di memori, dan jumlah hasil gabungan per filter yang diingat
+MAX_PARTIALS = int(os.getenv('DASHBOARD_WORD_PARTIALS', '5000'))
+MAX_MERGED = int(os.getenv('DASHBOARD_WORD_MERGED', '16'))
+
+
+class WordCountCache:
+    """Word counts for any source/date filter, merged from per-(source, day) Counter partials.
+
+    counts() takes a frame and generation from ArticleFrameCache.snapshot().
+    Rows appended since the last call are indexed by (source, day) and added
+    to the partials already in memory; a new generation (full reload) starts
+    over. Partials are built on first use and evicted least recently used
+    beyond max_partials. Returned Counters are shared: do not modify them.
+    """
+
+    def __init__(self, exclude=frozenset(), timezone='Asia/Jakarta', max_partials=None, max_merged=None):
+        self.exclude = frozenset(exclude)
+        self.timezone = timezone
+        self.max_partials = MAX_PARTIALS if max_partials is None else max_partials
+        self.max_merged = MAX_MERGED if max_merged is None else max_merged
+        self._lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, generation):
+        self._generation = generation
+        self._frame = None
+        self._rows_seen = 0
+        self._rows = {} # (sumber, hari) -> daftar array posisi baris
+        self._partials = OrderedDict()
+        self._merged = OrderedDict()
+
+    def counts(self, frame, generation, sources=None, start=None, end=None):
+        """Summed term_counts of the rows from `sources` (None = all) dated between start and end (inclusive)."""
+        with self._lock:
+            self._sync(frame, generation)
+            key = (None if sources is None else tuple(sorted(sources)), start, end)
+            merged = self._merged.get(key)
+            if merged is not None:
+                self._merged.move_to_end(key)
+                return merged
+            merged = Counter()
+            for bucket in self._buckets(sources, start, end):
+                merged.update(self._partial(bucket))
+            self._merged[key] = merged
+            while len(self._merged) > self.max_merged:
+                self._merged.popitem(last=False)
+            return merged
+
+    def _sync(self, frame, generation):
+        if generation != self._generation or len(frame) < self._rows_seen:
+            self._reset(generation)
+        self._frame = frame
+        if len(frame) == self._rows_seen:
+            return
+        new = frame.iloc[self._rows_seen:]
+        keys = pd.DataFrame({'source': new['source'].astype(str).to_numpy(), 'day': self._days(new['date'])})
+        groups = keys.groupby(['source', 'day'], sort=False, dropna=False).indices
+        for bucket, positions in groups.items():
+            positions = positions + self._rows_seen
+            self._rows.setdefault(bucket, []).append(positions)
+            if bucket in self._partials:
+                self._partials[bucket].update(self._sum(positions))
+        self._rows_seen = len(frame)
+        self._merged.clear()
+
+    def _days(self, dates):
+        local = dates.dt.tz_localize('UTC').dt.tz_convert(self.timezone)
+        return local.dt.normalize().dt.tz_localize(None).to_numpy()
+
+    def _buckets(self, sources, start, end):
+        sources = None if sources is None else set(sources)
+        start = None if start is None else pd.Timestamp(start)
+        end = None if end is None else pd.Timestamp(end)
+        for source, day in self._rows:
+            if sources is not None and source not in sources:
+                continue
+            if start is not None or end is not None:
+                if pd.isna(day) or (start is not None and day < start) or (end is not None and day > end):
+                    continue
+            yield source, day
+
+    def _partial(self, bucket):
+        partial = self._partials.get(bucket)
+        if partial is not None:
+            self._partials.move_to_end(bucket)
+            return partial
+        partial = self._sum(np.concatenate(self._rows[bucket]))
+        self._partials[bucket] = partial
+        while len(self._partials) > self.max_partials:
+            self._partials.popitem(last=False)
+        return partial
+
+    def _sum(self, positions):
+        counter = Counter()
+        for counts in self._frame['term_counts'].to_numpy()[positions]:
+            counter.update(counts)
+        for word in self.exclude & counter.keys():
+            del counter[word]
+        return counter